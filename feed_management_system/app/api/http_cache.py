@@ -0,0 +1,114 @@
+"""
+Conditional GET support for the read endpoints
+
+Validators come from admin.table_change_counter, which statement-level
+triggers bump on every write to the tables an endpoint reads. The ETag
+hashes those counters together with the request's query string, so a
+polling client gets a 304 with no body (and the endpoint skips its main
+query) until one of the underlying tables actually changes. The counter
+read itself is coalesced, so a crowd of pollers costs one lookup.
+
+feed.feed_run is too busy for a single counter row. Its version is the sum
+of the admin.feed_run_version slots, which its statements bump inside the
+writing transaction. The versions are read before the data, so a write that
+commits in between can only pair an old ETag with new rows, which the next
+poll corrects; an ETag is never newer than the rows sent with it.
+
+Last-Modified is only sent when every table has a changed_at. The run table
+has none: a timestamp cannot see deletes or writes that commit after a newer
+one, so run endpoints are validated by ETag alone.
+"""
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Response
+
+from app.core.database import pooled_connection
+from app.core.single_flight import single_flight
+
+CACHE_CONTROL = "no-cache"  # clients may store responses but must revalidate
+
+
+class Validators:
+    """ETag / Last-Modified for one request, plus whether the client copy is current"""
+
+    def __init__(self, etag, last_modified, not_modified):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+    @property
+    def headers(self):
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def apply(self, response):
+        """Copy the validators onto a normal 200 response"""
+        response.headers.update(self.headers)
+
+    def not_modified_response(self):
+        return Response(status_code=304, headers=self.headers)
+
+
+def _pooled_table_versions(tables):
+    with pooled_connection() as conn:
+        return table_versions(conn, tables)
+
+
+RUN_VERSION_QUERY = """
+    SELECT 'feed.feed_run', COALESCE(sum(change_count), 0)::BIGINT, NULL::TIMESTAMPTZ
+    FROM admin.feed_run_version
+"""
+
+
+def table_versions(conn, tables):
+    """{table: (change_count, changed_at)} for the given schema-qualified tables"""
+    query = ("SELECT table_name, change_count, changed_at FROM admin.table_change_counter "
+             "WHERE table_name = ANY(%s)")
+    if 'feed.feed_run' in tables:
+        query += " UNION ALL" + RUN_VERSION_QUERY
+    with conn.cursor() as cur:
+        cur.execute(query + ";", (list(tables),))
+        return {name: (count, changed_at) for name, count, changed_at in cur.fetchall()}
+
+
+def _etag_matches(header, etag):
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same representation for a GET
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def check_conditional(request, tables):
+    """Compute validators for a read over `tables` and compare them with the request
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    tables = tuple(sorted(tables))
+    versions = single_flight.do(("table_versions", tables), _pooled_table_versions, tables)
+    fingerprint = "|".join(f"{table}:{versions.get(table, (0, None))[0]}" for table in sorted(tables))
+    fingerprint += "|" + str(request.url.path) + "?" + str(request.url.query)
+    etag = 'W/"' + hashlib.sha1(fingerprint.encode()).hexdigest()[:20] + '"'
+
+    stamps = [versions.get(table, (0, None))[1] for table in tables]
+    # HTTP dates are GMT with one-second resolution
+    last_modified = None
+    if stamps and None not in stamps:
+        last_modified = max(stamps).astimezone(timezone.utc).replace(microsecond=0)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        not_modified = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and last_modified is not None:
+            try:
+                not_modified = last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                not_modified = False
+    return Validators(etag, last_modified, not_modified)
@@ -3,13 +3,33 @@ FastAPI Application Entry Point
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app.api.responses import JSONResponse
+from app.api.routes import analytics, audit, dashboard, feeds, runs, search, sla
+from app.core.shared_cache import MemoryCacheBackend, get_shared_cache
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional; gzip only
+    BrotliMiddleware = None
+
+# Small bodies (and 304s) are not worth compressing
+COMPRESSION_MINIMUM_SIZE = 1024
 
 app = FastAPI(
     title="Feed Management System API",
     description="API for managing data feeds and processing runs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=JSONResponse,
 )
 
+if BrotliMiddleware is not None:
+    # Negotiates br and falls back to gzip for clients that only accept gzip
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +39,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(search.router)
+app.include_router(feeds.router)
+app.include_router(dashboard.router)
+app.include_router(analytics.router)
+app.include_router(runs.router)
+app.include_router(sla.router)
+app.include_router(audit.router)
+
+
+@app.on_event("startup")
+def start_cache_listener():
+    # A memory:// cache is only visible in this process, so relay changes here;
+    # with Redis, run python -m app.services.cache_listener once instead
+    shared = get_shared_cache()
+    if shared is not None and isinstance(shared.backend, MemoryCacheBackend):
+        from app.services.cache_listener import start_listener_thread
+
+        start_listener_thread(shared)
+
+
 @app.get("/")
 async def root():
     return {"message": "Feed Management System API", "status": "running"}
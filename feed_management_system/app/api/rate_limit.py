@@ -0,0 +1,120 @@
+"""
+Per-client token-bucket rate limiting for the write endpoints
+
+Each client (remote address) gets a bucket of API_WRITE_BURST tokens refilled
+at API_WRITE_RATE tokens per second; every write takes one. Headers such as
+X-Client-Id are ignored, since a client could rotate them to get fresh
+buckets. Behind a reverse proxy every request comes from the proxy, so
+X-Forwarded-For is used, but only when the peer is listed in
+API_TRUSTED_PROXIES (comma-separated addresses or networks). The client is
+the rightmost forwarded address that is not itself a trusted proxy; anything
+further left was written by the client and is not believed. An empty bucket answers 429 with a Retry-After header before a
+pooled connection is borrowed, so a burst of run starts from one client
+queues at the client instead of draining the pool for everyone.
+"""
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request
+
+DEFAULT_RATE = float(os.getenv('API_WRITE_RATE', '20'))
+DEFAULT_BURST = int(os.getenv('API_WRITE_BURST', '40'))
+# Buckets kept in memory; the least recently seen clients are dropped first
+MAX_CLIENTS = 10_000
+DEFAULT_TRUSTED_PROXIES = os.getenv('API_TRUSTED_PROXIES', '')
+
+
+def parse_networks(value):
+    """Parse "10.0.0.1, 172.16.0.0/12" into a tuple of ip_network objects"""
+    return tuple(ipaddress.ip_network(item.strip(), strict=False)
+                 for item in value.split(',') if item.strip())
+
+
+def _is_trusted(address, networks):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_address(request, trusted_proxies=()):
+    """The address a request is limited under: the peer, or the client a trusted proxy forwarded"""
+    peer = request.client.host if request.client else "unknown"
+    if not trusted_proxies or not _is_trusted(peer, trusted_proxies):
+        return peer
+    forwarded = [hop.strip() for value in request.headers.getlist("x-forwarded-for")
+                 for hop in value.split(",")]
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop, trusted_proxies):
+            try:
+                return str(ipaddress.ip_address(hop))
+            except ValueError:
+                # A malformed hop cannot be attributed; limit it with the proxy
+                return peer
+    return peer
+
+
+class TokenBucket:
+    """`capacity` tokens, refilled continuously at `rate` per second"""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now):
+        """Take one token; returns 0 on success, else seconds until one is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets per client key"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_clients=MAX_CLIENTS,
+                 trusted_proxies=DEFAULT_TRUSTED_PROXIES):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.trusted_proxies = parse_networks(trusted_proxies)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client):
+        """0 if the request may proceed, else the seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(now)
+
+    def __call__(self, request: Request):
+        """FastAPI dependency: raise 429 when the client's bucket is empty"""
+        retry_after = self.acquire(client_address(request, self.trusted_proxies))
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many write requests; retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+write_limit = RateLimiter()
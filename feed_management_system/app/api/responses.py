@@ -0,0 +1,25 @@
+"""
+Response classes shared by the API
+"""
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value):
+    # NUMERIC columns (ROUND(...), EXTRACT(EPOCH ...)) come back from psycopg2 as Decimal
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class JSONResponse(ORJSONResponse):
+    """orjson response that also serializes Decimal and numpy values"""
+
+    def render(self, content):
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -0,0 +1,40 @@
+"""
+Analytics API routes (DuckDB over the Parquet run snapshot)
+"""
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.analytics import DEFAULT_DAYS, ROLLUPS, connect_parquet, refresh_snapshots, rollup
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/rollups")
+def list_rollups():
+    """Names of the available rollups"""
+    return {"rollups": sorted(ROLLUPS)}
+
+
+@router.post("/refresh")
+def refresh(full: bool = Query(False, description="Re-export the whole history")):
+    """Append newly finished runs to the snapshot"""
+    return {"exported": refresh_snapshots(full=full)}
+
+
+@router.get("/{name}")
+def get_rollup(name: str, days: int = Query(DEFAULT_DAYS, ge=1, le=3660)):
+    """Run one rollup over the last `days` days of snapshot data"""
+    if name not in ROLLUPS:
+        raise HTTPException(status_code=404, detail=f"Unknown rollup '{name}'")
+    try:
+        con = connect_parquet()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        df = rollup(con, name, days)
+    finally:
+        con.close()
+    # to_json turns NaN/NaT into null and timestamps into ISO strings
+    rows = json.loads(df.to_json(orient="records", date_format="iso"))
+    return {"rollup": name, "days": days, "count": len(rows), "rows": rows}
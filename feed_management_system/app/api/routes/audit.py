@@ -0,0 +1,28 @@
+"""
+Audit trail API routes
+"""
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.database import pooled_connection
+from app.services.audit import AUDITED_TABLES, DEFAULT_PAGE_SIZE, list_changes
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+@router.get("")
+def get_audit_log(
+    table_name: Optional[str] = Query(None, description=", ".join(AUDITED_TABLES)),
+    row_key: Optional[str] = Query(None, description="Key of one record, e.g. a feed_id"),
+    operation: Optional[Literal["I", "U", "D"]] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None, description="next_before_id from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+):
+    """Admin changes newest first, keyset-paginated"""
+    with pooled_connection() as conn:
+        return list_changes(table_name=table_name, row_key=row_key, operation=operation,
+                            since=since, until=until, before_id=before_id, limit=limit, conn=conn)
@@ -0,0 +1,36 @@
+"""
+Dashboard API routes
+"""
+from fastapi import APIRouter
+
+from app.core.database import pooled_connection
+from app.core.shared_cache import cached, get_shared_cache
+from app.core.single_flight import single_flight
+from app.services.fleet import KPI_TABLES, fetch_kpis
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+# KPIs count today's runs, so they also expire on their own
+KPI_TTL = 30
+
+
+def _pooled_kpis():
+    with pooled_connection() as conn:
+        return fetch_kpis(conn)
+
+
+def _shared_kpis():
+    return cached("dashboard_kpis", KPI_TABLES, _pooled_kpis, ttl=KPI_TTL)
+
+
+@router.get("/kpis")
+def get_kpis():
+    """Dashboard KPIs; concurrent polls share one query and workers share the result"""
+    return single_flight.do("dashboard_kpis", _shared_kpis)
+
+
+@router.get("/coalescing")
+def get_coalescing_stats():
+    """Single-flight counters, plus shared cache counters when one is configured"""
+    shared = get_shared_cache()
+    return {**single_flight.stats(), "shared_cache": shared.stats() if shared else None}
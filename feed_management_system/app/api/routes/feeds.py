@@ -0,0 +1,53 @@
+"""
+Feed API routes
+"""
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.api.http_cache import check_conditional
+from app.core.database import pooled_connection
+from app.core.shared_cache import cached
+from app.core.single_flight import single_flight
+from app.services.feed_service import FEED_TABLES, get_feed, list_feeds
+
+router = APIRouter(prefix="/feeds", tags=["feeds"])
+
+
+def _pooled_get_feed(feed_tag):
+    with pooled_connection() as conn:
+        return get_feed(feed_tag, conn=conn)
+
+
+def _shared_get_feed(feed_tag):
+    return cached(f"feed:{feed_tag}", FEED_TABLES, lambda: _pooled_get_feed(feed_tag))
+
+
+@router.get("")
+def get_feeds(
+    request: Request,
+    response: Response,
+    active_only: bool = Query(False),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Feeds with status and environments; supports If-None-Match / If-Modified-Since"""
+    validators = check_conditional(request, FEED_TABLES)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    with pooled_connection() as conn:
+        feeds = list_feeds(active_only=active_only, limit=limit, offset=offset, conn=conn)
+    validators.apply(response)
+    return {"count": len(feeds), "feeds": feeds}
+
+
+@router.get("/{feed_tag}")
+def get_feed_by_tag(feed_tag: str, request: Request, response: Response):
+    """One feed by tag; supports If-None-Match / If-Modified-Since"""
+    validators = check_conditional(request, FEED_TABLES)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    # Jobs starting together all look up the same feeds; one query per tag at a time
+    feed = single_flight.do(("feed", feed_tag), _shared_get_feed, feed_tag)
+    if feed is None:
+        raise HTTPException(status_code=404, detail=f"Feed {feed_tag!r} not found")
+    validators.apply(response)
+    return feed
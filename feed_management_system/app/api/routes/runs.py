@@ -0,0 +1,336 @@
+"""
+Feed run API routes
+"""
+import asyncio
+import itertools
+import time
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from psycopg2.pool import PoolError
+from pydantic import BaseModel, Field
+
+from app.api.http_cache import check_conditional
+from app.api.rate_limit import write_limit
+from app.api.streaming import STREAM_FORMATS, arrow_chunks, ndjson_chunks, negotiate_format
+from app.core.database import pooled_connection
+from app.core.query_cache import FUNCTION_TABLES
+from app.core.shared_cache import cached, invalidate_tables
+from app.core.single_flight import single_flight
+from app.core.storage import get_backend
+from app.services.feed_run_service import (
+    RUN_RESULT_STATUSES,
+    complete_feed_run,
+    get_run_statuses,
+    start_feed_run,
+)
+from app.services.feed_service import RUN_TABLES, environment_codes, list_runs
+from app.services.heartbeat import STALE_AFTER_MINUTES, RunNotActive, active_runs, record_heartbeat
+from app.services.run_details import (
+    DEFAULT_PAGE_ROWS,
+    MAX_PAGE_ROWS,
+    arrow_schema,
+    batch_cursor,
+    decode_cursor,
+    pooled_run_details,
+)
+from app.services.run_log import (
+    DEFAULT_TAIL_LIMIT,
+    LOG_STREAMS,
+    RunNotFound,
+    append_chunks,
+    tail,
+)
+from app.services.run_metrics import (
+    DEFAULT_DAYS,
+    DEFAULT_RATE_METRIC,
+    MAX_BATCH_SIZE,
+    TREND_BUCKETS,
+    rate_percentiles,
+    record_metrics,
+    run_metrics,
+    throughput_trend,
+)
+
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+# Upper bound for long-polling GET /runs/{id}/log?wait=...
+MAX_WAIT_SECONDS = 30
+POLL_INTERVAL = 0.5
+
+
+class LogChunk(BaseModel):
+    stream: str = Field("STDOUT", description=", ".join(LOG_STREAMS))
+    data: str
+
+
+class LogAppend(BaseModel):
+    chunks: List[LogChunk] = Field(..., min_length=1, max_length=1000)
+
+
+class RunStart(BaseModel):
+    feed_tag: str = Field(..., min_length=1, max_length=255)
+    environment: str = Field(..., description="dev, test or prod")
+
+
+class RunComplete(BaseModel):
+    status: str = Field(..., description=", ".join(RUN_RESULT_STATUSES))
+
+
+class Heartbeat(BaseModel):
+    progress_pct: Optional[float] = Field(None, ge=0, le=100, description="Derived from the record counts when omitted")
+    records_processed: Optional[int] = Field(None, ge=0)
+    records_total: Optional[int] = Field(None, ge=0)
+    message: Optional[str] = Field(None, max_length=200)
+
+
+class Metric(BaseModel):
+    feed_run_id: int
+    name: str = Field(..., description="e.g. rows_read, rows_written, bytes_written, errors or a custom counter")
+    value: float
+
+
+class MetricBatch(BaseModel):
+    metrics: List[Metric] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+def _pooled_environment_codes():
+    with pooled_connection() as conn:
+        return environment_codes(conn=conn)
+
+
+def _shared_environment_codes():
+    return cached("environment_codes", ("admin.system_codes",), _pooled_environment_codes)
+
+
+@router.post("", status_code=201, dependencies=[Depends(write_limit)])
+def start_run(body: RunStart):
+    """Start a run, creating the feed/environment on first use; rate limited per client"""
+    # A burst of starts shares one environment lookup
+    environments = single_flight.do("environment_codes", _shared_environment_codes)
+    environment = body.environment.lower()
+    if environment not in {row["environment"] for row in environments}:
+        raise HTTPException(status_code=422, detail=f"Unknown environment {body.environment!r}")
+    try:
+        with get_backend().borrow() as conn:
+            feed_run_id = start_feed_run(environment, body.feed_tag, conn=conn)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # Callers expect to read their own write (the listener relays feed/environment
+    # changes, but never feed_run ones)
+    invalidate_tables(FUNCTION_TABLES['start_feed_run'])
+    return {"feed_run_id": feed_run_id, "feed_tag": body.feed_tag, "environment": environment}
+
+
+@router.post("/{feed_run_id}/complete", dependencies=[Depends(write_limit)])
+def complete_run(feed_run_id: int, body: RunComplete):
+    """Finish a RUNNING run with success or failure (409 if it already finished); rate limited per client"""
+    if body.status.lower() not in RUN_RESULT_STATUSES:
+        raise HTTPException(status_code=422, detail="Invalid status. Must be success or failure")
+    try:
+        with get_backend().borrow() as conn:
+            if feed_run_id not in get_run_statuses([feed_run_id], conn=conn):
+                raise HTTPException(status_code=404, detail=f"Feed run {feed_run_id} not found")
+            applied = complete_feed_run(feed_run_id, body.status.lower(), conn=conn)
+            current = None if applied else get_run_statuses([feed_run_id], conn=conn).get(feed_run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not applied:
+        raise HTTPException(status_code=409, detail=f"Feed run {feed_run_id} already finished as {current}")
+    invalidate_tables(FUNCTION_TABLES['complete_feed_run'])
+    return {"feed_run_id": feed_run_id, "status_cd": RUN_RESULT_STATUSES[body.status.lower()]}
+
+
+@router.get("")
+def get_runs(
+    request: Request,
+    response: Response,
+    feed_tag: Optional[str] = Query(None),
+    environment: Optional[str] = Query(None, description="dev, test or prod"),
+    status: Optional[str] = Query(None, description="e.g. RUNNING, COMPLETED, FAILED"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Runs newest first; supports If-None-Match / If-Modified-Since"""
+    validators = check_conditional(request, RUN_TABLES)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    with pooled_connection() as conn:
+        runs = list_runs(feed_tag=feed_tag, environment=environment, status=status,
+                         limit=limit, offset=offset, conn=conn)
+    validators.apply(response)
+    return {"count": len(runs), "runs": runs}
+
+
+@router.get("/active")
+def get_active_runs(
+    stale_after: int = Query(STALE_AFTER_MINUTES, ge=1, description="Minutes without a heartbeat before a run is stuck"),
+    stuck_only: bool = Query(False),
+):
+    """RUNNING runs with their latest heartbeat; is_stale marks runs that stopped reporting"""
+    with pooled_connection() as conn:
+        runs = active_runs(stale_after=stale_after, conn=conn)
+    if stuck_only:
+        runs = [run for run in runs if run["is_stale"]]
+    return {"count": len(runs), "runs": runs}
+
+
+@router.post("/metrics", dependencies=[Depends(write_limit)])
+def post_metrics(body: MetricBatch):
+    """Store a batch of metrics for one or more runs; a resubmitted metric replaces its value"""
+    try:
+        with pooled_connection() as conn:
+            stored = record_metrics([(m.feed_run_id, m.name, m.value) for m in body.metrics], conn=conn)
+    except RunNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"stored": stored}
+
+
+@router.get("/metrics/percentiles")
+def get_metric_percentiles(
+    metric: str = Query(DEFAULT_RATE_METRIC),
+    days: int = Query(DEFAULT_DAYS, ge=1, le=3660),
+    feed_tag: Optional[str] = Query(None),
+    environment: Optional[str] = Query(None, description="dev, test or prod"),
+):
+    """p50/p90/p99/max per-second rate of a metric per feed and environment (completed runs)"""
+    with pooled_connection() as conn:
+        rows = rate_percentiles(metric, days, feed_tag, environment, conn=conn)
+    return {"metric": metric, "days": days, "count": len(rows), "rows": rows}
+
+
+@router.get("/metrics/trend")
+def get_metric_trend(
+    metric: str = Query(DEFAULT_RATE_METRIC),
+    days: int = Query(DEFAULT_DAYS, ge=1, le=3660),
+    bucket: str = Query("day", description=", ".join(TREND_BUCKETS)),
+    feed_tag: Optional[str] = Query(None),
+    environment: Optional[str] = Query(None, description="dev, test or prod"),
+):
+    """Runs, total and per-second rate of a metric per time bucket, feed and environment"""
+    if bucket not in TREND_BUCKETS:
+        raise HTTPException(status_code=422, detail=f"bucket must be one of {', '.join(TREND_BUCKETS)}")
+    with pooled_connection() as conn:
+        rows = throughput_trend(metric, days, bucket, feed_tag, environment, conn=conn)
+    return {"metric": metric, "days": days, "bucket": bucket, "count": len(rows), "rows": rows}
+
+
+@router.get("/{feed_run_id}/metrics")
+def get_run_metrics(feed_run_id: int):
+    """Every metric recorded for a run"""
+    with pooled_connection() as conn:
+        metrics = run_metrics(feed_run_id, conn=conn)
+    return {"feed_run_id": feed_run_id, "metrics": metrics}
+
+
+@router.put("/{feed_run_id}/heartbeat", dependencies=[Depends(write_limit)])
+def put_heartbeat(feed_run_id: int, body: Heartbeat):
+    """Overwrite the run's progress and liveness timestamp; omitted fields keep their value"""
+    try:
+        with pooled_connection() as conn:
+            progress_pct, heartbeat_at = record_heartbeat(
+                feed_run_id, progress_pct=body.progress_pct, records_processed=body.records_processed,
+                records_total=body.records_total, message=body.message, conn=conn,
+            )
+    except RunNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RunNotActive as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"feed_run_id": feed_run_id, "progress_pct": progress_pct, "heartbeat_at": heartbeat_at}
+
+
+def _stream_details(request, feed_run_id, cursor, limit, format):
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    format = negotiate_format(format, request.headers.get("accept"))
+
+    # Fetch the first batch before answering, so a database error is a 500
+    # rather than a 200 with a truncated body
+    pages = pooled_run_details(feed_run_id=feed_run_id, after=cursor, limit=limit)
+    try:
+        first = next(pages, None)
+    except PoolError:
+        raise HTTPException(status_code=503, detail="All database connections are busy",
+                            headers={"Retry-After": "1"})
+    pages = itertools.chain([first] if first else [], pages)
+
+    if format == "arrow":
+        body = arrow_chunks(pages, batch_cursor, arrow_schema())
+    else:
+        body = ndjson_chunks(pages, batch_cursor)
+    return StreamingResponse(body, media_type=STREAM_FORMATS[format])
+
+
+@router.get("/details")
+def stream_all_run_details(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_ROWS, ge=1, le=MAX_PAGE_ROWS),
+    format: Optional[Literal["ndjson", "arrow"]] = Query(None, description="Default: from Accept, else ndjson"),
+):
+    """Run details across all runs in (created_at, detail_id) order, streamed as NDJSON or Arrow"""
+    return _stream_details(request, None, cursor, limit, format)
+
+
+@router.get("/{feed_run_id}/details")
+def stream_run_details_for_run(
+    feed_run_id: int,
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_ROWS, ge=1, le=MAX_PAGE_ROWS),
+    format: Optional[Literal["ndjson", "arrow"]] = Query(None, description="Default: from Accept, else ndjson"),
+):
+    """One run's details, streamed as NDJSON or Arrow"""
+    return _stream_details(request, feed_run_id, cursor, limit, format)
+
+
+@router.post("/{feed_run_id}/log", status_code=201, dependencies=[Depends(write_limit)])
+def append_run_log(feed_run_id: int, body: LogAppend):
+    """Append a batch of log chunks; returns the seq range they were given"""
+    try:
+        with pooled_connection() as conn:
+            first_seq, last_seq = append_chunks(
+                feed_run_id, [(c.stream, c.data) for c in body.chunks], conn=conn
+            )
+    except RunNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"feed_run_id": feed_run_id, "first_seq": first_seq, "last_seq": last_seq}
+
+
+def _pooled_tail(feed_run_id, after_seq, limit):
+    with pooled_connection() as conn:
+        return tail(feed_run_id, after_seq=after_seq, limit=limit, conn=conn)
+
+
+@router.get("/{feed_run_id}/log")
+async def tail_run_log(
+    feed_run_id: int,
+    after_seq: int = Query(0, ge=0, description="Return chunks after this seq (the previous next_seq)"),
+    limit: int = Query(DEFAULT_TAIL_LIMIT, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS, description="Seconds to wait for new chunks"),
+):
+    """Chunks since an offset; with wait > 0 this long-polls until data arrives or the run ends
+
+    Waiting happens on the event loop, so idle long-polls hold neither a
+    worker thread nor a pooled connection; each check runs in the threadpool.
+    """
+    deadline = time.monotonic() + wait
+    try:
+        while True:
+            page = await run_in_threadpool(_pooled_tail, feed_run_id, after_seq, limit)
+            if page["chunks"] or page["finished"] or time.monotonic() >= deadline:
+                return page
+            await asyncio.sleep(min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+    except RunNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,24 @@
+"""
+Search API routes
+"""
+from typing import List
+
+from fastapi import APIRouter, Query
+
+from app.core.database import pooled_connection
+from app.services.search_service import SEARCH_SOURCES, search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("")
+def search_feeds(
+    q: str = Query(..., min_length=2, description="Web-style search, e.g. \"timeout\" -retry"),
+    limit: int = Query(20, ge=1, le=200),
+    source: List[str] = Query(list(SEARCH_SOURCES), description="feed, feed_detail and/or run_detail"),
+):
+    """Ranked, highlighted matches across feeds, feed details and run details"""
+    sources = [s for s in source if s in SEARCH_SOURCES] or list(SEARCH_SOURCES)
+    with pooled_connection() as conn:
+        results = search(q, limit=limit, sources=sources, conn=conn)
+    return {"query": q, "count": len(results), "results": results}
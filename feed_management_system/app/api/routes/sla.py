@@ -0,0 +1,24 @@
+"""
+SLA API routes
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.database import pooled_connection
+from app.services.sla import list_breaches
+
+router = APIRouter(prefix="/sla", tags=["sla"])
+
+
+@router.get("/breaches")
+def get_breaches(
+    include_resolved: bool = Query(False, description="Also return breaches that have cleared"),
+    since: Optional[datetime] = Query(None, description="Only breaches detected at or after this time"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """SLA breaches, newest first; open breaches only by default"""
+    with pooled_connection() as conn:
+        breaches = list_breaches(include_resolved=include_resolved, since=since, limit=limit, conn=conn)
+    return {"count": len(breaches), "breaches": breaches}
@@ -0,0 +1,66 @@
+"""
+Streaming response bodies for large result sets
+
+Both encoders consume (RowBatch, has_more) pairs and emit one chunk per
+batch. StreamingResponse iterates these sync generators in the threadpool
+and only asks for the next chunk once the previous one has been handed to
+the server, so a slow client slows down the database fetch instead of
+filling API memory.
+
+- NDJSON: one JSON object per row, then a final {"next_cursor": ...} line
+  (null when there is nothing more).
+- Arrow IPC stream: one record batch per chunk; every batch carries
+  "next_cursor" and "has_more" in its custom metadata, read them with
+  RecordBatchStreamReader.read_next_batch_with_custom_metadata().
+"""
+import io
+
+import orjson
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+STREAM_FORMATS = {"ndjson": NDJSON_MEDIA_TYPE, "arrow": ARROW_MEDIA_TYPE}
+
+
+def negotiate_format(requested, accept):
+    """Explicit ?format= wins, then the Accept header, then NDJSON"""
+    if requested:
+        return requested
+    if accept and ARROW_MEDIA_TYPE in accept:
+        return "arrow"
+    return "ndjson"
+
+
+def ndjson_chunks(pages, cursor_for):
+    next_cursor = None
+    for batch, has_more in pages:
+        columns = batch.columns
+        yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in batch.rows)
+        next_cursor = cursor_for(batch) if has_more else None
+    yield orjson.dumps({"next_cursor": next_cursor}) + b"\n"
+
+
+def arrow_chunks(pages, cursor_for, schema):
+    import pyarrow as pa
+
+    buffer = io.BytesIO()
+    writer = pa.ipc.new_stream(buffer, schema)
+    for batch, has_more in pages:
+        columns = list(zip(*batch.rows))
+        record_batch = pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        )
+        metadata = {"has_more": "true" if has_more else "false",
+                    "next_cursor": cursor_for(batch) if has_more else ""}
+        writer.write_batch(record_batch, custom_metadata=metadata)
+        yield _drain(buffer)
+    writer.close()
+    yield _drain(buffer)
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
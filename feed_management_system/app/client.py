@@ -0,0 +1,142 @@
+"""
+Python client for the feed management API
+
+Jobs use it to start and finish runs, send heartbeats and report metrics
+without talking to the database. Metrics are buffered and sent in batches
+(one POST /runs/metrics per `batch_size` values, plus on flush() or when the
+client is closed):
+
+    with FeedApiClient("http://feeds.internal:8000", client_id="orders-loader") as api:
+        run_id = api.start_run("orders", "prod")
+        api.record_metrics(run_id, rows_read=120000, rows_written=119870, errors=130)
+        api.complete_run(run_id, "success")
+
+Only the standard library is used, so the client can be copied into job
+images that do not install the rest of the application.
+"""
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_METRIC_BATCH = 500
+# Retries for 429 responses from the per-client write limiter
+MAX_RETRIES = 3
+
+
+class ApiError(Exception):
+    """Raised for non-2xx responses; carries the status code and detail"""
+
+    def __init__(self, status, detail):
+        super().__init__(f"{status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+
+class FeedApiClient:
+    """Thin JSON client; thread-safe, with a shared metric buffer"""
+
+    def __init__(self, base_url, client_id=None, timeout=DEFAULT_TIMEOUT, metric_batch=DEFAULT_METRIC_BATCH):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.metric_batch = metric_batch
+        self.headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if client_id:
+            self.headers["X-Client-Id"] = client_id
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def _request(self, method, path, body=None, params=None):
+        url = self.base_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        data = json.dumps(body).encode() if body is not None else None
+        for attempt in range(MAX_RETRIES + 1):
+            request = urllib.request.Request(url, data=data, headers=self.headers, method=method)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    payload = response.read()
+                    return json.loads(payload) if payload else None
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt < MAX_RETRIES:
+                    time.sleep(float(e.headers.get("Retry-After") or 1))
+                    continue
+                try:
+                    detail = json.loads(e.read()).get("detail")
+                except ValueError:
+                    detail = e.reason
+                raise ApiError(e.code, detail) from None
+
+    # Runs
+
+    def start_run(self, feed_tag, environment):
+        """Start a run and return its feed_run_id"""
+        return self._request("POST", "/runs", {"feed_tag": feed_tag, "environment": environment})["feed_run_id"]
+
+    def complete_run(self, feed_run_id, status):
+        """Finish a run with 'success' or 'failure'; buffered metrics are sent first"""
+        self.flush()
+        return self._request("POST", f"/runs/{feed_run_id}/complete", {"status": status})
+
+    def heartbeat(self, feed_run_id, progress_pct=None, records_processed=None, records_total=None,
+                  message=None):
+        """Report progress for an active run"""
+        body = {"progress_pct": progress_pct, "records_processed": records_processed,
+                "records_total": records_total, "message": message}
+        return self._request("PUT", f"/runs/{feed_run_id}/heartbeat", body)
+
+    # Metrics
+
+    def record_metrics(self, feed_run_id, **values):
+        """Buffer metrics for a run (e.g. rows_written=1000); sends a batch once the buffer is full"""
+        with self._lock:
+            self._metrics.extend(
+                {"feed_run_id": feed_run_id, "name": name, "value": value} for name, value in values.items()
+            )
+            full = len(self._metrics) >= self.metric_batch
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Send every buffered metric; returns how many the API stored"""
+        with self._lock:
+            pending, self._metrics = self._metrics, []
+        stored = 0
+        try:
+            while pending:
+                batch = pending[:self.metric_batch]
+                stored += self._request("POST", "/runs/metrics", {"metrics": batch})["stored"]
+                pending = pending[len(batch):]
+        except Exception:
+            # Keep unsent metrics for the next flush; a replayed batch is harmless
+            with self._lock:
+                self._metrics[:0] = pending
+            raise
+        return stored
+
+    def run_metrics(self, feed_run_id):
+        """Metrics recorded for one run"""
+        return self._request("GET", f"/runs/{feed_run_id}/metrics")["metrics"]
+
+    def metric_percentiles(self, metric="rows_written", days=30, feed_tag=None, environment=None):
+        """Per-second rate percentiles of a metric per feed and environment"""
+        params = {"metric": metric, "days": days, "feed_tag": feed_tag, "environment": environment}
+        return self._request("GET", "/runs/metrics/percentiles", params=params)["rows"]
+
+    def metric_trend(self, metric="rows_written", days=30, bucket="day", feed_tag=None, environment=None):
+        """Throughput of a metric per time bucket, feed and environment"""
+        params = {"metric": metric, "days": days, "bucket": bucket, "feed_tag": feed_tag,
+                  "environment": environment}
+        return self._request("GET", "/runs/metrics/trend", params=params)["rows"]
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,210 @@
+"""
+Database connection helpers shared by services, the API and CLI tools
+"""
+import glob
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': os.getenv('DB_PORT', '5432'),
+    'database': os.getenv('DB_NAME', 'feed_management'),
+    'user': os.getenv('DB_USER', os.getenv('USER')),
+    'password': os.getenv('DB_PASSWORD', '')
+}
+
+
+def get_connection(**overrides):
+    """Open a new database connection using DB_CONFIG (keyword overrides win)"""
+    import psycopg2
+
+    return psycopg2.connect(**{**DB_CONFIG, **overrides})
+
+
+def sql_files(pattern):
+    """Files matching a glob in numeric-prefix order, so 2_x.sql runs before 10_x.sql"""
+    def key(path):
+        return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', os.path.basename(path))]
+
+    return sorted(glob.glob(pattern), key=key)
+
+
+def create_db_if_missing():
+    """Create the target database if it does not exist"""
+    import psycopg2
+    from psycopg2 import sql, OperationalError
+
+    try:
+        # Try connecting to the target database
+        psycopg2.connect(**DB_CONFIG).close()
+        return  # Database exists
+    except OperationalError as e:
+        if f'database "{DB_CONFIG["database"]}" does not exist' not in str(e):
+            raise e  # Rethrow any error other than 'does not exist'
+
+    # Attempt to connect to 'postgres' DB to create the target DB
+    try:
+        fallback_config = DB_CONFIG.copy()
+        fallback_config["database"] = "postgres"
+
+        conn = psycopg2.connect(**fallback_config)
+        conn.autocommit = True
+
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(DB_CONFIG["database"])))
+        conn.close()
+
+        print(f"✅ Created missing database '{DB_CONFIG['database']}'.")
+
+    except Exception as ex:
+        raise RuntimeError(f"❌ Failed to create database '{DB_CONFIG['database']}': {ex}")
+
+
+_bootstrap_lock = threading.Lock()
+_bootstrapped = False
+
+
+def ensure_database():
+    """Run create_db_if_missing() once per process, even with concurrent callers"""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if not _bootstrapped:
+            create_db_if_missing()
+            _bootstrapped = True
+
+
+# Rows pulled from the server per network round trip by streaming cursors
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class RowBatch:
+    """A batch of tuple rows together with the cursor's column names"""
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def stream_query(query, params=None, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """Yield RowBatch objects from a server-side (named) cursor
+
+    Only one batch is held in client memory at a time. When no connection is
+    passed in, a dedicated one is opened and closed once the generator is
+    exhausted or closed.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, params)
+            columns = None
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cur.description]
+                yield RowBatch(columns, rows)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def stream_dataframes(query, params=None, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """Yield pandas DataFrame chunks built directly from tuple batches"""
+    import pandas as pd
+
+    for batch in stream_query(query, params, batch_size=batch_size, conn=conn):
+        yield pd.DataFrame.from_records(batch.rows, columns=batch.columns)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Shared thread-safe connection pool (sized by DB_POOL_SIZE) for the API"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+            _pool = ThreadedConnectionPool(1, int(os.getenv('DB_POOL_SIZE', '10')), **DB_CONFIG)
+        return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection; commits on success and rolls back on error"""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+_engine = None
+_session_factory = None
+
+
+def sqlalchemy_url():
+    """SQLAlchemy URL for DB_CONFIG (used by the ORM engine and Alembic)"""
+    from sqlalchemy.engine import URL
+
+    return URL.create(
+        "postgresql+psycopg2",
+        username=DB_CONFIG['user'],
+        password=DB_CONFIG['password'] or None,
+        host=DB_CONFIG['host'],
+        port=int(DB_CONFIG['port']),
+        database=DB_CONFIG['database'],
+    )
+
+
+def get_engine():
+    """Shared SQLAlchemy engine for the ORM layer, built from DB_CONFIG"""
+    global _engine
+    with _pool_lock:
+        if _engine is None:
+            from sqlalchemy import create_engine
+
+            _engine = create_engine(
+                sqlalchemy_url(),
+                pool_size=int(os.getenv('DB_POOL_SIZE', '10')),
+                pool_pre_ping=True,
+                echo=os.getenv('SQL_ECHO', '').lower() in ('1', 'true', 'yes'),
+            )
+        return _engine
+
+
+@contextmanager
+def get_session():
+    """ORM session that commits on success and rolls back on error"""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.orm import sessionmaker
+        _session_factory = sessionmaker(get_engine(), expire_on_commit=False)
+    with _session_factory() as session:
+        with session.begin():
+            yield session
@@ -0,0 +1,173 @@
+"""
+In-process query result cache with table-level invalidation
+
+Results are keyed by (normalized SQL, params) and evicted least-recently-used
+once the cache exceeds its byte budget. Callers declare the tables each cached
+query reads and each write changes; the SQL text is never parsed for them, so
+comma joins, views and triggers cannot hide a dependency. A write only evicts
+the reads that declared one of its tables.
+Entries also expire after a TTL, which bounds staleness from writers outside
+this process (jobs calling start_feed_run directly, other app instances).
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = int(os.getenv('QUERY_CACHE_MAX_MB', '64')) * 1024 * 1024
+DEFAULT_TTL = float(os.getenv('QUERY_CACHE_TTL', '30'))
+
+_WHITESPACE = re.compile(r'\s+')
+
+AUDIT_LOG = 'admin.audit_log'
+# Tables whose triggers append to admin.audit_log (sql/functions/7_audit_log.sql)
+AUDITED_TABLES = frozenset({'admin.code_type', 'admin.system_codes', 'feed.feed',
+                            'feed.feed_environment', 'feed.feed_details'})
+
+
+def written_tables(*tables):
+    """The tables a write to `tables` changes, including the audit log its triggers append to"""
+    changed = frozenset(tables)
+    return changed | {AUDIT_LOG} if changed & AUDITED_TABLES else changed
+
+
+# Tables purge_feeds / delete_feed delete from; all but the heartbeat are archived first
+_PURGED_TABLES = ('feed.feed', 'feed.feed_environment', 'feed.feed_dependency', 'feed.feed_details',
+                  'feed.feed_run', 'feed.feed_run_details', 'feed.feed_run_log', 'feed.feed_run_metric',
+                  'feed.feed_sla', 'feed.feed_sla_breach')
+
+# Tables written by the stored functions
+FUNCTION_TABLES = {
+    'start_feed_run': written_tables('feed.feed', 'feed.feed_environment', 'feed.feed_run',
+                                     'feed.run_event_outbox'),
+    'complete_feed_run': written_tables('feed.feed_run', 'feed.feed_run_heartbeat', 'feed.run_event_outbox'),
+    'purge_feeds': written_tables('feed.feed_run_heartbeat', *_PURGED_TABLES,
+                                  *(table.replace('feed.', 'archive.', 1) for table in _PURGED_TABLES)),
+}
+FUNCTION_TABLES['delete_feed'] = FUNCTION_TABLES['purge_feeds']
+
+
+def normalize_sql(query):
+    """Collapse whitespace and drop the trailing semicolon"""
+    return _WHITESPACE.sub(' ', query).strip().rstrip(';').strip()
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a cached value in bytes"""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except TypeError:
+            pass
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'tables', 'expires_at')
+
+    def __init__(self, value, size, tables, expires_at):
+        self.value = value
+        self.size = size
+        self.tables = tables
+        self.expires_at = expires_at
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with a byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        return normalize_sql(query), repr(params)
+
+    def get(self, query, params=None):
+        """Return the cached value or None"""
+        key = self.make_key(query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, query, params, value, tables):
+        """Cache a result of a query reading `tables`; values larger than a quarter of the budget are skipped"""
+        if not tables:
+            raise ValueError("A cached query must declare the tables it reads")
+        size = estimate_size(value)
+        if size > self.max_bytes // 4:
+            return
+        key = self.make_key(query, params)
+        tables = frozenset(table.lower() for table in tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, tables, time.monotonic() + self.ttl)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tables(self, tables):
+        """Drop every cached read that touches any of the given tables"""
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys |= self._by_table.get(table.lower(), set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits * 100.0 / lookups, 1) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
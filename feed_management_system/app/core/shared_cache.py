@@ -0,0 +1,350 @@
+"""
+Shared cache tier for multi-process deployments
+
+Streamlit and uvicorn run several worker processes, each with its own
+QueryCache. The shared tier keeps hot lookups (system codes, dashboard KPIs,
+feed lookups) in one place so every worker sees the same data. CACHE_URL
+selects the backend:
+
+    (unset)             disabled; callers fall back to their local caches
+    memory://           in-process stand-in with Redis semantics (tests, single worker)
+    redis://host:6379/0 Redis or any server speaking its protocol (needs the redis package)
+
+Invalidation uses versioned namespaces. Every table has a version counter
+and each cached value is stored under a key that embeds the versions of the
+tables it reads, so invalidating a table is a single INCR: old entries are
+never read again and age out through their TTL. Versions are bumped by the
+write path in execute_query and, for writers outside the app (stored
+functions, jobs, psql), by cache_listener relaying the change-counter
+trigger's pg_notify('table_changed', ...) events. feed.feed_run sends no
+events, so entries over run data must carry a short TTL.
+
+Values are encoded as data only, never pickled, so a client that can write
+to Redis cannot make the API run code. DataFrames are stored as Arrow IPC and
+everything else as JSON, with datetimes, dates and decimals tagged so they
+round-trip.
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.core.query_cache import normalize_sql
+
+CACHE_URL = os.getenv('CACHE_URL', '')
+DEFAULT_TTL = int(os.getenv('SHARED_CACHE_TTL', '300'))
+KEY_PREFIX = os.getenv('SHARED_CACHE_PREFIX', 'fms')
+# Value entries kept by the memory backend; the least recently used go first
+MEMORY_MAX_ENTRIES = int(os.getenv('SHARED_CACHE_MAX_ENTRIES', '10000'))
+# Version key bumped for writes that cannot be attributed to tables (DDL)
+ALL_TABLES = '*'
+
+
+class CacheBackend:
+    """The subset of Redis commands the shared cache uses"""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def mget(self, keys):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def incr(self, key):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process stand-in with Redis semantics (bytes values, TTLs, INCR)
+
+    Values are bounded by max_entries, like Redis with maxmemory and an LRU
+    policy: expired entries are swept first, then the least recently used.
+    Counters from incr() are never evicted; losing a table version would let
+    entries from an older version be read again.
+    """
+
+    def __init__(self, max_entries=MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        if key in self._counters:
+            return self._counters[key]
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _evict(self, now):
+        if len(self._data) <= self.max_entries:
+            return
+        expired = [key for key, (_, expires_at) in self._data.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key, time.monotonic())
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def set(self, key, value, ttl):
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (value, now + ttl if ttl else None)
+            self._data.move_to_end(key)
+            self._evict(now)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._counters.get(key) or 0) + 1
+            self._counters[key] = str(value).encode()
+            return value
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis (or a protocol-compatible server such as Valkey or KeyDB)"""
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def mget(self, keys):
+        return self._client.mget(keys)
+
+    def set(self, key, value, ttl):
+        self._client.set(key, value, ex=ttl or None)
+
+    def incr(self, key):
+        return self._client.incr(key)
+
+
+def _encode_json(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted(value, key=repr)}
+    if isinstance(value, bytes):
+        return {'__bytes__': base64.b64encode(value).decode()}
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode_json(obj):
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+        if tag == '__datetime__':
+            return datetime.fromisoformat(value)
+        if tag == '__date__':
+            return date.fromisoformat(value)
+        if tag == '__decimal__':
+            return Decimal(value)
+        if tag == '__set__':
+            return set(value)
+        if tag == '__bytes__':
+            return base64.b64decode(value)
+    return obj
+
+
+def dumps(value):
+    """Encode a cache value: DataFrames as Arrow IPC, everything else as tagged JSON"""
+    if type(value).__name__ == 'DataFrame' and type(value).__module__.startswith('pandas'):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(value)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return b'A' + sink.getvalue()
+    return b'J' + json.dumps(value, default=_encode_json, separators=(',', ':')).encode()
+
+
+def loads(raw):
+    """Decode a value written by dumps(); anything else is rejected"""
+    kind, payload = raw[:1], raw[1:]
+    if kind == b'A':
+        import pyarrow as pa
+
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    if kind == b'J':
+        return json.loads(payload, object_hook=_decode_json)
+    raise ValueError("Unrecognized shared cache value")
+
+
+class SharedCache:
+    """Versioned-namespace cache over a CacheBackend
+
+    Backend errors never fail a request: reads become misses and are counted
+    in stats(), so an unavailable Redis only costs database round trips.
+    """
+
+    def __init__(self, backend, prefix=KEY_PREFIX, ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _version_key(self, table):
+        return f"{self.prefix}:ver:{table.lower()}"
+
+    def key(self, name, tables):
+        """Value key for `name` at the current versions of `tables`; None if the backend failed
+
+        Take the key before loading and store the result under that same key.
+        A write that lands during the load then bumps the versions past it, so
+        the stale result is never read.
+        """
+        tables = sorted({table.lower() for table in tables}) + [ALL_TABLES]
+        try:
+            versions = self.backend.mget([self._version_key(table) for table in tables])
+        except Exception:
+            self.errors += 1
+            return None
+        stamp = ",".join(f"{table}={int(version or 0)}" for table, version in zip(tables, versions))
+        digest = hashlib.sha1(f"{name}|{stamp}".encode()).hexdigest()
+        return f"{self.prefix}:val:{digest}"
+
+    def get(self, key):
+        """Cached value stored under a key from key(), or None"""
+        if key is None:
+            return None
+        try:
+            raw = self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        try:
+            value = loads(raw)
+        except Exception:
+            # Entries from an older format or not written by us are misses
+            self.errors += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value, ttl=None):
+        """Store value under a key taken with key() before it was loaded"""
+        if key is None:
+            return
+        try:
+            self.backend.set(key, dumps(value), ttl or self.ttl)
+        except Exception:
+            self.errors += 1
+
+    def get_or_load(self, name, tables, loader, ttl=None):
+        """Return the cached value or call loader() and cache its result"""
+        key = self.key(name, tables)
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.put(key, value, ttl)
+        return value
+
+    def query_key(self, query, params, tables):
+        """key() for a SQL read, versioned by the tables the caller declared it reads"""
+        return self.key(f"sql:{normalize_sql(query)}|{params!r}", tables)
+
+    def invalidate_tables(self, tables):
+        """Bump the version of each table; every worker stops seeing old entries at once"""
+        for table in tables:
+            try:
+                self.backend.incr(self._version_key(table))
+            except Exception:
+                self.errors += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(self.hits * 100.0 / lookups, 1) if lookups else 0.0,
+        }
+
+
+def cache_from_url(url):
+    """Build a SharedCache from a CACHE_URL-style string; None when disabled"""
+    if not url:
+        return None
+    if url.startswith('memory://'):
+        return SharedCache(MemoryCacheBackend())
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return SharedCache(RedisCacheBackend(url))
+    raise ValueError(f"Unsupported CACHE_URL scheme: {url.split(':', 1)[0]}")
+
+
+_shared_cache = None
+_configured = False
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide shared cache selected by CACHE_URL, or None when not configured"""
+    global _shared_cache, _configured
+    with _shared_cache_lock:
+        if not _configured:
+            _shared_cache = cache_from_url(CACHE_URL)
+            _configured = True
+        return _shared_cache
+
+
+def set_shared_cache(cache):
+    """Replace the process-wide shared cache (e.g. SharedCache(MemoryCacheBackend()) in tests)"""
+    global _shared_cache, _configured
+    with _shared_cache_lock:
+        _shared_cache = cache
+        _configured = True
+
+
+def cached(name, tables, loader, ttl=None):
+    """loader() through the shared cache when one is configured, else directly"""
+    cache = get_shared_cache()
+    if cache is None:
+        return loader()
+    return cache.get_or_load(name, tables, loader, ttl)
+
+
+def invalidate_tables(tables):
+    """Bump table versions in the shared cache, if one is configured"""
+    cache = get_shared_cache()
+    if cache is not None:
+        cache.invalidate_tables(tables)
@@ -0,0 +1,86 @@
+"""
+Request coalescing ("single flight") for hot read paths
+
+When several threads ask for the same key at the same time, only one (the
+leader) runs the function; the others wait for it and receive the same
+result or exception. A caller that arrives while a call is already running
+does not join it, because that call may have read the data before the
+caller's own write committed. It waits for the next call instead, which
+starts once the running one finishes and is shared by everyone who arrived
+in the meantime. Nothing is cached, so results are never older than the
+request, and at most one call per key runs at a time. Shared results are the
+same object for every caller and must be treated as read-only.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}    # key -> running call
+        self._pending = {}  # key -> call that starts when the running one finishes
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return fn(*args, **kwargs), sharing one execution among concurrent callers of `key`"""
+        previous = None
+        with self._lock:
+            running = self._calls.get(key)
+            if running is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            elif key in self._pending:
+                call = self._pending[key]
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._pending[key] = _Call()
+                self.executed += 1
+                leader = True
+                previous = running
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        if previous is not None:
+            # The previous leader hands the key over to this call when it finishes
+            previous.done.wait()
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    del self._calls[key]
+                else:
+                    self._calls[key] = pending
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+
+# Process-wide instance used by the API
+single_flight = SingleFlight()
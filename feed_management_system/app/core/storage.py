@@ -0,0 +1,565 @@
+"""
+Pluggable storage backends for the feed run OLTP paths
+
+DATABASE_URL picks the backend:
+
+    (unset) or postgresql://...   PostgresBackend, using DB_CONFIG and the
+                                  start_feed_run / complete_feed_run functions
+    sqlite:///path/to/feeds.db    SQLiteBackend, file-backed
+    sqlite://  or sqlite:///:memory:
+                                  SQLiteBackend, in-process and throwaway
+
+The SQLite backend attaches an "admin" and a "feed" database next to the main
+file (feeds.admin.db, feeds.feed.db), so schema-qualified SQL such as
+feed.feed_run works unchanged. It creates its schema from sql/sqlite and the
+seed codes from sql/dcl on first use, and implements the two run functions in
+Python with the same rules as the PL/pgSQL versions.
+
+Both backends also serve the scheduler and executor: the feed graph, the
+commands to run, run details and the run log. Heartbeats are PostgreSQL only.
+
+For DuckDB analytics, SQLite rows are copied in-process through Arrow, so no
+DuckDB extension has to be downloaded. PostgreSQL is scanned with the postgres
+extension when it is already installed (or bundled) and copied the same way
+otherwise.
+"""
+import glob
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import unquote, urlparse
+
+from app.core.database import DB_CONFIG, get_connection, pooled_connection
+
+VALID_ENVIRONMENTS = ('dev', 'test', 'prod')
+FINISHED_STATUSES = ('COMPLETED', 'FAILED', 'CANCELLED')
+RUN_RESULT_STATUSES = {'success': 'COMPLETED', 'failure': 'FAILED'}
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "sql")
+SQLITE_SCHEMA_DIR = os.path.join(SQL_DIR, "sqlite")
+SEED_DIR = os.path.join(SQL_DIR, "dcl")
+SQLITE_SCHEMAS = ('admin', 'feed')
+
+
+class StorageBackend:
+    """Operations every backend provides"""
+    name = None
+
+    def connect(self):
+        """A DB-API connection (callers must not close shared connections)"""
+        raise NotImplementedError
+
+    @contextmanager
+    def borrow(self):
+        """A pooled connection to pass as `conn` to the run operations, or None"""
+        yield None
+
+    def start_feed_run(self, environment, feed_tag, conn=None):
+        raise NotImplementedError
+
+    def complete_feed_run(self, feed_run_id, status, conn=None):
+        """Finish a RUNNING run; False when it had already finished"""
+        raise NotImplementedError
+
+    def get_run_statuses(self, feed_run_ids, conn=None):
+        raise NotImplementedError
+
+    @contextmanager
+    def session(self):
+        """A connection for a series of autocommitted writes (e.g. one executor run)"""
+        raise NotImplementedError
+
+    def feed_graph(self, feed_tags=None):
+        """({feed_id: feed_tag}, {feed_id: set(upstream ids)}) for active feeds"""
+        raise NotImplementedError
+
+    def feed_commands(self, feed_tag, environment, detail_types):
+        """(detail_id, detail_type_cd, detail_desc, detail_data) rows of the given types, in detail_id order"""
+        raise NotImplementedError
+
+    def add_run_detail(self, feed_run_id, detail_desc, detail_data, parent_detail_id=None, conn=None):
+        """Insert one feed_run_details row and return its detail_id"""
+        raise NotImplementedError
+
+    def append_run_log(self, feed_run_id, chunks, conn=None):
+        """Append chunks to a run's log; returns (first_seq, last_seq)"""
+        raise NotImplementedError
+
+    def record_heartbeat(self, feed_run_id, progress_pct=None, message=None, conn=None):
+        """Store a run's latest progress; backends without heartbeats ignore it"""
+        return None
+
+    def attach_duckdb(self, con, tables):
+        """Make {table: columns} readable from a DuckDB connection; returns (feed, admin) prefixes"""
+        raise NotImplementedError
+
+
+def _copy_into_duckdb(con, tables, fetch):
+    """Load the selected columns of each table into a same-named DuckDB table through Arrow"""
+    import pyarrow as pa
+
+    for table, columns in tables.items():
+        schema, _ = table.split('.')
+        rows = fetch(f"SELECT {', '.join(columns)} FROM {table}")
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema};")
+        con.register("copied_rows", pa.Table.from_arrays([pa.array(list(v)) for v in values], names=list(columns)))
+        try:
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM copied_rows;")
+        finally:
+            con.unregister("copied_rows")
+    return 'feed', 'admin'
+
+
+class PostgresBackend(StorageBackend):
+    """PostgreSQL via psycopg2; run logic lives in the stored functions"""
+    name = 'postgresql'
+
+    def __init__(self, config=None):
+        self.config = dict(config or DB_CONFIG)
+
+    def connect(self):
+        return get_connection(**self.config)
+
+    @contextmanager
+    def borrow(self):
+        # The API pool is built from DB_CONFIG, so only that database can use it
+        if self.config != DB_CONFIG:
+            yield None
+            return
+        with pooled_connection() as conn:
+            yield conn
+
+    def _call(self, query, params, conn=None):
+        """Run a one-value query; a caller-supplied connection is not committed"""
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                result = cur.fetchone()[0]
+            if own_conn:
+                conn.commit()
+            return result
+        finally:
+            if own_conn:
+                conn.close()
+
+    def start_feed_run(self, environment, feed_tag, conn=None):
+        return self._call("SELECT start_feed_run(%s, %s);", (environment.lower(), feed_tag), conn)
+
+    def complete_feed_run(self, feed_run_id, status, conn=None):
+        return self._call("SELECT complete_feed_run(%s, %s);", (feed_run_id, status), conn)
+
+    def get_run_statuses(self, feed_run_ids, conn=None):
+        if not feed_run_ids:
+            return {}
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT feed_run_id, status_cd FROM feed.feed_run WHERE feed_run_id = ANY(%s);",
+                    (list(feed_run_ids),)
+                )
+                return dict(cur.fetchall())
+        finally:
+            if own_conn:
+                conn.close()
+
+    @contextmanager
+    def session(self):
+        conn = self.connect()
+        conn.autocommit = True
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _fetchall(self, query, params):
+        conn = self.connect()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchall()
+        finally:
+            conn.close()
+
+    def feed_graph(self, feed_tags=None):
+        conn = self.connect()
+        try:
+            with conn.cursor() as cur:
+                if feed_tags:
+                    cur.execute("""
+                        SELECT feed_id, feed_tag FROM feed.feed
+                        WHERE is_active = TRUE AND feed_tag = ANY(%s);
+                    """, (list(feed_tags),))
+                else:
+                    cur.execute("""
+                        SELECT feed_id, feed_tag FROM feed.feed
+                        WHERE is_active = TRUE AND feed_tag IS NOT NULL;
+                    """)
+                feeds = dict(cur.fetchall())
+
+                cur.execute("""
+                    SELECT feed_id, depends_on_feed_id FROM feed.feed_dependency
+                    WHERE feed_id = ANY(%s) AND depends_on_feed_id = ANY(%s);
+                """, (list(feeds), list(feeds)))
+                upstreams = {}
+                for feed_id, depends_on in cur.fetchall():
+                    upstreams.setdefault(feed_id, set()).add(depends_on)
+        finally:
+            conn.close()
+        return feeds, upstreams
+
+    def feed_commands(self, feed_tag, environment, detail_types):
+        return self._fetchall("""
+            SELECT fd.detail_id, fd.detail_type_cd, fd.detail_desc, fd.detail_data
+            FROM feed.feed_details fd
+            JOIN feed.feed f ON fd.feed_id = f.feed_id
+            JOIN feed.feed_environment fe ON fd.environment_id = fe.environment_id
+            JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+            WHERE f.feed_tag = %s
+              AND UPPER(sc.common_cd) = UPPER(%s)
+              AND fd.detail_type_cd = ANY(%s)
+            ORDER BY fd.detail_id;
+        """, (feed_tag, environment, list(detail_types)))
+
+    def add_run_detail(self, feed_run_id, detail_desc, detail_data, parent_detail_id=None, conn=None):
+        return self._call("""
+            INSERT INTO feed.feed_run_details (parent_detail_id, feed_run_id, detail_desc, detail_data)
+            VALUES (%s, %s, %s, %s)
+            RETURNING detail_id;
+        """, (parent_detail_id, feed_run_id, detail_desc, detail_data), conn)
+
+    def append_run_log(self, feed_run_id, chunks, conn=None):
+        # Imported here: run_log reaches this module through feed_run_service
+        from app.services.run_log import append_chunks
+
+        return append_chunks(feed_run_id, chunks, conn=conn)
+
+    def record_heartbeat(self, feed_run_id, progress_pct=None, message=None, conn=None):
+        from app.services.heartbeat import record_heartbeat
+
+        return record_heartbeat(feed_run_id, progress_pct=progress_pct, message=message, conn=conn)
+
+    def attach_duckdb(self, con, tables):
+        import duckdb
+
+        try:
+            # LOAD never downloads; INSTALL would, and fails on offline hosts
+            con.execute("LOAD postgres;")
+        except duckdb.Error:
+            return _copy_into_duckdb(con, tables, lambda query: self._fetchall(query, None))
+        dsn = " ".join(f"{key}={value}" for key, value in {
+            'host': self.config['host'], 'port': self.config['port'], 'dbname': self.config['database'],
+            'user': self.config['user'], 'password': self.config['password'],
+        }.items() if value)
+        con.execute(f"ATTACH '{dsn}' AS pg (TYPE postgres, READ_ONLY);")
+        return 'pg.feed', 'pg.admin'
+
+
+def _adapt(params):
+    """Bind datetimes as SQLite's text timestamps (no process-wide adapter is registered)"""
+    if isinstance(params, dict):
+        return {key: _adapt_value(value) for key, value in params.items()}
+    return tuple(_adapt_value(value) for value in params)
+
+
+def _adapt_value(value):
+    return value.isoformat(sep=' ') if isinstance(value, datetime) else value
+
+
+def _timestamp_row_factory(timestamp_columns):
+    """Row factory parsing the TIMESTAMP columns of this connection's schema
+
+    sqlite3.register_converter would change every connection in the process,
+    so timestamps are converted per connection, by column name.
+    """
+    def factory(cursor, row):
+        if not any(isinstance(value, str) for value in row):
+            return row
+        names = [desc[0] for desc in cursor.description]
+        return tuple(
+            datetime.fromisoformat(value) if name in timestamp_columns and isinstance(value, str) else value
+            for name, value in zip(names, row)
+        )
+    return factory
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded SQLite store for local development, tests and benchmarks
+
+    One connection is shared by all threads and serialized with a lock;
+    SQLite allows a single writer anyway. The `conn` arguments of the run
+    operations are ignored.
+    """
+    name = 'sqlite'
+
+    def __init__(self, path=':memory:', seed=True):
+        self.path = path
+        self.in_memory = path in ('', ':memory:')
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            ':memory:' if self.in_memory else path,
+            isolation_level=None,  # transactions are managed explicitly
+            check_same_thread=False,
+        )
+        for schema in SQLITE_SCHEMAS:
+            self._conn.execute("ATTACH DATABASE ? AS " + schema, (self.schema_path(schema),))
+        self._conn.execute("PRAGMA foreign_keys = ON;")
+        if not self._has_schema():
+            self.create_schema(seed=seed)
+        self._conn.row_factory = _timestamp_row_factory(self._timestamp_columns())
+
+    def schema_path(self, schema):
+        """File behind an attached schema (':memory:' for in-memory stores)"""
+        if self.in_memory:
+            return ':memory:'
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}.{schema}{ext or '.db'}"
+
+    def connect(self):
+        return self._conn
+
+    def _timestamp_columns(self):
+        columns = set()
+        for schema in SQLITE_SCHEMAS:
+            tables = self._conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table';")
+            for (table,) in tables.fetchall():
+                info = self._conn.execute(f"PRAGMA {schema}.table_info({table});").fetchall()
+                columns.update(row[1] for row in info if row[2].upper() == 'TIMESTAMP')
+        return frozenset(columns)
+
+    def _has_schema(self):
+        row = self._conn.execute(
+            "SELECT 1 FROM feed.sqlite_master WHERE type = 'table' AND name = 'feed_run';"
+        ).fetchone()
+        return row is not None
+
+    def create_schema(self, seed=True):
+        """Run sql/sqlite/*.sql and, optionally, the seed data in sql/dcl/*.sql"""
+        files = sorted(glob.glob(os.path.join(SQLITE_SCHEMA_DIR, "*.sql")))
+        if seed:
+            files += sorted(glob.glob(os.path.join(SEED_DIR, "*.sql")))
+        with self._lock:
+            for file_path in files:
+                with open(file_path, "r") as f:
+                    self._conn.executescript(f.read())
+
+    @contextmanager
+    def transaction(self):
+        """Serialized write transaction (BEGIN IMMEDIATE takes the write lock up front)"""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE;")
+            try:
+                yield cur
+                cur.execute("COMMIT;")
+            except Exception:
+                cur.execute("ROLLBACK;")
+                raise
+            finally:
+                cur.close()
+
+    def query(self, query, params=()):
+        """Run a read and return (columns, rows)"""
+        with self._lock:
+            cur = self._conn.execute(query, _adapt(params))
+            columns = [desc[0] for desc in cur.description] if cur.description else []
+            return columns, cur.fetchall()
+
+    @staticmethod
+    def _code_id(cur, common_cd, code_type_cd):
+        row = cur.execute(
+            "SELECT code_id FROM admin.system_codes WHERE UPPER(common_cd) = UPPER(?) AND code_type_cd = ?;",
+            (common_cd, code_type_cd)
+        ).fetchone()
+        return row[0] if row else None
+
+    def start_feed_run(self, environment, feed_tag, conn=None):
+        """Python port of start_feed_run(): auto-creates the feed and environment"""
+        environment = environment.lower()
+        if environment not in VALID_ENVIRONMENTS:
+            raise ValueError("Invalid environment. Must be dev, test, or prod")
+
+        with self.transaction() as cur:
+            env_system_cd = self._code_id(cur, environment, 'FEED_ENVIRONMENT')
+            if env_system_cd is None:
+                raise ValueError(f"Environment system code not found for: {environment}")
+
+            row = cur.execute("SELECT feed_id FROM feed.feed WHERE feed_tag = ?;", (feed_tag,)).fetchone()
+            if row:
+                feed_id = row[0]
+            else:
+                cur.execute("""
+                    INSERT INTO feed.feed (feed_type_cd, feed_type_cd_type, feed_status_id,
+                                           feed_name, feed_description, feed_tag, is_active)
+                    VALUES ('SFTP_FEED', 'FEED_TYPE', ?, ?, ?, ?, TRUE);
+                """, (self._code_id(cur, 'ACTIVE', 'FEED_STATUS'),
+                      f"Auto Created for: {feed_tag}", f"Auto Created for: {feed_tag}", feed_tag))
+                feed_id = cur.lastrowid
+
+            row = cur.execute(
+                "SELECT environment_id FROM feed.feed_environment WHERE feed_id = ? AND env_system_cd = ?;",
+                (feed_id, env_system_cd)
+            ).fetchone()
+            if row:
+                environment_id = row[0]
+            else:
+                cur.execute(
+                    "INSERT INTO feed.feed_environment (feed_id, env_system_cd) VALUES (?, ?);",
+                    (feed_id, env_system_cd)
+                )
+                environment_id = cur.lastrowid
+
+            cur.execute("""
+                INSERT INTO feed.feed_run (feed_id, environment_id, start_dt, end_dt, description,
+                                           status_cd, status_cd_type)
+                VALUES (?, ?, datetime('now', 'localtime'), NULL, ?, 'RUNNING', 'STATUS');
+            """, (feed_id, environment_id,
+                  f"Feed run started for {feed_tag} in {environment} environment"))
+            return cur.lastrowid
+
+    def complete_feed_run(self, feed_run_id, status, conn=None):
+        """Python port of complete_feed_run(): 'success' or 'failure'"""
+        status_cd = RUN_RESULT_STATUSES.get((status or '').lower())
+        if status_cd is None:
+            raise ValueError("Invalid status. Must be success or failure")
+
+        with self.transaction() as cur:
+            if self._code_id(cur, status_cd, 'STATUS') is None:
+                raise ValueError(f"Status code {status_cd} not found in system_codes")
+            cur.execute("""
+                UPDATE feed.feed_run
+                SET end_dt = datetime('now', 'localtime'),
+                    status_cd = ?,
+                    updated_at = datetime('now', 'localtime')
+                WHERE feed_run_id = ? AND status_cd = 'RUNNING';
+            """, (status_cd, feed_run_id))
+            if cur.rowcount:
+                return True
+            cur.execute("SELECT 1 FROM feed.feed_run WHERE feed_run_id = ?;", (feed_run_id,))
+            if cur.fetchone() is None:
+                raise ValueError(f"Feed run ID {feed_run_id} not found")
+            return False
+
+    def get_run_statuses(self, feed_run_ids, conn=None):
+        ids = list(feed_run_ids)
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" for _ in ids)
+        _, rows = self.query(
+            f"SELECT feed_run_id, status_cd FROM feed.feed_run WHERE feed_run_id IN ({placeholders});", ids
+        )
+        return dict(rows)
+
+    @contextmanager
+    def session(self):
+        # Every write already runs in its own transaction on the shared connection
+        yield self._conn
+
+    def feed_graph(self, feed_tags=None):
+        _, rows = self.query("SELECT feed_id, feed_tag FROM feed.feed WHERE is_active = TRUE AND feed_tag IS NOT NULL;")
+        feeds = {feed_id: feed_tag for feed_id, feed_tag in rows if not feed_tags or feed_tag in feed_tags}
+        _, rows = self.query("SELECT feed_id, depends_on_feed_id FROM feed.feed_dependency;")
+        upstreams = {}
+        for feed_id, depends_on in rows:
+            if feed_id in feeds and depends_on in feeds:
+                upstreams.setdefault(feed_id, set()).add(depends_on)
+        return feeds, upstreams
+
+    def feed_commands(self, feed_tag, environment, detail_types):
+        placeholders = ", ".join("?" for _ in detail_types)
+        _, rows = self.query(f"""
+            SELECT fd.detail_id, fd.detail_type_cd, fd.detail_desc, fd.detail_data
+            FROM feed.feed_details fd
+            JOIN feed.feed f ON fd.feed_id = f.feed_id
+            JOIN feed.feed_environment fe ON fd.environment_id = fe.environment_id
+            JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+            WHERE f.feed_tag = ?
+              AND UPPER(sc.common_cd) = UPPER(?)
+              AND fd.detail_type_cd IN ({placeholders})
+            ORDER BY fd.detail_id;
+        """, (feed_tag, environment, *detail_types))
+        return rows
+
+    def add_run_detail(self, feed_run_id, detail_desc, detail_data, parent_detail_id=None, conn=None):
+        with self.transaction() as cur:
+            cur.execute("""
+                INSERT INTO feed.feed_run_details (parent_detail_id, feed_run_id, detail_desc, detail_data)
+                VALUES (?, ?, ?, ?);
+            """, (parent_detail_id, feed_run_id, detail_desc, detail_data))
+            return cur.lastrowid
+
+    def append_run_log(self, feed_run_id, chunks, conn=None):
+        from app.services.run_log import RunNotFound, normalize_chunks
+
+        rows = normalize_chunks(chunks)
+        if not rows:
+            return None, None
+        # BEGIN IMMEDIATE serializes appends, as the advisory lock does on PostgreSQL
+        with self.transaction() as cur:
+            if cur.execute("SELECT 1 FROM feed.feed_run WHERE feed_run_id = ?;", (feed_run_id,)).fetchone() is None:
+                raise RunNotFound(f"Feed run {feed_run_id} not found")
+            last_seq = cur.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM feed.feed_run_log WHERE feed_run_id = ?;", (feed_run_id,)
+            ).fetchone()[0]
+            cur.executemany(
+                "INSERT INTO feed.feed_run_log (feed_run_id, seq, stream, chunk) VALUES (?, ?, ?, ?);",
+                [(feed_run_id, last_seq + i, stream, text) for i, (stream, text) in enumerate(rows, 1)],
+            )
+        return last_seq + 1, last_seq + len(rows)
+
+    def attach_duckdb(self, con, tables):
+        return _copy_into_duckdb(con, tables, lambda query: self.query(query)[1])
+
+
+def _postgres_config(url):
+    parsed = urlparse(url)
+    overrides = {
+        'host': parsed.hostname,
+        'port': str(parsed.port) if parsed.port else None,
+        'database': parsed.path.lstrip('/') or None,
+        'user': unquote(parsed.username) if parsed.username else None,
+        'password': unquote(parsed.password) if parsed.password else None,
+    }
+    return {**DB_CONFIG, **{key: value for key, value in overrides.items() if value}}
+
+
+def backend_from_url(url):
+    """Build a backend from a DATABASE_URL-style string"""
+    if not url:
+        return PostgresBackend()
+    if url.startswith(('postgresql://', 'postgres://')):
+        return PostgresBackend(_postgres_config(url))
+    if url.startswith('sqlite:'):
+        path = url[len('sqlite:'):].lstrip('/') if url.startswith('sqlite:///') else ''
+        if url.startswith('sqlite:////'):
+            path = '/' + path
+        return SQLiteBackend(path or ':memory:')
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {url.split(':', 1)[0]}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Process-wide backend selected by DATABASE_URL"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_url(os.getenv('DATABASE_URL', ''))
+        return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide backend (e.g. an in-memory SQLite store in tests)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,36 @@
+from app.models.audit import AuditLog
+from app.models.base import Base
+from app.models.feed import Feed, FeedDependency, FeedDetail, FeedEnvironment
+from app.models.feed_run import (
+    FeedRun,
+    FeedRunDetail,
+    FeedRunHeartbeat,
+    FeedRunLog,
+    FeedRunMetric,
+    RunEvent,
+    RunEventConsumer,
+    RunMetricName,
+)
+from app.models.sla import FeedSla, FeedSlaBreach
+from app.models.system_codes import CodeType, SystemCode
+
+__all__ = [
+    "Base",
+    "CodeType",
+    "SystemCode",
+    "Feed",
+    "FeedEnvironment",
+    "FeedDependency",
+    "FeedDetail",
+    "FeedRun",
+    "FeedRunDetail",
+    "FeedRunHeartbeat",
+    "FeedRunLog",
+    "FeedRunMetric",
+    "RunMetricName",
+    "RunEvent",
+    "RunEventConsumer",
+    "FeedSla",
+    "FeedSlaBreach",
+    "AuditLog",
+]
@@ -0,0 +1,27 @@
+"""
+ORM model for the admin audit trail
+"""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, CheckConstraint, String, TIMESTAMP, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AuditLog(Base):
+    """admin.audit_log (append-only; written by triggers)"""
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        CheckConstraint("operation IN ('I', 'U', 'D')"),
+        {"schema": "admin"},
+    )
+
+    audit_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    changed_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    table_name: Mapped[str] = mapped_column(String(100))
+    operation: Mapped[str] = mapped_column(String(1))
+    row_key: Mapped[str] = mapped_column(String(100))
+    changed_by: Mapped[str] = mapped_column(String(100))
+    diff: Mapped[dict] = mapped_column(JSONB)
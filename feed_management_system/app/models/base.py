@@ -0,0 +1,8 @@
+"""
+Declarative base shared by all ORM models
+"""
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Base class for the feed management ORM models"""
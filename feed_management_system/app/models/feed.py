@@ -0,0 +1,116 @@
+"""
+ORM models for feed definitions: feeds, environments, details and dependencies
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    String,
+    Text,
+    TIMESTAMP,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.system_codes import SystemCode
+
+
+class Feed(Base):
+    """feed.feed"""
+    __tablename__ = "feed"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["feed_type_cd", "feed_type_cd_type"],
+            ["admin.system_codes.common_cd", "admin.system_codes.code_type_cd"],
+        ),
+        {"schema": "feed"},
+    )
+
+    feed_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    feed_type_cd: Mapped[str] = mapped_column(String(50))
+    feed_type_cd_type: Mapped[str] = mapped_column(String(50), server_default="FEED_TYPE")
+    feed_status_id: Mapped[Optional[int]] = mapped_column(ForeignKey("admin.system_codes.code_id"))
+    feed_name: Mapped[str] = mapped_column(String(255))
+    feed_description: Mapped[Optional[str]] = mapped_column(Text)
+    feed_tag: Mapped[Optional[str]] = mapped_column(String(255))
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, server_default="true")
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed_type: Mapped[SystemCode] = relationship(
+        foreign_keys=[feed_type_cd, feed_type_cd_type], viewonly=True
+    )
+    status: Mapped[Optional[SystemCode]] = relationship(foreign_keys=[feed_status_id])
+    environments: Mapped[List["FeedEnvironment"]] = relationship(back_populates="feed")
+    details: Mapped[List["FeedDetail"]] = relationship(back_populates="feed")
+    upstream_links: Mapped[List["FeedDependency"]] = relationship(
+        foreign_keys="FeedDependency.feed_id", back_populates="feed"
+    )
+
+    def __repr__(self):
+        return f"<Feed {self.feed_id} {self.feed_tag!r}>"
+
+
+class FeedEnvironment(Base):
+    """feed.feed_environment"""
+    __tablename__ = "feed_environment"
+    __table_args__ = {"schema": "feed"}
+
+    environment_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"))
+    env_system_cd: Mapped[int] = mapped_column(ForeignKey("admin.system_codes.code_id"))
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed: Mapped[Feed] = relationship(back_populates="environments")
+    env_code: Mapped[SystemCode] = relationship()
+
+
+class FeedDependency(Base):
+    """feed.feed_dependency"""
+    __tablename__ = "feed_dependency"
+    __table_args__ = (
+        CheckConstraint("feed_id <> depends_on_feed_id"),
+        {"schema": "feed"},
+    )
+
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"), primary_key=True)
+    depends_on_feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"), primary_key=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed: Mapped[Feed] = relationship(foreign_keys=[feed_id], back_populates="upstream_links")
+    depends_on: Mapped[Feed] = relationship(foreign_keys=[depends_on_feed_id])
+
+
+class FeedDetail(Base):
+    """feed.feed_details"""
+    __tablename__ = "feed_details"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["detail_type_cd", "detail_type_cd_type"],
+            ["admin.system_codes.common_cd", "admin.system_codes.code_type_cd"],
+        ),
+        {"schema": "feed"},
+    )
+
+    detail_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    parent_detail_id: Mapped[Optional[int]] = mapped_column(ForeignKey("feed.feed_details.detail_id"))
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"))
+    environment_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_environment.environment_id"))
+    detail_type_cd: Mapped[str] = mapped_column(String(50))
+    detail_type_cd_type: Mapped[str] = mapped_column(String(50))
+    detail_desc: Mapped[str] = mapped_column(String(500))
+    detail_data: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed: Mapped[Feed] = relationship(back_populates="details")
+    environment: Mapped[FeedEnvironment] = relationship()
+    detail_type: Mapped[SystemCode] = relationship(
+        foreign_keys=[detail_type_cd, detail_type_cd_type], viewonly=True
+    )
+    parent: Mapped[Optional["FeedDetail"]] = relationship(remote_side=[detail_id])
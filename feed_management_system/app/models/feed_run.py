@@ -0,0 +1,148 @@
+"""
+ORM models for feed runs and their details
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Double,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    Numeric,
+    SmallInteger,
+    String,
+    Text,
+    TIMESTAMP,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.feed import Feed, FeedEnvironment
+from app.models.system_codes import SystemCode
+
+
+class FeedRun(Base):
+    """feed.feed_run"""
+    __tablename__ = "feed_run"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["status_cd", "status_cd_type"],
+            ["admin.system_codes.common_cd", "admin.system_codes.code_type_cd"],
+        ),
+        {"schema": "feed"},
+    )
+
+    feed_run_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"))
+    environment_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_environment.environment_id"))
+    start_dt: Mapped[datetime] = mapped_column(TIMESTAMP)
+    end_dt: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    status_cd: Mapped[str] = mapped_column(String(50))
+    status_cd_type: Mapped[str] = mapped_column(String(50))
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed: Mapped[Feed] = relationship()
+    environment: Mapped[FeedEnvironment] = relationship()
+    status: Mapped[SystemCode] = relationship(foreign_keys=[status_cd, status_cd_type], viewonly=True)
+    details: Mapped[List["FeedRunDetail"]] = relationship(back_populates="run")
+
+    def __repr__(self):
+        return f"<FeedRun {self.feed_run_id} {self.status_cd}>"
+
+
+class FeedRunDetail(Base):
+    """feed.feed_run_details"""
+    __tablename__ = "feed_run_details"
+    __table_args__ = {"schema": "feed"}
+
+    detail_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    parent_detail_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("feed.feed_run_details.detail_id")
+    )
+    feed_run_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_run.feed_run_id"))
+    detail_desc: Mapped[str] = mapped_column(Text)
+    detail_data: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    run: Mapped[FeedRun] = relationship(back_populates="details")
+    parent: Mapped[Optional["FeedRunDetail"]] = relationship(remote_side=[detail_id])
+
+
+class FeedRunLog(Base):
+    """feed.feed_run_log"""
+    __tablename__ = "feed_run_log"
+    __table_args__ = {"schema": "feed"}
+
+    feed_run_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_run.feed_run_id"), primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    stream: Mapped[str] = mapped_column(String(10), server_default="STDOUT")
+    chunk: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+
+class FeedRunHeartbeat(Base):
+    """feed.feed_run_heartbeat (UNLOGGED; no FK so heartbeats stay HOT updates)"""
+    __tablename__ = "feed_run_heartbeat"
+    __table_args__ = {"schema": "feed", "prefixes": ["UNLOGGED"]}
+
+    feed_run_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    progress_pct: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
+    records_processed: Mapped[Optional[int]] = mapped_column(BigInteger)
+    records_total: Mapped[Optional[int]] = mapped_column(BigInteger)
+    message: Mapped[Optional[str]] = mapped_column(String(200))
+    heartbeat_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+class RunMetricName(Base):
+    """feed.run_metric_name"""
+    __tablename__ = "run_metric_name"
+    __table_args__ = {"schema": "feed"}
+
+    metric_id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    metric_name: Mapped[str] = mapped_column(String(63), unique=True)
+    unit: Mapped[Optional[str]] = mapped_column(String(20))
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+
+class FeedRunMetric(Base):
+    """feed.feed_run_metric"""
+    __tablename__ = "feed_run_metric"
+    __table_args__ = {"schema": "feed"}
+
+    value: Mapped[float] = mapped_column(Double)
+    recorded_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    feed_run_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_run.feed_run_id"), primary_key=True)
+    metric_id: Mapped[int] = mapped_column(ForeignKey("feed.run_metric_name.metric_id"), primary_key=True)
+
+    metric: Mapped[RunMetricName] = relationship()
+
+class RunEvent(Base):
+    """feed.run_event_outbox (written by triggers; no FK so events outlive purged runs)"""
+    __tablename__ = "run_event_outbox"
+    __table_args__ = {"schema": "feed"}
+
+    event_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    txid: Mapped[int] = mapped_column(BigInteger, server_default=func.txid_current())
+    event_type: Mapped[str] = mapped_column(String(20))
+    feed_run_id: Mapped[int] = mapped_column(Integer)
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+
+class RunEventConsumer(Base):
+    """feed.run_event_consumer"""
+    __tablename__ = "run_event_consumer"
+    __table_args__ = {"schema": "feed"}
+
+    consumer_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_txid: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    last_event_id: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    delivered_count: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
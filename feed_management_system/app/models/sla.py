@@ -0,0 +1,53 @@
+"""
+ORM models for feed SLAs and recorded breaches
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Boolean, ForeignKey, Integer, String, TIMESTAMP, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.feed import Feed, FeedEnvironment
+
+
+class FeedSla(Base):
+    """feed.feed_sla"""
+    __tablename__ = "feed_sla"
+    __table_args__ = (
+        UniqueConstraint("feed_id", "environment_id"),
+        {"schema": "feed"},
+    )
+
+    sla_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feed.feed.feed_id"))
+    environment_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_environment.environment_id"))
+    expected_start_cron: Mapped[str] = mapped_column(String(100))
+    start_grace_minutes: Mapped[int] = mapped_column(Integer, server_default="15")
+    max_duration_minutes: Mapped[int] = mapped_column(Integer)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, server_default="true")
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    feed: Mapped[Feed] = relationship()
+    environment: Mapped[FeedEnvironment] = relationship()
+    breaches: Mapped[List["FeedSlaBreach"]] = relationship(back_populates="sla")
+
+
+class FeedSlaBreach(Base):
+    """feed.feed_sla_breach"""
+    __tablename__ = "feed_sla_breach"
+    __table_args__ = (
+        UniqueConstraint("sla_id", "expected_start", "breach_type"),
+        {"schema": "feed"},
+    )
+
+    breach_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sla_id: Mapped[int] = mapped_column(ForeignKey("feed.feed_sla.sla_id"))
+    expected_start: Mapped[datetime] = mapped_column(TIMESTAMP)
+    breach_type: Mapped[str] = mapped_column(String(20))
+    feed_run_id: Mapped[Optional[int]] = mapped_column(Integer)
+    detected_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    resolved_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+
+    sla: Mapped[FeedSla] = relationship(back_populates="breaches")
@@ -0,0 +1,46 @@
+"""
+ORM models for the admin schema: code types and system codes
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Boolean, ForeignKey, Integer, String, TIMESTAMP, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class CodeType(Base):
+    """admin.code_type"""
+    __tablename__ = "code_type"
+    __table_args__ = {"schema": "admin"}
+
+    code_type_cd: Mapped[str] = mapped_column(String(50), primary_key=True)
+    code_type_description: Mapped[str] = mapped_column(String(255))
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    codes: Mapped[List["SystemCode"]] = relationship(back_populates="code_type")
+
+
+class SystemCode(Base):
+    """admin.system_codes"""
+    __tablename__ = "system_codes"
+    __table_args__ = (
+        UniqueConstraint("common_cd", "code_type_cd"),
+        {"schema": "admin"},
+    )
+
+    code_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    common_cd: Mapped[str] = mapped_column(String(50))
+    code_type_cd: Mapped[str] = mapped_column(String(50), ForeignKey("admin.code_type.code_type_cd"))
+    code_description: Mapped[str] = mapped_column(String(255))
+    sort_order: Mapped[Optional[int]] = mapped_column(Integer, server_default="0")
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, server_default="true")
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    code_type: Mapped[CodeType] = relationship(back_populates="codes")
+
+    def __repr__(self):
+        return f"<SystemCode {self.code_type_cd}:{self.common_cd}>"
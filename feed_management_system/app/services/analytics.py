@@ -0,0 +1,194 @@
+"""
+Run history analytics on DuckDB
+
+The rollups are written against a single denormalized "runs" view (one row
+per feed run with feed tag, environment and duration) so the same SQL works
+whatever DuckDB reads from:
+
+- connect_parquet() reads the Parquet snapshots in data/processed. This is
+  the default for the Analytics page and API: refresh_snapshots() pulls only
+  runs finished since the last refresh from feed.feed_run (an index range
+  scan on updated_at via export_service), and every heavy scan afterwards
+  runs in-process on the snapshot instead of on the production database.
+- connect_backend() reads the configured storage backend directly: the
+  embedded SQLite store (copied into DuckDB), or PostgreSQL through DuckDB's
+  postgres scanner when the extension is installed.
+"""
+import argparse
+from pathlib import Path
+
+from app.core.storage import get_backend
+from app.services.export_service import PROJECT_ROOT, export_table
+
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+SNAPSHOT_TABLE = "feed_run"
+
+# Columns the runs view reads from each backend table
+RUNS_VIEW_TABLES = {
+    'feed.feed_run': ('feed_run_id', 'feed_id', 'environment_id', 'status_cd', 'start_dt', 'end_dt'),
+    'feed.feed': ('feed_id', 'feed_tag'),
+    'feed.feed_environment': ('environment_id', 'env_system_cd'),
+    'admin.system_codes': ('code_id', 'common_cd'),
+}
+
+RUNS_VIEW = """
+    CREATE OR REPLACE VIEW runs AS
+    SELECT fr.feed_run_id, fr.feed_id, f.feed_tag,
+           lower(sc.common_cd) AS environment, fr.status_cd,
+           CAST(fr.start_dt AS TIMESTAMP) AS start_dt,
+           CAST(fr.end_dt AS TIMESTAMP) AS end_dt,
+           date_diff('second', CAST(fr.start_dt AS TIMESTAMP), CAST(fr.end_dt AS TIMESTAMP)) AS duration_seconds
+    FROM {feed}.feed_run fr
+    JOIN {feed}.feed f ON fr.feed_id = f.feed_id
+    JOIN {feed}.feed_environment fe ON fr.environment_id = fe.environment_id
+    JOIN {admin}.system_codes sc ON fe.env_system_cd = sc.code_id
+"""
+
+# A run re-exported after a later update appears twice; the newest copy wins
+PARQUET_RUNS_VIEW = """
+    CREATE OR REPLACE VIEW runs AS
+    SELECT feed_run_id, feed_id, feed_tag, lower(environment_cd) AS environment, status_cd,
+           start_dt, end_dt, date_diff('second', start_dt, end_dt) AS duration_seconds
+    FROM read_parquet('{pattern}', hive_partitioning = false, union_by_name = true)
+    QUALIFY row_number() OVER (PARTITION BY feed_run_id ORDER BY updated_at DESC) = 1
+"""
+
+ROLLUPS = {
+    'daily_runs': """
+        SELECT CAST(start_dt AS DATE) AS run_date, environment,
+               COUNT(*) AS runs,
+               COUNT(*) FILTER (WHERE status_cd = 'COMPLETED') AS completed,
+               COUNT(*) FILTER (WHERE status_cd = 'FAILED') AS failed,
+               ROUND(100.0 * COUNT(*) FILTER (WHERE status_cd = 'COMPLETED') / COUNT(*), 1) AS success_rate
+        FROM runs
+        WHERE start_dt >= current_date - CAST(? AS INTEGER)
+        GROUP BY ALL
+        ORDER BY run_date DESC, environment
+    """,
+    'durations': """
+        SELECT feed_tag, environment,
+               COUNT(*) AS runs,
+               ROUND(AVG(duration_seconds), 1) AS avg_seconds,
+               quantile_cont(duration_seconds, 0.5) AS p50_seconds,
+               quantile_cont(duration_seconds, 0.95) AS p95_seconds,
+               MAX(duration_seconds) AS max_seconds
+        FROM runs
+        WHERE status_cd = 'COMPLETED'
+          AND start_dt >= current_date - CAST(? AS INTEGER)
+        GROUP BY ALL
+        ORDER BY p95_seconds DESC NULLS LAST
+    """,
+    'feed_health': """
+        SELECT feed_tag, environment,
+               COUNT(*) AS runs,
+               COUNT(*) FILTER (WHERE status_cd = 'FAILED') AS failed,
+               ROUND(100.0 * COUNT(*) FILTER (WHERE status_cd = 'COMPLETED') / COUNT(*), 1) AS success_rate,
+               MAX(start_dt) AS last_run,
+               arg_max(status_cd, start_dt) AS last_status
+        FROM runs
+        WHERE start_dt >= current_date - CAST(? AS INTEGER)
+        GROUP BY ALL
+        ORDER BY success_rate, runs DESC
+    """,
+    # Consecutive failures per feed/environment (gaps and islands); "ongoing"
+    # streaks have not been broken by a later successful run
+    'failure_streaks': """
+        WITH ordered AS (
+            SELECT feed_tag, environment, start_dt, status_cd,
+                   row_number() OVER (PARTITION BY feed_tag, environment ORDER BY start_dt)
+                   - row_number() OVER (PARTITION BY feed_tag, environment, status_cd ORDER BY start_dt) AS island,
+                   max(start_dt) OVER (PARTITION BY feed_tag, environment) AS last_run
+            FROM runs
+            WHERE status_cd IN ('COMPLETED', 'FAILED')
+              AND start_dt >= current_date - CAST(? AS INTEGER)
+        )
+        SELECT feed_tag, environment,
+               COUNT(*) AS consecutive_failures,
+               MIN(start_dt) AS first_failure,
+               MAX(start_dt) AS last_failure,
+               MAX(start_dt) = any_value(last_run) AS ongoing
+        FROM ordered
+        WHERE status_cd = 'FAILED'
+        GROUP BY feed_tag, environment, island
+        HAVING COUNT(*) >= 2
+        ORDER BY ongoing DESC, consecutive_failures DESC
+    """,
+    'environment_comparison': """
+        SELECT feed_tag, environment,
+               COUNT(*) AS runs,
+               ROUND(100.0 * COUNT(*) FILTER (WHERE status_cd = 'COMPLETED') / COUNT(*), 1) AS success_rate,
+               quantile_cont(duration_seconds, 0.5) FILTER (WHERE status_cd = 'COMPLETED') AS p50_seconds,
+               quantile_cont(duration_seconds, 0.95) FILTER (WHERE status_cd = 'COMPLETED') AS p95_seconds
+        FROM runs
+        WHERE start_dt >= current_date - CAST(? AS INTEGER)
+        GROUP BY ALL
+        ORDER BY feed_tag, environment
+    """,
+}
+DEFAULT_DAYS = 30
+
+
+def refresh_snapshots(output_dir=PROCESSED_DIR, full=False):
+    """Append runs finished since the last refresh to the Parquet snapshot; returns the row count"""
+    return export_table(SNAPSHOT_TABLE, output_dir=output_dir, full=full)
+
+
+def snapshot_files(data_dir=PROCESSED_DIR):
+    """Parquet files currently in the snapshot"""
+    return sorted((Path(data_dir) / SNAPSHOT_TABLE).glob("**/*.parquet"))
+
+
+def connect_parquet(data_dir=PROCESSED_DIR):
+    """In-memory DuckDB connection with the runs view over the Parquet snapshot"""
+    import duckdb
+
+    if not snapshot_files(data_dir):
+        raise FileNotFoundError(f"No run snapshots in {data_dir}; refresh them first")
+    pattern = str(Path(data_dir) / SNAPSHOT_TABLE / "**" / "*.parquet").replace("'", "''")
+    con = duckdb.connect()
+    con.execute(PARQUET_RUNS_VIEW.format(pattern=pattern))
+    return con
+
+
+def connect_backend(backend=None):
+    """In-memory DuckDB connection with the runs view over a storage backend"""
+    import duckdb
+
+    con = duckdb.connect()
+    feed, admin = (backend or get_backend()).attach_duckdb(con, RUNS_VIEW_TABLES)
+    con.execute(RUNS_VIEW.format(feed=feed, admin=admin))
+    return con
+
+
+def rollup(con, name, days=DEFAULT_DAYS):
+    """Run one named rollup and return a DataFrame"""
+    if name not in ROLLUPS:
+        raise ValueError(f"Unknown rollup {name!r}; expected one of {', '.join(ROLLUPS)}")
+    return con.execute(ROLLUPS[name], [days]).df()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run history rollups on DuckDB")
+    parser.add_argument("rollup", nargs="?", choices=sorted(ROLLUPS))
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Look-back window in days")
+    parser.add_argument("--refresh", action="store_true", help="Update the Parquet snapshot first")
+    parser.add_argument("--full", action="store_true", help="With --refresh: re-export the whole history")
+    parser.add_argument("--source", choices=("parquet", "backend"), default="parquet",
+                        help="Query the snapshot (default) or the live storage backend")
+    args = parser.parse_args()
+
+    if args.refresh:
+        count = refresh_snapshots(full=args.full)
+        print(f"✅ Added {count} run(s) to the snapshot in {PROCESSED_DIR}")
+    if not args.rollup:
+        return
+
+    con = connect_parquet() if args.source == "parquet" else connect_backend()
+    try:
+        print(rollup(con, args.rollup, args.days).to_string(index=False))
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Audit trail queries over admin.audit_log
+
+Triggers record every insert, update and delete on the admin tables
+(code types, system codes, feeds, feed environments and feed details). Pages
+are keyset-paginated on audit_id, newest first, so deep pages cost the same
+as the first one. Time filters use the BRIN index on changed_at.
+"""
+import argparse
+import json
+
+from app.core.database import get_connection
+
+AUDITED_TABLES = ('admin.code_type', 'admin.system_codes', 'feed.feed',
+                  'feed.feed_environment', 'feed.feed_details')
+OPERATIONS = {'I': 'INSERT', 'U': 'UPDATE', 'D': 'DELETE'}
+DEFAULT_PAGE_SIZE = 50
+
+AUDIT_QUERY = """
+    SELECT audit_id, changed_at, table_name, operation, row_key, changed_by, diff
+    FROM admin.audit_log
+    WHERE (%(before_id)s::BIGINT IS NULL OR audit_id < %(before_id)s)
+      AND (%(table_name)s::VARCHAR IS NULL OR table_name = %(table_name)s)
+      AND (%(row_key)s::VARCHAR IS NULL OR row_key = %(row_key)s)
+      AND (%(operation)s::CHAR IS NULL OR operation = %(operation)s)
+      AND (%(since)s::TIMESTAMP IS NULL OR changed_at >= %(since)s)
+      AND (%(until)s::TIMESTAMP IS NULL OR changed_at < %(until)s)
+    ORDER BY audit_id DESC
+    LIMIT %(limit)s;
+"""
+
+
+def list_changes(table_name=None, row_key=None, operation=None, since=None, until=None,
+                 before_id=None, limit=DEFAULT_PAGE_SIZE, conn=None):
+    """One page of audit entries, newest first
+
+    Returns {'entries': [...], 'next_before_id': id or None}; pass
+    next_before_id back as before_id for the following page.
+    """
+    params = {
+        'table_name': table_name, 'row_key': None if row_key is None else str(row_key),
+        'operation': operation, 'since': since, 'until': until,
+        'before_id': before_id, 'limit': limit + 1,
+    }
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(AUDIT_QUERY, params)
+            columns = [desc[0] for desc in cur.description]
+            rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
+
+    has_more = len(rows) > limit
+    entries = rows[:limit]
+    return {'entries': entries, 'next_before_id': entries[-1]['audit_id'] if has_more else None}
+
+
+def format_diff(operation, diff):
+    """Human-readable one-liner for an entry's diff"""
+    if operation == 'U':
+        return ", ".join(f"{column}: {json.dumps(old)} → {json.dumps(new)}"
+                         for column, (old, new) in sorted(diff.items()))
+    return ", ".join(f"{column}={json.dumps(value)}" for column, value in sorted(diff.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show recent admin changes")
+    parser.add_argument("--table", choices=AUDITED_TABLES)
+    parser.add_argument("--key", help="Row key, e.g. a feed_id")
+    parser.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    page = list_changes(table_name=args.table, row_key=args.key, limit=args.limit)
+    for entry in page['entries']:
+        print(f"{entry['changed_at']:%Y-%m-%d %H:%M:%S} {entry['changed_by']:<12} "
+              f"{OPERATIONS[entry['operation']]:<6} {entry['table_name']}[{entry['row_key']}] "
+              f"{format_diff(entry['operation'], entry['diff'])}")
+    if page['next_before_id']:
+        print(f"... more entries before audit_id {page['next_before_id']}")
+
+
+if __name__ == "__main__":
+    main()
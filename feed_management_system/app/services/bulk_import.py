@@ -0,0 +1,369 @@
+"""
+Bulk import of feeds, feed environments and feed details from CSV/YAML manifests
+
+Manifest rows are validated against admin.system_codes up front, then loaded in
+one transaction: COPY into temporary staging tables followed by set-based
+merges into feed.feed, feed.feed_environment and feed.feed_details. Feeds are
+matched on feed_tag and details on (feed, environment, detail type, detail_desc),
+so re-importing a manifest updates in place instead of duplicating.
+
+CSV manifests have one row per feed/environment/detail combination:
+    feed_tag,feed_name,feed_type_cd,feed_status_cd,feed_description,is_active,
+    environment_cd,detail_type_cd,detail_desc,detail_data
+Feed columns only need to be filled on the first row of each feed_tag.
+
+YAML manifests nest environments and details under each feed:
+    feeds:
+      - feed_tag: global_batch57
+        feed_name: global batch 57
+        feed_type_cd: BATCH_PROC
+        feed_status_cd: ACTIVE
+        environments: [DEV, PROD]
+        details:
+          - environment_cd: DEV
+            detail_type_cd: AWS_CLI_COMMAND
+            detail_desc: Submit batch job
+            detail_data: aws batch submit-job ...
+"""
+import argparse
+import csv
+import io
+from pathlib import Path
+
+import yaml
+
+from app.core.database import get_connection
+
+FEED_COLUMNS = ('feed_tag', 'feed_name', 'feed_type_cd', 'feed_status_cd', 'feed_description', 'is_active')
+DETAIL_COLUMNS = ('environment_cd', 'detail_type_cd', 'detail_desc', 'detail_data')
+CSV_COLUMNS = FEED_COLUMNS + DETAIL_COLUMNS
+
+MAX_LENGTHS = {
+    'feed_tag': 255,
+    'feed_name': 255,
+    'detail_desc': 500,
+}
+
+IMPORTED_TABLES = ('feed.feed', 'feed.feed_environment', 'feed.feed_details')
+
+TRUE_VALUES = {'true', 't', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'f', 'no', 'n', '0'}
+
+STAGING_DDL = """
+CREATE TEMP TABLE stg_feed (
+    row_no INTEGER, feed_tag VARCHAR(255), feed_name VARCHAR(255), feed_type_cd VARCHAR(50),
+    feed_status_id INTEGER, feed_description TEXT, is_active BOOLEAN
+) ON COMMIT DROP;
+CREATE TEMP TABLE stg_feed_env (
+    row_no INTEGER, feed_tag VARCHAR(255), env_system_cd INTEGER
+) ON COMMIT DROP;
+CREATE TEMP TABLE stg_feed_detail (
+    row_no INTEGER, feed_tag VARCHAR(255), env_system_cd INTEGER, detail_type_cd VARCHAR(50),
+    detail_desc VARCHAR(500), detail_data TEXT
+) ON COMMIT DROP;
+"""
+
+MERGE_STATEMENTS = [
+    ("feeds_updated", """
+        UPDATE feed.feed f
+        SET feed_name = s.feed_name, feed_type_cd = s.feed_type_cd, feed_status_id = s.feed_status_id,
+            feed_description = s.feed_description, is_active = s.is_active, updated_at = CURRENT_TIMESTAMP
+        FROM stg_feed s
+        WHERE f.feed_tag = s.feed_tag
+          AND (f.feed_name, f.feed_type_cd, f.feed_status_id, f.feed_description, f.is_active)
+              IS DISTINCT FROM (s.feed_name, s.feed_type_cd, s.feed_status_id, s.feed_description, s.is_active);
+    """),
+    ("feeds_inserted", """
+        INSERT INTO feed.feed (feed_type_cd, feed_type_cd_type, feed_status_id, feed_name,
+                               feed_description, feed_tag, is_active)
+        SELECT s.feed_type_cd, 'FEED_TYPE', s.feed_status_id, s.feed_name,
+               s.feed_description, s.feed_tag, s.is_active
+        FROM stg_feed s
+        WHERE NOT EXISTS (SELECT 1 FROM feed.feed f WHERE f.feed_tag = s.feed_tag);
+    """),
+    ("environments_inserted", """
+        INSERT INTO feed.feed_environment (feed_id, env_system_cd)
+        SELECT DISTINCT f.feed_id, s.env_system_cd
+        FROM stg_feed_env s
+        JOIN feed.feed f ON f.feed_tag = s.feed_tag
+        WHERE NOT EXISTS (
+            SELECT 1 FROM feed.feed_environment fe
+            WHERE fe.feed_id = f.feed_id AND fe.env_system_cd = s.env_system_cd
+        );
+    """),
+    (None, """
+        CREATE TEMP TABLE stg_detail_target ON COMMIT DROP AS
+        SELECT DISTINCT ON (s.row_no) s.row_no, f.feed_id, fe.environment_id,
+               s.detail_type_cd, s.detail_desc, s.detail_data
+        FROM stg_feed_detail s
+        JOIN feed.feed f ON f.feed_tag = s.feed_tag
+        JOIN feed.feed_environment fe ON fe.feed_id = f.feed_id AND fe.env_system_cd = s.env_system_cd
+        ORDER BY s.row_no, f.feed_id, fe.environment_id;
+    """),
+    ("details_updated", """
+        UPDATE feed.feed_details fd
+        SET detail_data = t.detail_data
+        FROM stg_detail_target t
+        WHERE fd.feed_id = t.feed_id AND fd.environment_id = t.environment_id
+          AND fd.detail_type_cd = t.detail_type_cd AND fd.detail_desc = t.detail_desc
+          AND fd.detail_data IS DISTINCT FROM t.detail_data;
+    """),
+    ("details_inserted", """
+        INSERT INTO feed.feed_details (feed_id, environment_id, detail_type_cd, detail_type_cd_type,
+                                       detail_desc, detail_data)
+        SELECT t.feed_id, t.environment_id, t.detail_type_cd, 'FEED_RUN_DETAIL_TYPE',
+               t.detail_desc, t.detail_data
+        FROM stg_detail_target t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM feed.feed_details fd
+            WHERE fd.feed_id = t.feed_id AND fd.environment_id = t.environment_id
+              AND fd.detail_type_cd = t.detail_type_cd AND fd.detail_desc = t.detail_desc
+        );
+    """),
+]
+
+
+class RowError:
+    """A validation problem tied to a manifest row (1-based, header excluded)"""
+    __slots__ = ('row_no', 'field', 'message')
+
+    def __init__(self, row_no, field, message):
+        self.row_no = row_no
+        self.field = field
+        self.message = message
+
+    def as_dict(self):
+        return {'row': self.row_no, 'field': self.field, 'error': self.message}
+
+    def __repr__(self):
+        return f"Row {self.row_no} [{self.field}]: {self.message}"
+
+
+class ImportResult:
+    """Outcome of an import: merge counts plus per-row validation errors"""
+
+    def __init__(self, counts=None, errors=None, loaded=False):
+        self.counts = counts or {}
+        self.errors = errors or []
+        self.loaded = loaded
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _clean(value):
+    if _blank(value):
+        return None
+    return value.strip() if isinstance(value, str) else value
+
+
+def parse_manifest(source, file_name):
+    """Parse CSV or YAML text into a flat list of (row_no, record) pairs"""
+    text = source.decode('utf-8-sig') if isinstance(source, bytes) else source
+    suffix = Path(file_name).suffix.lower()
+
+    if suffix == '.csv':
+        reader = csv.DictReader(io.StringIO(text))
+        return [(row_no, {col: _clean(row.get(col)) for col in CSV_COLUMNS})
+                for row_no, row in enumerate(reader, start=1)]
+
+    if suffix in ('.yaml', '.yml'):
+        document = yaml.safe_load(text) or {}
+        feeds = document.get('feeds', []) if isinstance(document, dict) else document
+        records = []
+        for feed in feeds:
+            base = {col: _clean(feed.get(col)) for col in FEED_COLUMNS}
+            records.append({**base, **dict.fromkeys(DETAIL_COLUMNS)})
+            for env in feed.get('environments') or []:
+                records.append({'feed_tag': base['feed_tag'], 'environment_cd': _clean(env)})
+            for detail in feed.get('details') or []:
+                records.append({'feed_tag': base['feed_tag'],
+                                **{col: _clean(detail.get(col)) for col in DETAIL_COLUMNS}})
+        return [(row_no, {col: rec.get(col) for col in CSV_COLUMNS})
+                for row_no, rec in enumerate(records, start=1)]
+
+    raise ValueError(f"Unsupported manifest type '{suffix}'. Use .csv, .yaml or .yml")
+
+
+def load_system_codes(conn):
+    """Return {code_type_cd: {common_cd: code_id}} for active system codes"""
+    codes = {}
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT code_type_cd, common_cd, code_id
+            FROM admin.system_codes
+            WHERE is_active = TRUE;
+        """)
+        for code_type_cd, common_cd, code_id in cur.fetchall():
+            codes.setdefault(code_type_cd, {})[common_cd.upper()] = code_id
+    return codes
+
+
+def validate_manifest(records, system_codes):
+    """Validate parsed rows; returns (feeds, environments, details, errors) ready for staging"""
+    errors = []
+    feeds, environments, details, definitions = {}, {}, {}, {}
+    feed_types = system_codes.get('FEED_TYPE', {})
+    feed_statuses = system_codes.get('FEED_STATUS', {})
+    env_codes = system_codes.get('FEED_ENVIRONMENT', {})
+    detail_types = system_codes.get('FEED_RUN_DETAIL_TYPE', {})
+
+    def check_length(row_no, record, field):
+        value = record.get(field)
+        if value is not None and len(value) > MAX_LENGTHS[field]:
+            errors.append(RowError(row_no, field, f"Longer than {MAX_LENGTHS[field]} characters"))
+            return False
+        return True
+
+    for row_no, record in records:
+        tag = record['feed_tag']
+        if not tag:
+            errors.append(RowError(row_no, 'feed_tag', "feed_tag is required"))
+            continue
+        if not check_length(row_no, record, 'feed_tag'):
+            continue
+
+        # Feed attributes (first row that provides them wins)
+        if record['feed_name'] or record['feed_type_cd']:
+            definition = tuple(record[col] for col in FEED_COLUMNS)
+            if tag in definitions:
+                if definitions[tag] != definition:
+                    errors.append(RowError(row_no, 'feed_tag', f"Conflicting definitions for feed '{tag}'"))
+            else:
+                definitions[tag] = definition
+                ok = check_length(row_no, record, 'feed_name')
+                if not record['feed_name']:
+                    errors.append(RowError(row_no, 'feed_name', "feed_name is required"))
+                    ok = False
+                feed_type = (record['feed_type_cd'] or '').upper()
+                if feed_type not in feed_types:
+                    errors.append(RowError(row_no, 'feed_type_cd', f"Unknown FEED_TYPE '{record['feed_type_cd']}'"))
+                    ok = False
+                status = (record['feed_status_cd'] or 'ACTIVE').upper()
+                if status not in feed_statuses:
+                    errors.append(RowError(row_no, 'feed_status_cd', f"Unknown FEED_STATUS '{record['feed_status_cd']}'"))
+                    ok = False
+                is_active = str(record['is_active'] if record['is_active'] is not None else 'true').lower()
+                if is_active not in TRUE_VALUES | FALSE_VALUES:
+                    errors.append(RowError(row_no, 'is_active', f"Not a boolean: '{record['is_active']}'"))
+                    ok = False
+                feeds[tag] = (row_no, tag, record['feed_name'], feed_type, feed_statuses.get(status),
+                              record['feed_description'], is_active in TRUE_VALUES) if ok else None
+
+        # Environment / detail part of the row
+        env_cd = (record['environment_cd'] or '').upper()
+        has_detail = any(record[col] for col in ('detail_type_cd', 'detail_desc', 'detail_data'))
+        if not env_cd:
+            if has_detail:
+                errors.append(RowError(row_no, 'environment_cd', "environment_cd is required for details"))
+            continue
+        if env_cd not in env_codes:
+            errors.append(RowError(row_no, 'environment_cd', f"Unknown FEED_ENVIRONMENT '{record['environment_cd']}'"))
+            continue
+        environments.setdefault((tag, env_cd), (row_no, tag, env_codes[env_cd]))
+
+        if has_detail:
+            detail_type = (record['detail_type_cd'] or '').upper()
+            if detail_type not in detail_types:
+                errors.append(RowError(row_no, 'detail_type_cd', f"Unknown FEED_RUN_DETAIL_TYPE '{record['detail_type_cd']}'"))
+                continue
+            if not record['detail_desc']:
+                errors.append(RowError(row_no, 'detail_desc', "detail_desc is required"))
+                continue
+            if not check_length(row_no, record, 'detail_desc'):
+                continue
+            key = (tag, env_cd, detail_type, record['detail_desc'])
+            if key in details:
+                errors.append(RowError(row_no, 'detail_desc', "Duplicate detail for this feed/environment/type"))
+                continue
+            details[key] = (row_no, tag, env_codes[env_cd], detail_type, record['detail_desc'], record['detail_data'])
+
+    # Drop everything that belongs to an invalid feed definition
+    invalid_tags = {tag for tag, feed in feeds.items() if feed is None}
+    feed_rows = [feed for feed in feeds.values() if feed is not None]
+    env_rows = [env for env in environments.values() if env[1] not in invalid_tags]
+    detail_rows = [detail for detail in details.values() if detail[1] not in invalid_tags]
+    return feed_rows, env_rows, detail_rows, errors
+
+
+def _copy_rows(cur, table, rows):
+    """COPY tuples into a staging table using CSV with \\N as NULL"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+
+
+def import_manifest(records, dry_run=False, skip_invalid=False, conn=None):
+    """Validate and load parsed manifest rows in a single transaction
+
+    With errors present nothing is loaded unless skip_invalid is set, in which
+    case only the valid rows are merged. dry_run performs the merge and rolls it
+    back, so the counts show what would change.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        system_codes = load_system_codes(conn)
+        feed_rows, env_rows, detail_rows, errors = validate_manifest(records, system_codes)
+        if errors and not skip_invalid:
+            conn.rollback()
+            return ImportResult(errors=errors)
+
+        counts = {}
+        with conn.cursor() as cur:
+            cur.execute(STAGING_DDL)
+            _copy_rows(cur, 'stg_feed', feed_rows)
+            _copy_rows(cur, 'stg_feed_env', env_rows)
+            _copy_rows(cur, 'stg_feed_detail', detail_rows)
+            for name, statement in MERGE_STATEMENTS:
+                cur.execute(statement)
+                if name:
+                    counts[name] = cur.rowcount
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+        return ImportResult(counts=counts, errors=errors, loaded=not dry_run)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def import_file(path, dry_run=False, skip_invalid=False):
+    """Parse and import a manifest file"""
+    path = Path(path)
+    records = parse_manifest(path.read_bytes(), path.name)
+    return import_manifest(records, dry_run=dry_run, skip_invalid=skip_invalid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import feeds from a CSV or YAML manifest")
+    parser.add_argument("manifest", help="Path to a .csv, .yaml or .yml manifest")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and report counts without committing")
+    parser.add_argument("--skip-invalid", action="store_true", help="Load valid rows even if some rows fail validation")
+    args = parser.parse_args()
+
+    result = import_file(args.manifest, dry_run=args.dry_run, skip_invalid=args.skip_invalid)
+    for error in result.errors:
+        print(f"❌ {error}")
+    for name, count in result.counts.items():
+        print(f"{name}: {count}")
+    if result.loaded:
+        print("✅ Import committed")
+    elif result.counts:
+        print("ℹ️ Dry run - nothing committed")
+    else:
+        print("❌ Nothing imported")
+
+
+if __name__ == "__main__":
+    main()
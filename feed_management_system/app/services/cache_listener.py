@@ -0,0 +1,97 @@
+"""
+Relay table_changed notifications from PostgreSQL to the shared cache
+
+The change-counter trigger calls pg_notify('table_changed', '<schema>.<table>')
+for every committed write, whoever made it (stored functions, jobs, psql,
+another app instance). This listener bumps the matching table version in the
+shared cache, so cached reads of that table are dropped in every worker.
+feed.feed_run is not counted and sends no notifications, so cached reads of
+run data expire through their TTL instead.
+
+Run one listener per shared cache (CACHE_URL=redis://...):
+
+    python -m app.services.cache_listener
+
+With CACHE_URL=memory:// the cache lives inside one process, so the API
+starts the listener on a background thread instead (start_listener_thread).
+"""
+import argparse
+import select
+import threading
+import time
+
+from app.core.database import get_connection
+from app.core.shared_cache import ALL_TABLES, get_shared_cache
+
+CHANNEL = 'table_changed'
+RECONNECT_DELAY = 5
+
+
+def listen(cache, stop_event=None, poll_timeout=5.0, on_change=None):
+    """Block relaying notifications into `cache` until stop_event is set
+
+    Connection errors reconnect after RECONNECT_DELAY; everything is
+    invalidated on (re)connect because notifications sent while
+    disconnected are lost.
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        conn = None
+        try:
+            conn = get_connection()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL};")
+            cache.invalidate_tables([ALL_TABLES])
+
+            while not stop_event.is_set():
+                if select.select([conn], [], [], poll_timeout) == ([], [], []):
+                    continue
+                conn.poll()
+                tables = {notify.payload for notify in conn.notifies}
+                conn.notifies.clear()
+                if tables:
+                    cache.invalidate_tables(tables)
+                    if on_change:
+                        on_change(tables)
+        except Exception as e:
+            print(f"❌ Cache listener error: {e}; reconnecting in {RECONNECT_DELAY}s")
+            stop_event.wait(RECONNECT_DELAY)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_listener_thread(cache=None):
+    """Run listen() on a daemon thread; returns the Event that stops it"""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=listen, args=(cache or get_shared_cache(), stop_event),
+        name="cache-listener", daemon=True,
+    )
+    thread.start()
+    return stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invalidate the shared cache on database changes")
+    parser.add_argument("--verbose", action="store_true", help="Print every invalidated table")
+    args = parser.parse_args()
+
+    cache = get_shared_cache()
+    if cache is None:
+        print("❌ CACHE_URL is not set; nothing to invalidate")
+        return
+    print(f"✅ Listening on '{CHANNEL}' for {cache.stats()['backend']}")
+
+    def report(tables):
+        print(f"{time.strftime('%H:%M:%S')} invalidated {', '.join(sorted(tables))}")
+
+    try:
+        listen(cache, on_change=report if args.verbose else None)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Declarative feed configuration diff and sync
+
+The desired state is either a manifest in the bulk import format (see
+app/services/bulk_import.py) or another environment of the same database, e.g.
+promoting DEV feed details to TEST. The current state is read with one query
+per table, the minimal diff is computed in memory, and applying it runs a
+handful of batched set-based statements (execute_values) in one transaction.
+
+Nothing is removed unless prune is requested: pruning deactivates feeds that
+are missing from a manifest and deletes feed details that are not in the
+desired state. Feeds are never hard-deleted here; use delete_feed for that.
+"""
+import argparse
+import sys
+
+import yaml
+from psycopg2.extras import execute_values
+
+from app.core.database import get_connection
+from app.services.bulk_import import load_system_codes, parse_manifest, validate_manifest
+
+PAGE_SIZE = 1000
+
+
+class ConfigState:
+    """Feed configuration keyed for diffing
+
+    feeds:        {feed_tag: (feed_name, feed_type_cd, feed_status_id, feed_description, is_active)}
+    environments: {(feed_tag, env_system_cd)}
+    details:      {(feed_tag, env_system_cd, detail_type_cd, detail_desc): detail_data}
+    detail_ids:   {detail key: detail_id} (current state only)
+    duplicate_detail_ids: [(env_system_cd, detail_id)] rows repeating an existing key
+    """
+
+    def __init__(self):
+        self.feeds = {}
+        self.environments = set()
+        self.details = {}
+        self.detail_ids = {}
+        self.duplicate_detail_ids = []
+
+
+class ConfigDiff:
+    """Minimal set of changes that turns the current state into the desired one"""
+
+    def __init__(self):
+        self.feeds_to_insert = []
+        self.feeds_to_update = []
+        self.feeds_to_deactivate = []
+        self.environments_to_insert = []
+        self.details_to_insert = []
+        self.details_to_update = []
+        self.details_to_delete = []
+
+    def summary(self):
+        return {
+            'feeds_to_insert': len(self.feeds_to_insert),
+            'feeds_to_update': len(self.feeds_to_update),
+            'feeds_to_deactivate': len(self.feeds_to_deactivate),
+            'environments_to_insert': len(self.environments_to_insert),
+            'details_to_insert': len(self.details_to_insert),
+            'details_to_update': len(self.details_to_update),
+            'details_to_delete': len(self.details_to_delete),
+        }
+
+    @property
+    def is_empty(self):
+        return not any(self.summary().values())
+
+
+def load_current_state(conn):
+    """Read all feeds, environments and feed details in three queries"""
+    state = ConfigState()
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT feed_tag, feed_name, feed_type_cd, feed_status_id, feed_description, is_active
+            FROM feed.feed
+            WHERE feed_tag IS NOT NULL
+            ORDER BY feed_id;
+        """)
+        for tag, *attributes in cur.fetchall():
+            state.feeds.setdefault(tag, tuple(attributes))
+
+        cur.execute("""
+            SELECT DISTINCT f.feed_tag, fe.env_system_cd
+            FROM feed.feed_environment fe
+            JOIN feed.feed f ON fe.feed_id = f.feed_id
+            WHERE f.feed_tag IS NOT NULL;
+        """)
+        state.environments = set(cur.fetchall())
+
+        cur.execute("""
+            SELECT fd.detail_id, f.feed_tag, fe.env_system_cd, fd.detail_type_cd, fd.detail_desc, fd.detail_data
+            FROM feed.feed_details fd
+            JOIN feed.feed f ON fd.feed_id = f.feed_id
+            JOIN feed.feed_environment fe ON fd.environment_id = fe.environment_id
+            WHERE f.feed_tag IS NOT NULL
+            ORDER BY fd.detail_id;
+        """)
+        for detail_id, tag, env, detail_type, detail_desc, detail_data in cur.fetchall():
+            key = (tag, env, detail_type, detail_desc)
+            if key in state.details:
+                state.duplicate_detail_ids.append((env, detail_id))
+                continue
+            state.details[key] = detail_data
+            state.detail_ids[key] = detail_id
+    return state
+
+
+def state_from_manifest(records, system_codes):
+    """Build the desired state from parsed manifest rows; raises ValueError on invalid rows"""
+    feed_rows, env_rows, detail_rows, errors = validate_manifest(records, system_codes)
+    if errors:
+        raise ValueError("Manifest failed validation:\n" + "\n".join(repr(error) for error in errors))
+
+    state = ConfigState()
+    for _, tag, feed_name, feed_type, status_id, description, is_active in feed_rows:
+        state.feeds[tag] = (feed_name, feed_type, status_id, description, is_active)
+    state.environments = {(tag, env) for _, tag, env in env_rows}
+    for _, tag, env, detail_type, detail_desc, detail_data in detail_rows:
+        state.details[(tag, env, detail_type, detail_desc)] = detail_data
+    return state
+
+
+def state_for_promotion(current, source_env, target_env):
+    """Desired state in which target_env's environments/details mirror source_env"""
+    state = ConfigState()
+    state.feeds = dict(current.feeds)
+    state.environments = {(tag, env) for tag, env in current.environments if env != target_env}
+    state.environments |= {(tag, target_env) for tag, env in current.environments if env == source_env}
+    state.details = {key: data for key, data in current.details.items() if key[1] != target_env}
+    for (tag, env, detail_type, detail_desc), data in current.details.items():
+        if env == source_env:
+            state.details[(tag, target_env, detail_type, detail_desc)] = data
+    return state
+
+
+def compute_diff(current, desired, prune=False, env_scope=None):
+    """Diff two states; env_scope limits environment/detail changes to those env_system_cds"""
+    diff = ConfigDiff()
+
+    def in_scope(env):
+        return env_scope is None or env in env_scope
+
+    for tag, attributes in desired.feeds.items():
+        if tag not in current.feeds:
+            diff.feeds_to_insert.append((tag, *attributes))
+        elif current.feeds[tag] != attributes:
+            diff.feeds_to_update.append((tag, *attributes))
+    if prune and env_scope is None:
+        diff.feeds_to_deactivate = [tag for tag, attributes in current.feeds.items()
+                                    if tag not in desired.feeds and attributes[4]]
+
+    diff.environments_to_insert = sorted(
+        (tag, env) for tag, env in desired.environments - current.environments if in_scope(env)
+    )
+
+    for key, data in desired.details.items():
+        if not in_scope(key[1]):
+            continue
+        if key not in current.details:
+            diff.details_to_insert.append((*key, data))
+        elif current.details[key] != data:
+            diff.details_to_update.append((current.detail_ids[key], data))
+    if prune:
+        diff.details_to_delete = [detail_id for key, detail_id in current.detail_ids.items()
+                                  if key not in desired.details and in_scope(key[1])]
+        diff.details_to_delete += [detail_id for env, detail_id in current.duplicate_detail_ids if in_scope(env)]
+    return diff
+
+
+def apply_diff(diff, conn, dry_run=False):
+    """Apply a diff with batched set-based statements in one transaction"""
+    try:
+        with conn.cursor() as cur:
+            if diff.feeds_to_insert:
+                execute_values(cur, """
+                    INSERT INTO feed.feed (feed_tag, feed_name, feed_type_cd, feed_type_cd_type,
+                                           feed_status_id, feed_description, is_active)
+                    SELECT v.feed_tag, v.feed_name, v.feed_type_cd, 'FEED_TYPE',
+                           v.feed_status_id, v.feed_description, v.is_active
+                    FROM (VALUES %s) AS v(feed_tag, feed_name, feed_type_cd, feed_status_id, feed_description, is_active);
+                """, diff.feeds_to_insert, template="(%s, %s, %s, %s::INTEGER, %s, %s::BOOLEAN)", page_size=PAGE_SIZE)
+
+            if diff.feeds_to_update:
+                execute_values(cur, """
+                    UPDATE feed.feed f
+                    SET feed_name = v.feed_name, feed_type_cd = v.feed_type_cd, feed_status_id = v.feed_status_id,
+                        feed_description = v.feed_description, is_active = v.is_active,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(feed_tag, feed_name, feed_type_cd, feed_status_id, feed_description, is_active)
+                    WHERE f.feed_tag = v.feed_tag;
+                """, diff.feeds_to_update, template="(%s, %s, %s, %s::INTEGER, %s, %s::BOOLEAN)", page_size=PAGE_SIZE)
+
+            if diff.feeds_to_deactivate:
+                cur.execute("""
+                    UPDATE feed.feed SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
+                    WHERE feed_tag = ANY(%s);
+                """, (diff.feeds_to_deactivate,))
+
+            if diff.environments_to_insert:
+                execute_values(cur, """
+                    INSERT INTO feed.feed_environment (feed_id, env_system_cd)
+                    SELECT f.feed_id, v.env_system_cd
+                    FROM (VALUES %s) AS v(feed_tag, env_system_cd)
+                    JOIN feed.feed f ON f.feed_tag = v.feed_tag;
+                """, diff.environments_to_insert, template="(%s, %s::INTEGER)", page_size=PAGE_SIZE)
+
+            if diff.details_to_insert:
+                execute_values(cur, """
+                    INSERT INTO feed.feed_details (feed_id, environment_id, detail_type_cd, detail_type_cd_type,
+                                                   detail_desc, detail_data)
+                    SELECT fe.feed_id, fe.environment_id, v.detail_type_cd, 'FEED_RUN_DETAIL_TYPE',
+                           v.detail_desc, v.detail_data
+                    FROM (VALUES %s) AS v(feed_tag, env_system_cd, detail_type_cd, detail_desc, detail_data)
+                    JOIN LATERAL (
+                        SELECT fe.feed_id, fe.environment_id
+                        FROM feed.feed f
+                        JOIN feed.feed_environment fe ON fe.feed_id = f.feed_id
+                        WHERE f.feed_tag = v.feed_tag AND fe.env_system_cd = v.env_system_cd
+                        ORDER BY fe.environment_id
+                        LIMIT 1
+                    ) fe ON TRUE;
+                """, diff.details_to_insert, template="(%s, %s::INTEGER, %s, %s, %s)", page_size=PAGE_SIZE)
+
+            if diff.details_to_update:
+                execute_values(cur, """
+                    UPDATE feed.feed_details fd
+                    SET detail_data = v.detail_data
+                    FROM (VALUES %s) AS v(detail_id, detail_data)
+                    WHERE fd.detail_id = v.detail_id;
+                """, diff.details_to_update, template="(%s::INTEGER, %s)", page_size=PAGE_SIZE)
+
+            if diff.details_to_delete:
+                cur.execute("UPDATE feed.feed_details SET parent_detail_id = NULL WHERE parent_detail_id = ANY(%s);",
+                            (diff.details_to_delete,))
+                cur.execute("DELETE FROM feed.feed_details WHERE detail_id = ANY(%s);", (diff.details_to_delete,))
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def dump_manifest(conn):
+    """Render the current configuration as a YAML manifest"""
+    codes = load_system_codes(conn)
+    env_names = {code_id: cd for cd, code_id in codes.get('FEED_ENVIRONMENT', {}).items()}
+    status_names = {code_id: cd for cd, code_id in codes.get('FEED_STATUS', {}).items()}
+    state = load_current_state(conn)
+
+    feeds = {}
+    for tag, (name, feed_type, status_id, description, is_active) in sorted(state.feeds.items()):
+        feeds[tag] = {
+            'feed_tag': tag, 'feed_name': name, 'feed_type_cd': feed_type,
+            'feed_status_cd': status_names.get(status_id), 'feed_description': description,
+            'is_active': is_active, 'environments': [], 'details': [],
+        }
+    for tag, env in sorted(state.environments, key=lambda item: (item[0], item[1])):
+        feeds[tag]['environments'].append(env_names.get(env, env))
+    for (tag, env, detail_type, detail_desc), data in sorted(state.details.items(), key=lambda item: str(item[0])):
+        feeds[tag]['details'].append({
+            'environment_cd': env_names.get(env, env), 'detail_type_cd': detail_type,
+            'detail_desc': detail_desc, 'detail_data': data,
+        })
+    return yaml.safe_dump({'feeds': list(feeds.values())}, sort_keys=False, allow_unicode=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff and sync feed configuration")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Desired-state manifest (.yaml/.yml/.csv)")
+    source.add_argument("--promote", nargs=2, metavar=("FROM_ENV", "TO_ENV"),
+                        help="Make TO_ENV's environments/details match FROM_ENV (e.g. DEV TEST)")
+    source.add_argument("--dump", action="store_true", help="Print the current configuration as YAML")
+    parser.add_argument("--apply", action="store_true", help="Apply the diff (default: show it only)")
+    parser.add_argument("--prune", action="store_true", help="Deactivate/delete what is not in the desired state")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.dump:
+            sys.stdout.write(dump_manifest(conn))
+            return
+
+        current = load_current_state(conn)
+        if args.file:
+            with open(args.file, "rb") as f:
+                records = parse_manifest(f.read(), args.file)
+            desired = state_from_manifest(records, load_system_codes(conn))
+            diff = compute_diff(current, desired, prune=args.prune)
+        else:
+            env_codes = load_system_codes(conn).get('FEED_ENVIRONMENT', {})
+            source_cd, target_cd = (env.upper() for env in args.promote)
+            if source_cd not in env_codes or target_cd not in env_codes:
+                parser.error(f"Unknown environment; choose from {', '.join(env_codes)}")
+            desired = state_for_promotion(current, env_codes[source_cd], env_codes[target_cd])
+            diff = compute_diff(current, desired, prune=args.prune, env_scope={env_codes[target_cd]})
+
+        for name, count in diff.summary().items():
+            print(f"{name}: {count}")
+        if diff.is_empty:
+            print("✅ Already in sync")
+        elif args.apply:
+            apply_diff(diff, conn)
+            print("✅ Changes applied")
+        else:
+            print("ℹ️ Dry run - re-run with --apply to make these changes")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
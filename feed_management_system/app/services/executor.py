@@ -0,0 +1,226 @@
+"""
+Local feed executor
+
+Runs the AWS_CLI_COMMAND / PYTHON_CODE_SNIPPET entries in feed.feed_details for
+a feed's environment. Every command runs in its own OS process, so work spreads
+across all cores; threads are only used to pump the pipes. Output is appended
+to the run log (feed.feed_run_log) in chunks while the command is still
+running, with one feed_run_details row per command for its exit status.
+Progress (commands finished / total) is reported as a run heartbeat before
+each command and every HEARTBEAT_INTERVAL seconds while one runs. Each
+environment has its own concurrency cap (EXECUTOR_CONCURRENCY, same format as
+SCHEDULER_CONCURRENCY). All reads and writes go through the storage backend,
+so feeds also run against the embedded SQLite store (without heartbeats).
+A feed with no executable details fails, and so does a command whose output
+can no longer be written to the run log; that command is killed. Each
+command leads its own process group, and killing it (or reaping leftovers
+once it exits) signals the whole group, so processes it spawned cannot hold
+the pipes open.
+"""
+import argparse
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from app.core.storage import get_backend
+from app.services.feed_run_service import VALID_ENVIRONMENTS
+from app.services.heartbeat import HEARTBEAT_INTERVAL
+from app.services.scheduler import FeedScheduler, concurrency_limit
+
+EXECUTABLE_DETAIL_TYPES = ('AWS_CLI_COMMAND', 'PYTHON_CODE_SNIPPET')
+
+DEFAULT_TIMEOUT = 3600
+# Output is flushed to the run log once a buffer reaches this size ...
+DEFAULT_CHUNK_BYTES = 64 * 1024
+# ... or when it has been waiting this long
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+def load_feed_commands(feed_tag, environment):
+    """Return the executable feed_details rows for a feed/environment in detail_id order"""
+    return get_backend().feed_commands(feed_tag, environment, EXECUTABLE_DETAIL_TYPES)
+
+
+def build_command(detail_type_cd, detail_data):
+    """Turn a feed detail into an argv list"""
+    if detail_type_cd == 'PYTHON_CODE_SNIPPET':
+        return [sys.executable, '-c', detail_data or '']
+    if detail_type_cd == 'AWS_CLI_COMMAND':
+        return shlex.split(detail_data or '')
+    raise ValueError(f"Detail type {detail_type_cd} is not executable")
+
+
+class RunDetailWriter:
+    """Writes run details and buffers process output into the run log in chunks"""
+
+    def __init__(self, conn, feed_run_id, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, backend=None):
+        self.conn = conn
+        self.backend = backend or get_backend()
+        self.feed_run_id = feed_run_id
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+
+    def add_detail(self, detail_desc, detail_data, parent_detail_id=None):
+        """Insert one feed_run_details row and return its detail_id"""
+        with self._lock:
+            return self.backend.add_run_detail(self.feed_run_id, detail_desc, detail_data, parent_detail_id,
+                                               conn=self.conn)
+
+    def append_log(self, stream_name, text):
+        """Append one chunk to the run log"""
+        with self._lock:
+            self.backend.append_run_log(self.feed_run_id, [(stream_name, text)], conn=self.conn)
+
+    def heartbeat(self, progress_pct=None, message=None):
+        """Report progress; failures are logged and never stop the run"""
+        try:
+            with self._lock:
+                self.backend.record_heartbeat(self.feed_run_id, progress_pct=progress_pct, message=message,
+                                              conn=self.conn)
+        except Exception as e:
+            print(f"⚠️ Heartbeat for run {self.feed_run_id} failed: {e}")
+
+    def pump(self, pipe, stream_name):
+        """Read a pipe until EOF, flushing size- or time-bounded chunks"""
+        buffer, size = [], 0
+        last_flush = time.monotonic()
+        for line in iter(pipe.readline, ''):
+            buffer.append(line)
+            size += len(line)
+            if size >= self.chunk_bytes or time.monotonic() - last_flush >= self.flush_interval:
+                self.append_log(stream_name, ''.join(buffer))
+                buffer, size = [], 0
+                last_flush = time.monotonic()
+        if buffer:
+            self.append_log(stream_name, ''.join(buffer))
+        pipe.close()
+
+
+def kill_process_group(proc):
+    """SIGKILL every process in the command's group (it was started with start_new_session)"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class FeedExecutor:
+    """Executes feed commands for a run; usable as a FeedScheduler job"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.timeout = timeout
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, environment):
+        """Per-environment semaphore enforcing EXECUTOR_CONCURRENCY"""
+        with self._slots_lock:
+            if environment not in self._slots:
+                limit = concurrency_limit(environment, 'EXECUTOR_CONCURRENCY')
+                self._slots[environment] = threading.BoundedSemaphore(limit)
+            return self._slots[environment]
+
+    def _run_command(self, writer, detail_type_cd, detail_desc, detail_data):
+        """Run one command, streaming its output; returns True when it exits with 0"""
+        parent_id = writer.add_detail(f"{detail_type_cd}: {detail_desc}", detail_data or '')
+        writer.append_log('SYSTEM', f"=== {detail_type_cd}: {detail_desc} ===\n")
+        try:
+            proc = subprocess.Popen(
+                build_command(detail_type_cd, detail_data),
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, bufsize=1, start_new_session=True,
+            )
+        except (OSError, ValueError) as e:
+            writer.add_detail("Launch failed", str(e), parent_id)
+            return False
+
+        errors = []
+
+        def pump(pipe, stream_name):
+            try:
+                writer.pump(pipe, stream_name)
+            except Exception as e:
+                # Nobody drains the pipe any more, so stop the command instead of letting it block
+                errors.append(e)
+                kill_process_group(proc)
+
+        pumps = [
+            threading.Thread(target=pump, args=(proc.stdout, 'STDOUT'), daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, 'STDERR'), daemon=True),
+        ]
+        for thread in pumps:
+            thread.start()
+
+        # Wake up every HEARTBEAT_INTERVAL so quiet commands still look alive
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                return_code = proc.wait(timeout=max(0.0, min(HEARTBEAT_INTERVAL, deadline - time.monotonic())))
+                break
+            except subprocess.TimeoutExpired:
+                if time.monotonic() < deadline:
+                    writer.heartbeat()
+                    continue
+                kill_process_group(proc)
+                proc.wait()
+                for thread in pumps:
+                    thread.join()
+                writer.add_detail("Timed out", f"Killed after {self.timeout} seconds", parent_id)
+                return False
+
+        # Background processes the command left behind would keep the pipes open
+        kill_process_group(proc)
+        for thread in pumps:
+            thread.join()
+        if errors:
+            writer.add_detail("Log write failed", f"Killed after output could not be logged: {errors[0]}",
+                              parent_id)
+            return False
+        writer.add_detail("Exit code", str(return_code), parent_id)
+        return return_code == 0
+
+    def run_feed_run(self, feed_run_id, feed_tag, environment):
+        """Run every executable detail of a feed in order; fails without commands or at the first failure"""
+        commands = load_feed_commands(feed_tag, environment)
+        backend = get_backend()
+        with self._slot(environment.lower()), backend.session() as conn:
+            writer = RunDetailWriter(conn, feed_run_id, self.chunk_bytes, self.flush_interval, backend)
+            if not commands:
+                writer.add_detail("No commands", f"No executable feed details for {feed_tag} in {environment}")
+                return False
+            for done, (_, detail_type_cd, detail_desc, detail_data) in enumerate(commands):
+                writer.heartbeat(done * 100.0 / len(commands), f"{done + 1}/{len(commands)}: {detail_desc}")
+                if not self._run_command(writer, detail_type_cd, detail_desc, detail_data):
+                    return False
+            writer.heartbeat(100.0, f"{len(commands)}/{len(commands)} commands finished")
+            return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Execute feeds locally in dependency order")
+    parser.add_argument("--environment", required=True, choices=VALID_ENVIRONMENTS)
+    parser.add_argument("--tags", nargs="*", help="Only run these feed tags (default: all active feeds)")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Per-command timeout in seconds")
+    args = parser.parse_args()
+
+    executor = FeedExecutor(timeout=args.timeout)
+    scheduler = FeedScheduler(
+        args.environment,
+        max_concurrency=concurrency_limit(args.environment, 'EXECUTOR_CONCURRENCY'),
+        job=executor.run_feed_run,
+    )
+    for feed_tag, status in scheduler.run(feed_tags=args.tags).items():
+        print(f"{feed_tag}: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Run history export to partitioned Parquet files
+
+Rows are read from feed.feed_run / feed.feed_run_details through a server-side
+(named) cursor and written chunk by chunk, so memory use stays bounded by the
+chunk size no matter how large the tables are. Each table keeps a high-water
+mark in <output_dir>/_watermarks.json, which makes repeated exports incremental.
+Exports into the same directory (the CLI and POST /analytics/refresh) take
+turns on a file lock. A --full export is written to a staging directory that
+replaces the table's directory once it is complete, so no row is kept twice.
+
+Layout:
+    <output_dir>/<table>/environment=<ENV>/month=<YYYY-MM>/part-<stamp>-<export id>-<chunk>.parquet
+
+The random export id keeps two exports started in the same second (e.g. a
+--full re-export next to a scheduled one) from overwriting each other's files.
+"""
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.database import get_connection, stream_query
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+EXPORT_DIR = PROJECT_ROOT / "data" / "exports"
+WATERMARK_FILE = "_watermarks.json"
+LOCK_FILE = "_export.lock"
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Rows younger than this are left for the next export so that transactions
+# still in flight cannot commit "behind" the high-water mark.
+DEFAULT_SETTLE_SECONDS = 60
+
+EPOCH = datetime(1970, 1, 1)
+
+EXPORT_TABLES = {
+    "feed_run": {
+        "query": """
+            SELECT fr.feed_run_id, fr.feed_id, f.feed_tag, fr.environment_id,
+                   sc.common_cd AS environment_cd, fr.start_dt, fr.end_dt,
+                   fr.status_cd, fr.description, fr.created_at, fr.updated_at
+            FROM feed.feed_run fr
+            JOIN feed.feed f ON fr.feed_id = f.feed_id
+            JOIN feed.feed_environment fe ON fr.environment_id = fe.environment_id
+            JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+            WHERE fr.status_cd NOT IN ('PENDING', 'RUNNING')
+              AND (fr.updated_at, fr.feed_run_id) > (%(mark_ts)s, %(mark_id)s)
+              AND fr.updated_at < LOCALTIMESTAMP - make_interval(secs => %(settle_seconds)s)
+            ORDER BY fr.updated_at, fr.feed_run_id
+        """,
+        "schema": pa.schema([
+            ("feed_run_id", pa.int64()),
+            ("feed_id", pa.int64()),
+            ("feed_tag", pa.string()),
+            ("environment_id", pa.int64()),
+            ("environment_cd", pa.string()),
+            ("start_dt", pa.timestamp("us")),
+            ("end_dt", pa.timestamp("us")),
+            ("status_cd", pa.string()),
+            ("description", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+        ]),
+        "watermark": ("updated_at", "feed_run_id"),
+        "partition_ts": "start_dt",
+    },
+    "feed_run_details": {
+        "query": """
+            SELECT frd.detail_id, frd.parent_detail_id, frd.feed_run_id,
+                   fr.feed_id, sc.common_cd AS environment_cd,
+                   frd.detail_desc, frd.detail_data, frd.created_at
+            FROM feed.feed_run_details frd
+            JOIN feed.feed_run fr ON frd.feed_run_id = fr.feed_run_id
+            JOIN feed.feed_environment fe ON fr.environment_id = fe.environment_id
+            JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+            WHERE (frd.created_at, frd.detail_id) > (%(mark_ts)s, %(mark_id)s)
+              AND frd.created_at < LOCALTIMESTAMP - make_interval(secs => %(settle_seconds)s)
+            ORDER BY frd.created_at, frd.detail_id
+        """,
+        "schema": pa.schema([
+            ("detail_id", pa.int64()),
+            ("parent_detail_id", pa.int64()),
+            ("feed_run_id", pa.int64()),
+            ("feed_id", pa.int64()),
+            ("environment_cd", pa.string()),
+            ("detail_desc", pa.string()),
+            ("detail_data", pa.string()),
+            ("created_at", pa.timestamp("us")),
+        ]),
+        "watermark": ("created_at", "detail_id"),
+        "partition_ts": "created_at",
+    },
+}
+
+
+def load_watermarks(output_dir=EXPORT_DIR):
+    """Read the per-table high-water marks, or {} when nothing was exported yet"""
+    path = Path(output_dir) / WATERMARK_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_watermarks(watermarks, output_dir=EXPORT_DIR):
+    """Atomically persist the per-table high-water marks"""
+    with tempfile.NamedTemporaryFile("w", dir=output_dir, prefix=".watermarks-", suffix=".tmp",
+                                     delete=False) as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(f.name, Path(output_dir) / WATERMARK_FILE)
+
+
+@contextmanager
+def export_lock(output_dir=EXPORT_DIR):
+    """Hold an exclusive lock on an export directory; concurrent exports wait for it"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / LOCK_FILE, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _replace_dir(staging_dir, target_dir):
+    """Swap a finished staging directory in for target_dir"""
+    if target_dir.exists():
+        retired = target_dir.with_name(f".{target_dir.name}.old-{uuid.uuid4().hex[:12]}")
+        os.rename(target_dir, retired)
+        os.rename(staging_dir, target_dir)
+        shutil.rmtree(retired)
+    else:
+        os.rename(staging_dir, target_dir)
+
+
+def _partition_rows(rows, columns, spec):
+    """Group a chunk of rows by (environment, month) partition"""
+    env_idx = columns.index("environment_cd")
+    ts_idx = columns.index(spec["partition_ts"])
+    partitions = defaultdict(list)
+    for row in rows:
+        ts = row[ts_idx]
+        month = ts.strftime("%Y-%m") if ts else "unknown"
+        partitions[(row[env_idx] or "UNKNOWN", month)].append(row)
+    return partitions
+
+
+def _write_partition(rows, schema, table_dir, environment, month, file_name):
+    """Write one partition of a chunk as a single Parquet file"""
+    arrays = [
+        pa.array(values, type=field.type)
+        for values, field in zip(zip(*rows), schema)
+    ]
+    part_dir = table_dir / f"environment={environment}" / f"month={month}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.Table.from_arrays(arrays, schema=schema), part_dir / file_name)
+
+
+def export_table(table, output_dir=EXPORT_DIR, chunk_size=DEFAULT_CHUNK_SIZE,
+                 full=False, settle_seconds=DEFAULT_SETTLE_SECONDS):
+    """Export new rows of one table since its high-water mark; returns the row count
+
+    With full=True every row is exported again and replaces the table's files.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table '{table}'. Choose from: {', '.join(EXPORT_TABLES)}")
+
+    spec = EXPORT_TABLES[table]
+    output_dir = Path(output_dir)
+    table_dir = output_dir / table
+
+    with export_lock(output_dir):
+        watermarks = load_watermarks(output_dir)
+        mark = {} if full else watermarks.get(table, {})
+        params = {
+            "mark_ts": datetime.fromisoformat(mark["ts"]) if mark.get("ts") else EPOCH,
+            "mark_id": mark.get("id", 0),
+            # The cutoff is taken from the database clock the timestamps were written with
+            "settle_seconds": settle_seconds,
+        }
+
+        if full:
+            write_dir = Path(tempfile.mkdtemp(dir=output_dir, prefix=f".{table}.full-"))
+            watermarks.pop(table, None)
+        else:
+            write_dir = table_dir
+            write_dir.mkdir(parents=True, exist_ok=True)
+
+        file_prefix = f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:12]}"
+        ts_col, id_col = spec["watermark"]
+        exported = 0
+
+        conn = get_connection()
+        try:
+            conn.set_session(readonly=True)
+            batches = stream_query(spec["query"], params, batch_size=chunk_size, conn=conn)
+            for chunk_no, batch in enumerate(batches):
+                columns = batch.columns
+
+                for (environment, month), part_rows in _partition_rows(batch.rows, columns, spec).items():
+                    _write_partition(part_rows, spec["schema"], write_dir, environment, month,
+                                     f"{file_prefix}-{chunk_no:05d}.parquet")
+
+                # Rows arrive in watermark order, so the last row is the new mark
+                last = batch.rows[-1]
+                watermarks[table] = {
+                    "ts": last[columns.index(ts_col)].isoformat(),
+                    "id": last[columns.index(id_col)],
+                }
+                if not full:
+                    save_watermarks(watermarks, output_dir)
+
+                exported += len(batch)
+
+            if full:
+                _replace_dir(write_dir, table_dir)
+                save_watermarks(watermarks, output_dir)
+        finally:
+            conn.close()
+            if full and write_dir.exists():
+                shutil.rmtree(write_dir)
+
+    return exported
+
+
+def export_all(output_dir=EXPORT_DIR, chunk_size=DEFAULT_CHUNK_SIZE, full=False):
+    """Export every table in EXPORT_TABLES; returns {table: row_count}"""
+    return {
+        table: export_table(table, output_dir=output_dir, chunk_size=chunk_size, full=full)
+        for table in EXPORT_TABLES
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export feed run history to partitioned Parquet")
+    parser.add_argument("--table", choices=list(EXPORT_TABLES), help="Export a single table (default: all)")
+    parser.add_argument("--output-dir", default=str(EXPORT_DIR), help="Target directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows fetched per round trip")
+    parser.add_argument("--full", action="store_true", help="Ignore the high-water mark and export everything")
+    args = parser.parse_args()
+
+    tables = [args.table] if args.table else list(EXPORT_TABLES)
+    for table in tables:
+        count = export_table(table, output_dir=args.output_dir, chunk_size=args.chunk_size, full=args.full)
+        print(f"✅ Exported {count} rows from feed.{table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Feed run operations, routed to the configured storage backend
+
+On PostgreSQL these call the start_feed_run / complete_feed_run stored
+functions; on the embedded SQLite backend the same logic runs in Python.
+A `conn` (e.g. a pooled API connection) is used as-is and not committed.
+"""
+from app.core.storage import FINISHED_STATUSES, RUN_RESULT_STATUSES, VALID_ENVIRONMENTS, get_backend
+
+
+def start_feed_run(environment, feed_tag, conn=None):
+    """Start a run (creating the feed/environment if needed) and return the new feed_run_id"""
+    return get_backend().start_feed_run(environment.lower(), feed_tag, conn=conn)
+
+
+def complete_feed_run(feed_run_id, status, conn=None):
+    """Finish a run with 'success' or 'failure'"""
+    return get_backend().complete_feed_run(feed_run_id, status, conn=conn)
+
+
+def get_run_statuses(feed_run_ids, conn=None):
+    """Return {feed_run_id: status_cd} for the given runs"""
+    return get_backend().get_run_statuses(feed_run_ids, conn=conn)
@@ -0,0 +1,87 @@
+"""
+Read queries behind the feed and run list endpoints
+"""
+from app.core.database import get_connection
+
+# Tables each read depends on; the API derives its ETags from their change counters
+FEED_TABLES = ('feed.feed', 'feed.feed_environment', 'admin.system_codes')
+RUN_TABLES = ('feed.feed_run', 'feed.feed', 'feed.feed_environment', 'admin.system_codes')
+
+FEEDS_QUERY = """
+    SELECT f.feed_id, f.feed_tag, f.feed_name, f.feed_description, f.feed_type_cd,
+           status.common_cd AS feed_status, f.is_active,
+           COALESCE(array_agg(lower(env.common_cd) ORDER BY env.common_cd)
+                    FILTER (WHERE env.common_cd IS NOT NULL), '{}') AS environments,
+           f.created_at, f.updated_at
+    FROM feed.feed f
+    LEFT JOIN admin.system_codes status ON f.feed_status_id = status.code_id
+    LEFT JOIN feed.feed_environment fe ON fe.feed_id = f.feed_id
+    LEFT JOIN admin.system_codes env ON fe.env_system_cd = env.code_id
+    WHERE (%(active_only)s = false OR f.is_active)
+      AND (%(feed_tag)s::VARCHAR IS NULL OR f.feed_tag = %(feed_tag)s)
+    GROUP BY f.feed_id, status.common_cd
+    ORDER BY f.feed_tag
+    LIMIT %(limit)s OFFSET %(offset)s;
+"""
+
+RUNS_QUERY = """
+    SELECT fr.feed_run_id, f.feed_tag, lower(sc.common_cd) AS environment, fr.status_cd,
+           fr.start_dt, fr.end_dt,
+           EXTRACT(EPOCH FROM (fr.end_dt - fr.start_dt)) AS duration_seconds,
+           fr.description
+    FROM feed.feed_run fr
+    JOIN feed.feed f ON fr.feed_id = f.feed_id
+    JOIN feed.feed_environment fe ON fr.environment_id = fe.environment_id
+    JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+    WHERE (%(feed_tag)s::VARCHAR IS NULL OR f.feed_tag = %(feed_tag)s)
+      AND (%(environment)s::VARCHAR IS NULL OR lower(sc.common_cd) = lower(%(environment)s))
+      AND (%(status)s::VARCHAR IS NULL OR fr.status_cd = upper(%(status)s))
+    ORDER BY fr.start_dt DESC, fr.feed_run_id DESC
+    LIMIT %(limit)s OFFSET %(offset)s;
+"""
+
+ENVIRONMENTS_QUERY = """
+    SELECT code_id, lower(common_cd) AS environment, code_description
+    FROM admin.system_codes
+    WHERE code_type_cd = 'FEED_ENVIRONMENT' AND is_active = true
+    ORDER BY sort_order;
+"""
+
+
+def _fetch_dicts(query, params, conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            columns = [desc[0] for desc in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def list_feeds(active_only=False, limit=100, offset=0, conn=None):
+    """Feeds ordered by tag, with their status and environments"""
+    params = {'active_only': active_only, 'feed_tag': None, 'limit': limit, 'offset': offset}
+    return _fetch_dicts(FEEDS_QUERY, params, conn)
+
+
+def get_feed(feed_tag, conn=None):
+    """One feed by tag as a dict, or None"""
+    params = {'active_only': False, 'feed_tag': feed_tag, 'limit': 1, 'offset': 0}
+    rows = _fetch_dicts(FEEDS_QUERY, params, conn)
+    return rows[0] if rows else None
+
+
+def list_runs(feed_tag=None, environment=None, status=None, limit=100, offset=0, conn=None):
+    """Runs newest first, optionally filtered by feed, environment and status"""
+    params = {'feed_tag': feed_tag, 'environment': environment, 'status': status,
+              'limit': limit, 'offset': offset}
+    return _fetch_dicts(RUNS_QUERY, params, conn)
+
+
+def environment_codes(conn=None):
+    """Active FEED_ENVIRONMENT codes (code_id, environment, code_description)"""
+    return _fetch_dicts(ENVIRONMENTS_QUERY, None, conn)
@@ -0,0 +1,159 @@
+"""
+Fleet view: dashboard KPIs from several feed databases at once
+
+Targets are read from a JSON file (DB_TARGETS_FILE, default db_targets.json):
+
+    {"targets": [
+        {"name": "local", "host": "localhost", "database": "feed_management"},
+        {"name": "rds-pipeline", "host": "...rds.amazonaws.com", "user": "postgres",
+         "password_env": "RDS_PIPELINE_PASSWORD"}
+    ]}
+
+Missing keys fall back to DB_CONFIG; "password_env" names an environment
+variable so passwords stay out of the file. Without a targets file the fleet
+is just the DB_CONFIG database.
+
+Each target is queried on its own thread with a connect timeout and a
+server-side statement_timeout. Targets that have not answered by the deadline
+are reported as timed out while the others are returned, so one slow
+database never blanks the whole view.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.core.database import DB_CONFIG, get_connection
+
+DB_TARGETS_FILE = os.getenv('DB_TARGETS_FILE', 'db_targets.json')
+DEFAULT_TIMEOUT = float(os.getenv('FLEET_TIMEOUT', '5'))
+
+# All dashboard KPIs in one round trip
+KPI_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM feed.feed WHERE is_active = true) AS active_feeds,
+        (SELECT COUNT(*) FROM feed.feed_run
+          WHERE start_dt >= CURRENT_DATE) AS runs_today,
+        (SELECT COUNT(*) FROM feed.feed_run
+          WHERE start_dt >= CURRENT_DATE AND status_cd = 'FAILED') AS failed_today,
+        (SELECT COUNT(*) FROM feed.feed_run
+          WHERE status_cd = 'RUNNING') AS running_now,
+        (SELECT COALESCE(ROUND(
+                    COUNT(*) FILTER (WHERE status_cd = 'COMPLETED') * 100.0 / NULLIF(COUNT(*), 0), 1
+                ), 0)
+           FROM feed.feed_run
+          WHERE start_dt >= CURRENT_DATE - INTERVAL '30 days') AS success_rate_30d,
+        (SELECT COUNT(*) FROM admin.system_codes WHERE is_active = true) AS active_system_codes
+"""
+KPI_TABLES = ('feed.feed', 'feed.feed_run', 'admin.system_codes')
+KPI_COLUMNS = ('active_feeds', 'runs_today', 'failed_today', 'running_now',
+               'success_rate_30d', 'active_system_codes')
+
+_CONNECTION_KEYS = ('host', 'port', 'database', 'user', 'password')
+
+
+def load_targets(path=None):
+    """Return [(name, connection config)] from the targets file or DB_CONFIG"""
+    path = path or DB_TARGETS_FILE
+    if not os.path.exists(path):
+        return [('default', dict(DB_CONFIG))]
+
+    with open(path, 'r') as f:
+        data = json.load(f)
+    entries = data.get('targets', []) if isinstance(data, dict) else data
+
+    targets = []
+    for index, entry in enumerate(entries):
+        config = {key: entry.get(key, DB_CONFIG[key]) for key in _CONNECTION_KEYS}
+        if entry.get('password_env'):
+            config['password'] = os.getenv(entry['password_env'], '')
+        targets.append((entry.get('name') or f"target-{index + 1}", config))
+    if not targets:
+        raise ValueError(f"No targets defined in {path}")
+    return targets
+
+
+def fetch_kpis(conn):
+    """Dashboard KPIs for one database as a dict"""
+    with conn.cursor() as cur:
+        cur.execute(KPI_QUERY)
+        return dict(zip(KPI_COLUMNS, cur.fetchone()))
+
+
+def _query_target(config, timeout):
+    started = time.monotonic()
+    conn = get_connection(
+        **config,
+        connect_timeout=max(1, int(timeout)),
+        options=f"-c statement_timeout={int(timeout * 1000)}",
+    )
+    try:
+        conn.set_session(readonly=True, autocommit=True)
+        return fetch_kpis(conn), round((time.monotonic() - started) * 1000)
+    finally:
+        conn.close()
+
+
+def fleet_kpis(targets=None, timeout=DEFAULT_TIMEOUT):
+    """Query every target concurrently; returns one result dict per target
+
+    Results keep the target order and carry status "ok", "error" or
+    "timeout" plus the elapsed time, so callers can show partial results.
+    """
+    targets = targets if targets is not None else load_targets()
+    if not targets:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix='fleet')
+    futures = {executor.submit(_query_target, config, timeout): name for name, config in targets}
+    done, _ = wait(futures, timeout=timeout)
+    # Stragglers finish (or hit statement_timeout) in the background
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for future, name in futures.items():
+        result = {'target': name, 'status': 'ok', 'error': None, 'elapsed_ms': None}
+        result.update(dict.fromkeys(KPI_COLUMNS))
+        if future not in done:
+            result['status'] = 'timeout'
+            result['error'] = f"no answer within {timeout:g}s"
+            result['elapsed_ms'] = round(timeout * 1000)
+        elif future.exception() is not None:
+            result['status'] = 'error'
+            result['error'] = str(future.exception()).strip()
+        else:
+            kpis, result['elapsed_ms'] = future.result()
+            result.update(kpis)
+        results.append(result)
+    return results
+
+
+def fleet_totals(results):
+    """Sum the counters across the targets that answered"""
+    ok = [r for r in results if r['status'] == 'ok']
+    totals = {key: sum(r[key] or 0 for r in ok)
+              for key in KPI_COLUMNS if key != 'success_rate_30d'}
+    totals['targets_ok'] = len(ok)
+    totals['targets_total'] = len(results)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard KPIs across all configured databases")
+    parser.add_argument("--targets", help=f"Targets JSON file (default {DB_TARGETS_FILE})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Per-target timeout in seconds")
+    args = parser.parse_args()
+
+    results = fleet_kpis(load_targets(args.targets), timeout=args.timeout)
+    for result in results:
+        if result['status'] == 'ok':
+            kpis = ", ".join(f"{key}={result[key]}" for key in KPI_COLUMNS)
+            print(f"✅ {result['target']}: {kpis}")
+        else:
+            print(f"❌ {result['target']}: {result['status']} ({result['error']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Run heartbeats: live progress and liveness for long-running feed runs
+
+Executors report progress (percentage, record counts, a short message) to
+feed.feed_run_heartbeat, one row per active run that is overwritten in place.
+The table is UNLOGGED with only its primary key indexed, so a heartbeat is a
+cheap HOT update that writes no WAL. complete_feed_run removes the row.
+
+A RUNNING run whose last heartbeat (or, before the first one, its start) is
+older than the stale threshold is considered stuck:
+
+    python -m app.services.heartbeat                 # list stuck runs
+    python -m app.services.heartbeat --fail          # ... and finish them as failures
+
+Heartbeats are PostgreSQL only; the embedded SQLite backend does not track them.
+"""
+import argparse
+import os
+
+from app.core.database import get_connection
+from app.services.feed_run_service import complete_feed_run
+from app.services.run_log import RunNotFound
+
+# Seconds between executor heartbeats while a command is running
+HEARTBEAT_INTERVAL = float(os.getenv('HEARTBEAT_INTERVAL', '30'))
+# A run with no heartbeat for this long is reported as stuck
+STALE_AFTER_MINUTES = int(os.getenv('HEARTBEAT_STALE_MINUTES', '10'))
+
+
+class RunNotActive(ValueError):
+    """Raised when a heartbeat arrives for a run that has already finished"""
+
+
+HEARTBEAT_UPSERT = """
+    INSERT INTO feed.feed_run_heartbeat AS h
+        (feed_run_id, progress_pct, records_processed, records_total, message)
+    SELECT fr.feed_run_id, %(progress_pct)s, %(records_processed)s, %(records_total)s, %(message)s
+    FROM feed.feed_run fr
+    WHERE fr.feed_run_id = %(feed_run_id)s AND fr.end_dt IS NULL
+    ON CONFLICT (feed_run_id) DO UPDATE SET
+        progress_pct = COALESCE(EXCLUDED.progress_pct, h.progress_pct),
+        records_processed = COALESCE(EXCLUDED.records_processed, h.records_processed),
+        records_total = COALESCE(EXCLUDED.records_total, h.records_total),
+        message = COALESCE(EXCLUDED.message, h.message),
+        heartbeat_at = CURRENT_TIMESTAMP
+    RETURNING h.progress_pct, h.heartbeat_at;
+"""
+
+ACTIVE_RUNS_QUERY = """
+    SELECT fr.feed_run_id, f.feed_tag, f.feed_name, lower(sc.common_cd) AS environment,
+           fr.start_dt, h.progress_pct, h.records_processed, h.records_total, h.message,
+           COALESCE(h.heartbeat_at, fr.start_dt) AS last_seen,
+           COALESCE(h.heartbeat_at, fr.start_dt)
+               < CURRENT_TIMESTAMP - make_interval(mins => %(stale_after)s) AS is_stale
+    FROM feed.feed_run fr
+    JOIN feed.feed f ON fr.feed_id = f.feed_id
+    JOIN feed.feed_environment fe ON fr.environment_id = fe.environment_id
+    JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+    LEFT JOIN feed.feed_run_heartbeat h ON h.feed_run_id = fr.feed_run_id
+    WHERE fr.status_cd = 'RUNNING' AND fr.end_dt IS NULL
+    ORDER BY fr.start_dt, fr.feed_run_id;
+"""
+
+
+def record_heartbeat(feed_run_id, progress_pct=None, records_processed=None, records_total=None,
+                     message=None, conn=None):
+    """Store the latest progress for an active run; returns (progress_pct, heartbeat_at)
+
+    Fields left as None keep their previous value. Without progress_pct it
+    is derived from the record counts when both are known. A caller-supplied
+    connection is not committed.
+    """
+    if progress_pct is None and records_processed is not None and records_total:
+        progress_pct = min(100.0, records_processed * 100.0 / records_total)
+    if progress_pct is not None and not 0 <= progress_pct <= 100:
+        raise ValueError("progress_pct must be between 0 and 100")
+    params = {
+        'feed_run_id': feed_run_id,
+        'progress_pct': round(progress_pct, 2) if progress_pct is not None else None,
+        'records_processed': records_processed,
+        'records_total': records_total,
+        'message': message[:200] if message else message,
+    }
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(HEARTBEAT_UPSERT, params)
+            row = cur.fetchone()
+            if row is None:
+                cur.execute("SELECT 1 FROM feed.feed_run WHERE feed_run_id = %s;", (feed_run_id,))
+                if cur.fetchone() is None:
+                    raise RunNotFound(f"Feed run {feed_run_id} not found")
+                raise RunNotActive(f"Feed run {feed_run_id} has already finished")
+        if own_conn:
+            conn.commit()
+        return row
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def active_runs(stale_after=STALE_AFTER_MINUTES, conn=None):
+    """RUNNING runs with their latest progress and an is_stale flag, oldest first"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(ACTIVE_RUNS_QUERY, {'stale_after': stale_after})
+            columns = [desc[0] for desc in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def stuck_runs(stale_after=STALE_AFTER_MINUTES, conn=None):
+    """RUNNING runs that have not sent a heartbeat for stale_after minutes"""
+    return [run for run in active_runs(stale_after, conn) if run['is_stale']]
+
+
+def _known(value):
+    """False for NULL, which pandas turns into None or NaN depending on the column"""
+    return value is not None and value == value
+
+
+def describe_progress(run):
+    """(progress_pct, label) for one active run row; any of the progress fields may be NULL"""
+    progress = float(run.progress_pct) if _known(run.progress_pct) else 0.0
+    label = f"{'⚠️ ' if run.is_stale else ''}{run.feed_name} ({run.environment}) · {progress:.0f}%"
+    if _known(run.records_total):
+        processed = int(run.records_processed) if _known(run.records_processed) else 0
+        label += f" · {processed:,}/{int(run.records_total):,} records"
+    if _known(run.message) and run.message:
+        label += f" · {run.message}"
+    return progress, label
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report feed runs that stopped sending heartbeats")
+    parser.add_argument("--stale-after", type=int, default=STALE_AFTER_MINUTES,
+                        help="Minutes without a heartbeat before a run counts as stuck")
+    parser.add_argument("--fail", action="store_true", help="Complete stuck runs with status failure")
+    args = parser.parse_args()
+
+    stuck = stuck_runs(args.stale_after)
+    if not stuck:
+        print(f"✅ No runs without a heartbeat for {args.stale_after} minute(s)")
+        return
+    for run in stuck:
+        progress = f"{run['progress_pct']}%" if run['progress_pct'] is not None else "no progress"
+        print(f"⚠️ Run {run['feed_run_id']} {run['feed_tag']} ({run['environment']}): "
+              f"last seen {run['last_seen']:%Y-%m-%d %H:%M:%S}, {progress}")
+        if args.fail:
+            try:
+                if complete_feed_run(run['feed_run_id'], 'failure'):
+                    print(f"✅ Run {run['feed_run_id']} marked as failed")
+                else:
+                    print(f"⚠️ Run {run['feed_run_id']} finished before it could be failed; left unchanged")
+            except Exception as e:
+                print(f"❌ Could not fail run {run['feed_run_id']}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Repository layer over the ORM models
+
+Every method that returns object graphs states its loader strategy up front so
+a page's data load is a fixed number of queries regardless of row count:
+many-to-one references use joinedload (one JOIN in the same SELECT) and
+one-to-many collections use selectinload (one extra SELECT ... IN per
+collection). Batch writes go through insert() with a list of parameter dicts,
+which SQLAlchemy sends as a single executemany.
+"""
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import (
+    CodeType,
+    Feed,
+    FeedDetail,
+    FeedEnvironment,
+    FeedRun,
+    FeedRunDetail,
+    SystemCode,
+)
+
+
+class Repository:
+    """Base repository bound to an open session"""
+
+    def __init__(self, session):
+        self.session = session
+
+
+class SystemCodeRepository(Repository):
+    """Code types and system codes (System Codes page)"""
+
+    def list_code_types(self):
+        """Code types with their codes: 2 queries"""
+        stmt = (
+            select(CodeType)
+            .options(selectinload(CodeType.codes))
+            .order_by(CodeType.code_type_cd)
+        )
+        return self.session.scalars(stmt).all()
+
+    def list_codes(self, code_type_cd=None, active_only=False):
+        """System codes with their code type joined in: 1 query"""
+        stmt = select(SystemCode).options(joinedload(SystemCode.code_type))
+        if code_type_cd:
+            stmt = stmt.where(SystemCode.code_type_cd == code_type_cd)
+        if active_only:
+            stmt = stmt.where(SystemCode.is_active.is_(True))
+        stmt = stmt.order_by(SystemCode.code_type_cd, SystemCode.sort_order, SystemCode.common_cd)
+        return self.session.scalars(stmt).all()
+
+    def add_codes(self, rows):
+        """Insert many system codes in one executemany"""
+        if rows:
+            self.session.execute(insert(SystemCode), list(rows))
+        return len(rows)
+
+
+class FeedRepository(Repository):
+    """Feeds, environments and feed details (Feed Management page)"""
+
+    def list_feeds(self):
+        """Feeds with type, status and environments: 2 queries"""
+        stmt = (
+            select(Feed)
+            .options(
+                joinedload(Feed.feed_type),
+                joinedload(Feed.status),
+                selectinload(Feed.environments).joinedload(FeedEnvironment.env_code),
+            )
+            .order_by(Feed.feed_name)
+        )
+        return self.session.scalars(stmt).unique().all()
+
+    def list_feeds_with_run_counts(self):
+        """(feed, run_count) pairs: 2 queries, counts aggregated in SQL"""
+        run_counts = (
+            select(FeedRun.feed_id, func.count().label("run_count"))
+            .group_by(FeedRun.feed_id)
+            .subquery()
+        )
+        stmt = (
+            select(Feed, func.coalesce(run_counts.c.run_count, 0))
+            .outerjoin(run_counts, run_counts.c.feed_id == Feed.feed_id)
+            .options(
+                joinedload(Feed.feed_type),
+                selectinload(Feed.environments).joinedload(FeedEnvironment.env_code),
+            )
+            .order_by(Feed.feed_name)
+        )
+        return self.session.execute(stmt).unique().all()
+
+    def get_by_tag(self, feed_tag):
+        """Single feed by tag with its environments: 2 queries"""
+        stmt = (
+            select(Feed)
+            .where(Feed.feed_tag == feed_tag)
+            .options(selectinload(Feed.environments).joinedload(FeedEnvironment.env_code))
+        )
+        return self.session.scalars(stmt).first()
+
+    def get_with_details(self, feed_id):
+        """Feed with environments and details (Environments & Details tab): 3 queries"""
+        stmt = (
+            select(Feed)
+            .where(Feed.feed_id == feed_id)
+            .options(
+                joinedload(Feed.feed_type),
+                selectinload(Feed.environments).joinedload(FeedEnvironment.env_code),
+                selectinload(Feed.details).options(
+                    joinedload(FeedDetail.detail_type),
+                    joinedload(FeedDetail.environment).joinedload(FeedEnvironment.env_code),
+                ),
+            )
+        )
+        return self.session.scalars(stmt).unique().first()
+
+    def add_environments(self, rows):
+        """Insert many feed environments in one executemany"""
+        if rows:
+            self.session.execute(insert(FeedEnvironment), list(rows))
+        return len(rows)
+
+    def add_details(self, rows):
+        """Insert many feed details in one executemany"""
+        if rows:
+            self.session.execute(insert(FeedDetail), list(rows))
+        return len(rows)
+
+
+class FeedRunRepository(Repository):
+    """Feed runs and run details (Dashboard page)"""
+
+    def recent_runs(self, limit=10):
+        """Latest runs with feed, environment and status: 1 query"""
+        stmt = (
+            select(FeedRun)
+            .options(
+                joinedload(FeedRun.feed),
+                joinedload(FeedRun.status),
+                joinedload(FeedRun.environment).joinedload(FeedEnvironment.env_code),
+            )
+            .order_by(FeedRun.start_dt.desc())
+            .limit(limit)
+        )
+        return self.session.scalars(stmt).all()
+
+    def runs_for_feed(self, feed_id, limit=50):
+        """A feed's latest runs with their details: 2 queries"""
+        stmt = (
+            select(FeedRun)
+            .where(FeedRun.feed_id == feed_id)
+            .options(
+                joinedload(FeedRun.environment).joinedload(FeedEnvironment.env_code),
+                selectinload(FeedRun.details),
+            )
+            .order_by(FeedRun.start_dt.desc())
+            .limit(limit)
+        )
+        return self.session.scalars(stmt).all()
+
+    def add_run_details(self, feed_run_id, rows):
+        """Insert many run details for one run in one executemany"""
+        params = [{**row, "feed_run_id": feed_run_id} for row in rows]
+        if params:
+            self.session.execute(insert(FeedRunDetail), params)
+        return len(params)
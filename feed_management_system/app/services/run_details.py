@@ -0,0 +1,109 @@
+"""
+Keyset-paged streaming of feed_run_details
+
+Pages are ordered by (created_at, detail_id), which both the global
+idx_feed_run_details_created_at and the per-run
+idx_feed_run_details_run_created indexes serve. A page continues from an
+opaque cursor holding the last key the client saw, so page N costs the same
+as page 1, and rows are pulled from a server-side cursor one batch at a time
+so memory stays flat however large the page is. The API streams on a
+connection borrowed from the shared pool (pooled_run_details).
+"""
+import base64
+import json
+from contextlib import closing
+from datetime import datetime
+
+from app.core.database import RowBatch, pooled_connection, stream_query
+
+DEFAULT_PAGE_ROWS = 100_000
+MAX_PAGE_ROWS = 1_000_000
+# Rows per server round trip and per chunk written to the client
+STREAM_BATCH_SIZE = 2_000
+
+DETAILS_QUERY = """
+    SELECT d.detail_id, d.parent_detail_id, d.feed_run_id, d.detail_desc, d.detail_data, d.created_at
+    FROM feed.feed_run_details d
+    WHERE (%(feed_run_id)s::INTEGER IS NULL OR d.feed_run_id = %(feed_run_id)s)
+      AND (%(after_created)s::TIMESTAMP IS NULL
+           OR (d.created_at, d.detail_id) > (%(after_created)s::TIMESTAMP, %(after_id)s))
+    ORDER BY d.created_at, d.detail_id
+    LIMIT %(limit)s;
+"""
+
+
+def arrow_schema():
+    """Arrow schema matching DETAILS_QUERY"""
+    import pyarrow as pa
+
+    return pa.schema([
+        ("detail_id", pa.int64()),
+        ("parent_detail_id", pa.int64()),
+        ("feed_run_id", pa.int64()),
+        ("detail_desc", pa.string()),
+        ("detail_data", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def encode_cursor(created_at, detail_id):
+    """Opaque continuation token for the row after (created_at, detail_id)"""
+    payload = json.dumps([created_at.isoformat(), detail_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """(created_at, detail_id) from a token; raises ValueError if it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, detail_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(detail_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def batch_cursor(batch):
+    """Token that continues after the last row of a batch"""
+    last = batch.rows[-1]
+    return encode_cursor(last[batch.columns.index("created_at")], last[batch.columns.index("detail_id")])
+
+
+def stream_run_details(feed_run_id=None, after=None, limit=DEFAULT_PAGE_ROWS,
+                       batch_size=STREAM_BATCH_SIZE, conn=None):
+    """Yield (RowBatch, has_more) for one page of at most `limit` rows
+
+    One probe row past the limit is fetched and one batch is held back, so
+    the final batch already knows whether another page follows.
+    """
+    after_created, after_id = decode_cursor(after) if after else (None, None)
+    params = {'feed_run_id': feed_run_id, 'after_created': after_created, 'after_id': after_id,
+              'limit': limit + 1}
+
+    held = None
+    fetched = 0
+    with closing(stream_query(DETAILS_QUERY, params, batch_size=batch_size, conn=conn)) as batches:
+        for batch in batches:
+            if held is not None:
+                yield held, True
+                held = None
+            rows = batch.rows[:limit - fetched]
+            fetched += len(rows)
+            if len(rows) < len(batch.rows):
+                # Reached the probe row: another page exists
+                if rows:
+                    yield RowBatch(batch.columns, rows), True
+                return
+            held = RowBatch(batch.columns, rows)
+    if held is not None:
+        yield held, False
+
+
+def pooled_run_details(feed_run_id=None, after=None, limit=DEFAULT_PAGE_ROWS, batch_size=STREAM_BATCH_SIZE):
+    """stream_run_details() on a pooled connection, returned when the stream ends or is closed"""
+    with pooled_connection() as conn:
+        try:
+            yield from stream_run_details(feed_run_id, after, limit, batch_size, conn=conn)
+        except GeneratorExit:
+            # The client went away mid-page; end the transaction before the pool gets it back
+            conn.rollback()
+            raise
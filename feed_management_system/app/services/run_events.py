@@ -0,0 +1,272 @@
+"""
+Feed run event stream (transactional outbox relay)
+
+Triggers on feed.feed_run and feed.feed_run_details append RUN_STARTED,
+RUN_STATUS, RUN_FINISHED and RUN_DETAIL events to feed.run_event_outbox in
+the writing transaction. The relay publishes them to a sink and records each
+consumer's position in feed.run_event_consumer, so downstream systems follow
+the stream instead of polling the OLTP tables.
+
+Ordering: events are read in (txid, event_id) order, and only from
+transactions older than the oldest transaction still running
+(txid_snapshot_xmin). A transaction that commits late can therefore never
+slip in behind a consumer's saved position.
+
+Delivery is at-least-once. A batch is published before its offset is
+committed, so a crash in between re-sends that batch. Events carry event_id
+for de-duplication.
+
+Sinks are chosen by URL:
+
+    file:///var/feeds/run_events.ndjson   append NDJSON lines (fsynced per batch)
+    http(s)://host/hook                   POST each batch as a JSON array
+    queue://                              in-process queue (tests, embedded consumers)
+"""
+import argparse
+import json
+import os
+import queue
+import time
+import urllib.request
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.core.database import get_connection
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_POLL_INTERVAL = 1.0
+WEBHOOK_TIMEOUT = float(os.getenv('RUN_EVENTS_WEBHOOK_TIMEOUT', '10'))
+
+NEXT_EVENTS_QUERY = """
+    SELECT event_id, txid, event_type, feed_run_id, payload, created_at
+    FROM feed.run_event_outbox
+    WHERE (txid, event_id) > (%(last_txid)s, %(last_event_id)s)
+      AND txid < txid_snapshot_xmin(txid_current_snapshot())
+    ORDER BY txid, event_id
+    LIMIT %(limit)s;
+"""
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def event_to_json(event):
+    return json.dumps(event, default=_json_default, separators=(",", ":"))
+
+
+class EventSink:
+    """Destination for event batches; publish() must raise if delivery failed"""
+
+    def publish(self, events):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileSink(EventSink):
+    """Appends events as NDJSON and fsyncs after every batch"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def publish(self, events):
+        self._file.write("".join(event_to_json(event) + "\n" for event in events))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class WebhookSink(EventSink):
+    """POSTs each batch as a JSON array; any non-2xx response fails the batch"""
+
+    def __init__(self, url, timeout=WEBHOOK_TIMEOUT, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def publish(self, events):
+        body = ("[" + ",".join(event_to_json(event) for event in events) + "]").encode()
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        # urlopen raises HTTPError for 4xx/5xx
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class QueueSink(EventSink):
+    """In-process message queue stand-in; consumers call get()"""
+
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def publish(self, events):
+        for event in events:
+            self.queue.put(event)
+
+    def get(self, timeout=None):
+        return self.queue.get(timeout=timeout)
+
+
+def sink_from_url(url):
+    """Build a sink from file://, http(s):// or queue:// URLs"""
+    if url.startswith('file://'):
+        return FileSink(url[len('file://'):])
+    if url.startswith(('http://', 'https://')):
+        return WebhookSink(url)
+    if url.startswith('queue://'):
+        return QueueSink()
+    raise ValueError(f"Unsupported sink URL: {url}")
+
+
+def relay_batch(sink, consumer, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """Publish the next batch for `consumer` and advance its offset; returns the event count
+
+    The consumer row is locked for the duration, so two relays with the same
+    consumer name never publish the same batch concurrently.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO feed.run_event_consumer (consumer_name) VALUES (%s)
+                ON CONFLICT (consumer_name) DO NOTHING;
+            """, (consumer,))
+            cur.execute("""
+                SELECT last_txid, last_event_id FROM feed.run_event_consumer
+                WHERE consumer_name = %s FOR UPDATE;
+            """, (consumer,))
+            last_txid, last_event_id = cur.fetchone()
+
+            cur.execute(NEXT_EVENTS_QUERY, {'last_txid': last_txid, 'last_event_id': last_event_id,
+                                            'limit': batch_size})
+            columns = [desc[0] for desc in cur.description]
+            events = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+            if events:
+                sink.publish(events)
+                cur.execute("""
+                    UPDATE feed.run_event_consumer
+                    SET last_txid = %s, last_event_id = %s,
+                        delivered_count = delivered_count + %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE consumer_name = %s;
+                """, (events[-1]['txid'], events[-1]['event_id'], len(events), consumer))
+        conn.commit()
+        return len(events)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def consumer_positions(conn=None):
+    """Every consumer's offset and how many committed events it has not received yet"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT c.consumer_name, c.last_txid, c.last_event_id, c.delivered_count, c.updated_at,
+                       (SELECT COUNT(*) FROM feed.run_event_outbox e
+                         WHERE (e.txid, e.event_id) > (c.last_txid, c.last_event_id)) AS pending
+                FROM feed.run_event_consumer c
+                ORDER BY c.consumer_name;
+            """)
+            columns = [desc[0] for desc in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def prune_events(retain_hours=24, conn=None):
+    """Delete events every consumer has received and that are older than retain_hours"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM feed.run_event_outbox e
+                USING (SELECT MIN(last_txid) AS txid FROM feed.run_event_consumer) done
+                WHERE e.txid < done.txid
+                  AND e.created_at < CURRENT_TIMESTAMP - make_interval(hours => %s);
+            """, (retain_hours,))
+            deleted = cur.rowcount
+        conn.commit()
+        return deleted
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def run_relay(sink, consumer, batch_size=DEFAULT_BATCH_SIZE, poll_interval=DEFAULT_POLL_INTERVAL,
+              once=False):
+    """Relay until interrupted; drains back-to-back and sleeps only when caught up"""
+    conn = get_connection()
+    try:
+        while True:
+            try:
+                count = relay_batch(sink, consumer, batch_size=batch_size, conn=conn)
+            except Exception as e:
+                print(f"❌ Relay to {consumer} failed: {e}; retrying in {poll_interval}s")
+                count = 0
+                if conn.closed:
+                    conn = get_connection()
+            if once and count < batch_size:
+                return
+            if count < batch_size:
+                time.sleep(poll_interval)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish feed run events to a sink")
+    parser.add_argument("--sink", help="file:///path.ndjson, http(s)://url or queue://")
+    parser.add_argument("--consumer", default="default", help="Consumer name the offset is stored under")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Seconds between polls when idle")
+    parser.add_argument("--once", action="store_true", help="Exit once the consumer has caught up")
+    parser.add_argument("--status", action="store_true", help="Show consumer offsets and exit")
+    parser.add_argument("--prune", type=float, metavar="HOURS",
+                        help="Delete events older than HOURS that every consumer has received, then exit")
+    args = parser.parse_args()
+
+    if args.status:
+        for position in consumer_positions():
+            print(f"{position['consumer_name']:<20} event {position['last_event_id']:>10} "
+                  f"delivered {position['delivered_count']:>10} pending {position['pending']:>8}")
+        return
+    if args.prune is not None:
+        print(f"✅ Pruned {prune_events(args.prune)} event(s)")
+        return
+    if not args.sink:
+        parser.error("--sink is required")
+
+    sink = sink_from_url(args.sink)
+    print(f"✅ Relaying run events to {args.sink} as consumer '{args.consumer}'")
+    try:
+        run_relay(sink, args.consumer, batch_size=args.batch_size, poll_interval=args.interval,
+                  once=args.once)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Run log: append-only, chunked job output per feed run
+
+Chunks are numbered per run (seq 1, 2, ...). Appends for one run are
+serialized with a transaction-scoped advisory lock, so concurrent writers
+never collide on seq and readers can use the last seq they saw as an offset:
+tail(after_seq=N) returns only chunks written after N.
+"""
+import argparse
+import sys
+import time
+
+from app.core.database import get_connection, stream_query
+from app.services.feed_run_service import FINISHED_STATUSES
+
+LOG_STREAMS = ('STDOUT', 'STDERR', 'SYSTEM')
+# Larger chunks are split so a single row stays cheap to fetch and render
+MAX_CHUNK_CHARS = 256 * 1024
+DEFAULT_TAIL_LIMIT = 200
+# First key of pg_advisory_xact_lock(int, int); the second is the feed_run_id
+LOG_LOCK_CLASS = 4039
+
+
+class RunNotFound(LookupError):
+    """Raised when a feed_run_id does not exist"""
+
+
+def _split(text):
+    for start in range(0, len(text), MAX_CHUNK_CHARS):
+        yield text[start:start + MAX_CHUNK_CHARS]
+
+
+def normalize_chunks(chunks):
+    """Accept strings or (stream, text) pairs; returns [(stream, text)] split to size"""
+    rows = []
+    for chunk in chunks:
+        stream, text = ('STDOUT', chunk) if isinstance(chunk, str) else chunk
+        stream = (stream or 'STDOUT').upper()
+        if stream not in LOG_STREAMS:
+            raise ValueError(f"Unknown log stream {stream!r}; expected one of {', '.join(LOG_STREAMS)}")
+        rows.extend((stream, part) for part in _split(text or '') if part)
+    return rows
+
+
+def append_chunks(feed_run_id, chunks, conn=None):
+    """Append chunks to a run's log in one statement; returns (first_seq, last_seq)
+
+    Returns (None, None) when there is nothing to write.
+    """
+    from psycopg2.extras import execute_values
+
+    rows = normalize_chunks(chunks)
+    if not rows:
+        return None, None
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    # The advisory lock only lives as long as the transaction, so an
+    # autocommit connection is switched to a real transaction for the append
+    restore_autocommit = conn.autocommit
+    manage_tx = own_conn or restore_autocommit
+    if restore_autocommit:
+        conn.autocommit = False
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s, %s);", (LOG_LOCK_CLASS, feed_run_id))
+            cur.execute("SELECT 1 FROM feed.feed_run WHERE feed_run_id = %s;", (feed_run_id,))
+            if cur.fetchone() is None:
+                raise RunNotFound(f"Feed run {feed_run_id} not found")
+            cur.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM feed.feed_run_log WHERE feed_run_id = %s;",
+                (feed_run_id,)
+            )
+            last_seq = cur.fetchone()[0]
+            execute_values(
+                cur,
+                "INSERT INTO feed.feed_run_log (feed_run_id, seq, stream, chunk) VALUES %s",
+                [(feed_run_id, last_seq + i, stream, text) for i, (stream, text) in enumerate(rows, 1)],
+                page_size=500,
+            )
+        if manage_tx:
+            conn.commit()
+        return last_seq + 1, last_seq + len(rows)
+    except Exception:
+        if manage_tx:
+            conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+        elif restore_autocommit:
+            conn.autocommit = True
+
+
+def tail(feed_run_id, after_seq=0, limit=DEFAULT_TAIL_LIMIT, conn=None):
+    """Chunks written after after_seq, plus the offset to pass next time
+
+    Returns {"feed_run_id", "chunks": [{seq, stream, chunk, created_at}],
+    "next_seq", "finished"}; "finished" is True once the run has ended and
+    every chunk has been returned.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT status_cd FROM feed.feed_run WHERE feed_run_id = %s;", (feed_run_id,))
+            run = cur.fetchone()
+            if run is None:
+                raise RunNotFound(f"Feed run {feed_run_id} not found")
+            cur.execute("""
+                SELECT seq, stream, chunk, created_at
+                FROM feed.feed_run_log
+                WHERE feed_run_id = %s AND seq > %s
+                ORDER BY seq
+                LIMIT %s;
+            """, (feed_run_id, after_seq, limit))
+            rows = cur.fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+
+    chunks = [{'seq': seq, 'stream': stream, 'chunk': chunk, 'created_at': created_at}
+              for seq, stream, chunk, created_at in rows]
+    return {
+        'feed_run_id': feed_run_id,
+        'chunks': chunks,
+        'next_seq': chunks[-1]['seq'] if chunks else after_seq,
+        'finished': run[0] in FINISHED_STATUSES and len(chunks) < limit,
+    }
+
+
+def follow(feed_run_id, after_seq=0, poll_interval=1.0, timeout=None):
+    """Yield chunks as they arrive until the run finishes (or timeout seconds pass)"""
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        page = tail(feed_run_id, after_seq)
+        yield from page['chunks']
+        after_seq = page['next_seq']
+        if page['finished'] or (deadline and time.monotonic() >= deadline):
+            return
+        if not page['chunks']:
+            time.sleep(poll_interval)
+
+
+def log_summary(feed_run_id, conn=None):
+    """Chunk count, character count and last seq of a run's log"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*), COALESCE(SUM(length(chunk)), 0), COALESCE(MAX(seq), 0)
+                FROM feed.feed_run_log
+                WHERE feed_run_id = %s;
+            """, (feed_run_id,))
+            chunks, chars, last_seq = cur.fetchone()
+            return {'chunks': chunks, 'chars': chars, 'last_seq': last_seq}
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def iter_log(feed_run_id, after_seq=0, until_seq=None, batch_size=100, conn=None):
+    """Yield (seq, stream, chunk) from a server-side cursor, batch_size chunks per round trip"""
+    query = """
+        SELECT seq, stream, chunk
+        FROM feed.feed_run_log
+        WHERE feed_run_id = %s AND seq > %s AND (%s IS NULL OR seq <= %s)
+        ORDER BY seq;
+    """
+    for batch in stream_query(query, (feed_run_id, after_seq, until_seq, until_seq),
+                              batch_size=batch_size, conn=conn):
+        yield from batch.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print or follow a feed run's log")
+    parser.add_argument("feed_run_id", type=int)
+    parser.add_argument("--after", type=int, default=0, help="Only chunks after this seq")
+    parser.add_argument("-f", "--follow", action="store_true", help="Keep printing until the run finishes")
+    args = parser.parse_args()
+
+    if args.follow:
+        for chunk in follow(args.feed_run_id, args.after):
+            sys.stdout.write(chunk['chunk'])
+            sys.stdout.flush()
+    else:
+        for _, _, chunk in iter_log(args.feed_run_id, args.after):
+            sys.stdout.write(chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Per-run numeric metrics and throughput rollups
+
+Jobs report counters such as rows_read, rows_written, bytes_written and
+errors, plus any custom counter, for each feed run. Values live in the
+narrow feed.feed_run_metric table, keyed by (feed_run_id, metric_id), and
+names are interned in feed.run_metric_name. A resubmitted metric replaces
+the previous value, so jobs can report running totals and retry a batch.
+
+The rollups work on one metric across many completed runs and compute the
+per-second rate from each run's duration:
+
+    python -m app.services.run_metrics percentiles --metric rows_written --days 30
+    python -m app.services.run_metrics trend --feed-tag orders --bucket week
+
+Metrics are PostgreSQL only; the embedded SQLite backend does not store them.
+"""
+import argparse
+import math
+import re
+
+from app.core.database import get_connection
+from app.services.feed_service import _fetch_dicts
+from app.services.run_log import RunNotFound
+
+STANDARD_METRICS = ('rows_read', 'rows_written', 'bytes_read', 'bytes_written', 'errors')
+METRIC_NAME_PATTERN = re.compile(r'^[a-z][a-z0-9_]{0,62}$')
+TREND_BUCKETS = ('hour', 'day', 'week', 'month')
+DEFAULT_RATE_METRIC = 'rows_written'
+DEFAULT_DAYS = 30
+MAX_BATCH_SIZE = 5000
+
+METRIC_UPSERT = """
+    INSERT INTO feed.feed_run_metric (feed_run_id, metric_id, value)
+    VALUES %s
+    ON CONFLICT (feed_run_id, metric_id) DO UPDATE SET
+        value = EXCLUDED.value,
+        recorded_at = CURRENT_TIMESTAMP
+"""
+
+RUN_METRICS_QUERY = """
+    SELECT n.metric_name, n.unit, m.value, m.recorded_at
+    FROM feed.feed_run_metric m
+    JOIN feed.run_metric_name n ON m.metric_id = n.metric_id
+    WHERE m.feed_run_id = %s
+    ORDER BY n.metric_name;
+"""
+
+# One row per completed run with the chosen metric and its per-second rate
+RATES_CTE = """
+    WITH rates AS (
+        SELECT f.feed_tag, lower(sc.common_cd) AS environment, fr.start_dt, m.value,
+               m.value / EXTRACT(EPOCH FROM (fr.end_dt - fr.start_dt)) AS per_second
+        FROM feed.feed_run_metric m
+        JOIN feed.run_metric_name n ON m.metric_id = n.metric_id
+        JOIN feed.feed_run fr ON m.feed_run_id = fr.feed_run_id
+        JOIN feed.feed f ON fr.feed_id = f.feed_id
+        JOIN feed.feed_environment fe ON fr.environment_id = fe.environment_id
+        JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+        WHERE n.metric_name = %(metric)s
+          AND fr.status_cd = 'COMPLETED'
+          AND fr.end_dt > fr.start_dt
+          AND fr.start_dt >= CURRENT_DATE - %(days)s::INTEGER
+          AND (%(feed_tag)s::VARCHAR IS NULL OR f.feed_tag = %(feed_tag)s)
+          AND (%(environment)s::VARCHAR IS NULL OR lower(sc.common_cd) = lower(%(environment)s))
+    )
+"""
+
+PERCENTILES_QUERY = RATES_CTE + """
+    SELECT feed_tag, environment,
+           COUNT(*) AS runs,
+           SUM(value) AS total,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY per_second) AS p50_per_second,
+           percentile_cont(0.9) WITHIN GROUP (ORDER BY per_second) AS p90_per_second,
+           percentile_cont(0.99) WITHIN GROUP (ORDER BY per_second) AS p99_per_second,
+           MAX(per_second) AS max_per_second
+    FROM rates
+    GROUP BY feed_tag, environment
+    ORDER BY p50_per_second DESC NULLS LAST;
+"""
+
+TREND_QUERY = RATES_CTE + """
+    SELECT date_trunc(%(bucket)s, start_dt) AS bucket, feed_tag, environment,
+           COUNT(*) AS runs,
+           SUM(value) AS total,
+           AVG(per_second) AS avg_per_second,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY per_second) AS p50_per_second,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY per_second) AS p95_per_second
+    FROM rates
+    GROUP BY 1, feed_tag, environment
+    ORDER BY bucket, feed_tag, environment;
+"""
+
+
+def validate_metrics(rows):
+    """Check (feed_run_id, metric_name, value) rows; returns them with float values"""
+    if len(rows) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} metrics per batch")
+    checked = {}
+    for feed_run_id, name, value in rows:
+        if not METRIC_NAME_PATTERN.match(name or ''):
+            raise ValueError(f"Invalid metric name {name!r}; use lowercase letters, digits and underscores")
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f"Metric {name} must be a finite number")
+        # The last value for a run/metric wins, as it would across batches
+        checked[(feed_run_id, name)] = value
+    return [(feed_run_id, name, value) for (feed_run_id, name), value in checked.items()]
+
+
+def _metric_ids(cur, names):
+    """Ids for metric names, registering the ones seen for the first time"""
+    cur.execute("SELECT metric_name, metric_id FROM feed.run_metric_name WHERE metric_name = ANY(%s);",
+                (list(names),))
+    ids = dict(cur.fetchall())
+    missing = sorted(set(names) - ids.keys())
+    if missing:
+        # Only unknown names reach the INSERT, so conflicts do not burn SMALLSERIAL values
+        cur.execute("""
+            INSERT INTO feed.run_metric_name (metric_name)
+            SELECT unnest(%s::VARCHAR[])
+            ON CONFLICT (metric_name) DO NOTHING;
+        """, (missing,))
+        cur.execute("SELECT metric_name, metric_id FROM feed.run_metric_name WHERE metric_name = ANY(%s);",
+                    (missing,))
+        ids.update(cur.fetchall())
+    return ids
+
+
+def record_metrics(rows, conn=None):
+    """Store a batch of (feed_run_id, metric_name, value) rows in one statement; returns the row count"""
+    from psycopg2.extras import execute_values
+
+    rows = validate_metrics(rows)
+    if not rows:
+        return 0
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            run_ids = sorted({feed_run_id for feed_run_id, _, _ in rows})
+            cur.execute("SELECT feed_run_id FROM feed.feed_run WHERE feed_run_id = ANY(%s);", (run_ids,))
+            missing = sorted(set(run_ids) - {row[0] for row in cur.fetchall()})
+            if missing:
+                raise RunNotFound(f"Feed run(s) not found: {', '.join(map(str, missing))}")
+
+            ids = _metric_ids(cur, {name for _, name, _ in rows})
+            # Key order keeps concurrent batches for the same runs from deadlocking
+            values = sorted((feed_run_id, ids[name], value) for feed_run_id, name, value in rows)
+            execute_values(cur, METRIC_UPSERT, values, page_size=1000)
+        if own_conn:
+            conn.commit()
+        return len(rows)
+    except Exception:
+        if own_conn:
+            conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def run_metrics(feed_run_id, conn=None):
+    """Every metric recorded for one run, by name"""
+    return _fetch_dicts(RUN_METRICS_QUERY, (feed_run_id,), conn)
+
+
+def _rate_params(metric, days, feed_tag, environment, **extra):
+    return {'metric': metric, 'days': days, 'feed_tag': feed_tag, 'environment': environment, **extra}
+
+
+def rate_percentiles(metric=DEFAULT_RATE_METRIC, days=DEFAULT_DAYS, feed_tag=None, environment=None,
+                     conn=None):
+    """Per feed/environment: total and p50/p90/p99/max per-second rate of `metric`"""
+    return _fetch_dicts(PERCENTILES_QUERY, _rate_params(metric, days, feed_tag, environment), conn)
+
+
+def throughput_trend(metric=DEFAULT_RATE_METRIC, days=DEFAULT_DAYS, bucket='day', feed_tag=None,
+                     environment=None, conn=None):
+    """Per time bucket and feed/environment: runs, total and per-second rate of `metric`"""
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r}; expected one of {', '.join(TREND_BUCKETS)}")
+    params = _rate_params(metric, days, feed_tag, environment, bucket=bucket)
+    return _fetch_dicts(TREND_QUERY, params, conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput rollups over per-run metrics")
+    parser.add_argument("rollup", choices=("percentiles", "trend"))
+    parser.add_argument("--metric", default=DEFAULT_RATE_METRIC, help="Metric to compute rates for")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Look-back window in days")
+    parser.add_argument("--feed-tag")
+    parser.add_argument("--environment")
+    parser.add_argument("--bucket", choices=TREND_BUCKETS, default="day", help="Trend bucket size")
+    args = parser.parse_args()
+
+    if args.rollup == "percentiles":
+        rows = rate_percentiles(args.metric, args.days, args.feed_tag, args.environment)
+    else:
+        rows = throughput_trend(args.metric, args.days, args.bucket, args.feed_tag, args.environment)
+    if not rows:
+        print(f"No completed runs with {args.metric} in the last {args.days} day(s)")
+        return
+    for row in rows:
+        print("  ".join(f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+                        for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
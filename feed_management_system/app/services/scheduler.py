@@ -0,0 +1,213 @@
+"""
+Dependency-aware feed run scheduler
+
+Feeds are ordered by feed.feed_dependency. Every feed whose upstream feeds have
+completed is dispatched through start_feed_run() immediately, up to a
+per-environment concurrency limit, so independent branches of the graph run in
+parallel. When an upstream feed fails, everything downstream of it is skipped.
+Externally executed runs that have not finished within the external timeout
+(SCHEDULER_EXTERNAL_TIMEOUT seconds) are marked failed, which skips their
+downstream feeds too.
+"""
+import argparse
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.core.storage import get_backend
+from app.services.feed_run_service import (
+    FINISHED_STATUSES,
+    RUN_RESULT_STATUSES,
+    VALID_ENVIRONMENTS,
+    complete_feed_run,
+    get_run_statuses,
+    start_feed_run,
+)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_POLL_INTERVAL = 5.0
+# Seconds to wait for an externally executed run; 0 waits forever
+DEFAULT_EXTERNAL_TIMEOUT = float(os.getenv('SCHEDULER_EXTERNAL_TIMEOUT', str(6 * 3600)))
+
+STATUS_COMPLETED = 'COMPLETED'
+STATUS_FAILED = 'FAILED'
+STATUS_SKIPPED = 'SKIPPED'
+
+
+def concurrency_limits(variable='SCHEDULER_CONCURRENCY'):
+    """Parse an env var such as SCHEDULER_CONCURRENCY="dev=8,test=4,prod=2" into {env: limit}"""
+    limits = {}
+    raw = os.getenv(variable, '')
+    for item in raw.split(','):
+        if '=' in item:
+            env, limit = item.split('=', 1)
+            limits[env.strip().lower()] = int(limit)
+    return limits
+
+
+def concurrency_limit(environment, variable='SCHEDULER_CONCURRENCY'):
+    """Concurrency limit configured for one environment"""
+    return concurrency_limits(variable).get(environment.lower(), DEFAULT_CONCURRENCY)
+
+
+def topological_order(nodes, upstreams):
+    """Kahn's algorithm over {node: set(upstream nodes)}; raises ValueError on cycles"""
+    indegree = {node: len(upstreams.get(node, ())) for node in nodes}
+    downstreams = defaultdict(set)
+    for node in nodes:
+        for upstream in upstreams.get(node, ()):
+            downstreams[upstream].add(node)
+
+    queue = deque(sorted(node for node, degree in indegree.items() if degree == 0))
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for downstream in sorted(downstreams[node]):
+            indegree[downstream] -= 1
+            if indegree[downstream] == 0:
+                queue.append(downstream)
+
+    if len(order) != len(indegree):
+        cyclic = sorted(node for node, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Feed dependencies contain a cycle involving feeds: {cyclic}")
+    return order
+
+
+def load_feed_graph(feed_tags=None):
+    """Load active feeds and their dependencies as ({feed_id: feed_tag}, {feed_id: set(upstream ids)})
+
+    When feed_tags is given, only those feeds and the edges between them are kept.
+    """
+    return get_backend().feed_graph(feed_tags)
+
+
+class FeedScheduler:
+    """Runs a feed dependency graph for one environment with bounded concurrency
+
+    `job(feed_run_id, feed_tag, environment)` performs the work for a run and
+    returns True on success; the scheduler then records the outcome with
+    complete_feed_run(). Without a job, runs are assumed to be executed
+    externally and the scheduler polls feed.feed_run until they finish or
+    external_timeout seconds pass.
+    """
+
+    def __init__(self, environment, max_concurrency=None, job=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, external_timeout=DEFAULT_EXTERNAL_TIMEOUT):
+        if environment.lower() not in VALID_ENVIRONMENTS:
+            raise ValueError(f"Invalid environment. Must be one of {', '.join(VALID_ENVIRONMENTS)}")
+        self.environment = environment.lower()
+        self.max_concurrency = max_concurrency or concurrency_limit(self.environment)
+        self.job = job
+        self.poll_interval = poll_interval
+        self.external_timeout = external_timeout
+
+    def _run_feed(self, feed_tag):
+        """Start, execute and (for local jobs) complete one feed run; returns the final status"""
+        feed_run_id = start_feed_run(self.environment, feed_tag)
+
+        if self.job is None:
+            return self._wait_for_external(feed_run_id)
+
+        try:
+            succeeded = bool(self.job(feed_run_id, feed_tag, self.environment))
+        except Exception:
+            succeeded = False
+        return self._finish(feed_run_id, 'success' if succeeded else 'failure')
+
+    def _finish(self, feed_run_id, status):
+        """Complete a run; if something else finished it first, return the status it recorded"""
+        if complete_feed_run(feed_run_id, status):
+            return RUN_RESULT_STATUSES[status]
+        return get_run_statuses([feed_run_id]).get(feed_run_id)
+
+    def _wait_for_external(self, feed_run_id):
+        """Poll until an externally executed run finishes; fails it once external_timeout passes"""
+        deadline = time.monotonic() + self.external_timeout if self.external_timeout else None
+        while True:
+            status = get_run_statuses([feed_run_id]).get(feed_run_id)
+            if status in FINISHED_STATUSES:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"⚠️ Run {feed_run_id} did not finish within {self.external_timeout:g}s; marking it failed")
+                return self._finish(feed_run_id, 'failure')
+            delay = self.poll_interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def run(self, feed_tags=None, feeds=None, upstreams=None):
+        """Run the graph to completion and return {feed_tag: final status}"""
+        if feeds is None:
+            feeds, upstreams = load_feed_graph(feed_tags)
+        upstreams = upstreams or {}
+        order = topological_order(feeds, upstreams)
+
+        remaining = {feed_id: set(upstreams.get(feed_id, ())) for feed_id in order}
+        downstreams = defaultdict(set)
+        for feed_id, ups in remaining.items():
+            for upstream in ups:
+                downstreams[upstream].add(feed_id)
+
+        results = {}
+        ready = deque(feed_id for feed_id in order if not remaining[feed_id])
+        in_flight = {}
+
+        def skip_downstream(feed_id):
+            stack = list(downstreams[feed_id])
+            while stack:
+                blocked = stack.pop()
+                if blocked not in results:
+                    results[blocked] = STATUS_SKIPPED
+                    stack.extend(downstreams[blocked])
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix=f"feed-{self.environment}") as pool:
+            while ready or in_flight:
+                while ready and len(in_flight) < self.max_concurrency:
+                    feed_id = ready.popleft()
+                    if feed_id in results:
+                        continue
+                    in_flight[pool.submit(self._run_feed, feeds[feed_id])] = feed_id
+
+                if not in_flight:
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    feed_id = in_flight.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception:
+                        status = STATUS_FAILED
+                    results[feed_id] = status
+
+                    if status == STATUS_COMPLETED:
+                        for downstream in sorted(downstreams[feed_id]):
+                            remaining[downstream].discard(feed_id)
+                            if not remaining[downstream] and downstream not in results:
+                                ready.append(downstream)
+                    else:
+                        skip_downstream(feed_id)
+
+        return {feeds[feed_id]: status for feed_id, status in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run feeds in dependency order")
+    parser.add_argument("--environment", required=True, choices=VALID_ENVIRONMENTS)
+    parser.add_argument("--tags", nargs="*", help="Only schedule these feed tags (default: all active feeds)")
+    parser.add_argument("--max-concurrency", type=int, help="Override the environment's concurrency limit")
+    parser.add_argument("--external-timeout", type=float, default=DEFAULT_EXTERNAL_TIMEOUT,
+                        help="Seconds to wait for an external run before failing it (0 waits forever)")
+    args = parser.parse_args()
+
+    scheduler = FeedScheduler(args.environment, max_concurrency=args.max_concurrency,
+                              external_timeout=args.external_timeout)
+    for feed_tag, status in scheduler.run(feed_tags=args.tags).items():
+        print(f"{feed_tag}: {status}")
+
+
+if __name__ == "__main__":
+    main()
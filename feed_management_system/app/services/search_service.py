@@ -0,0 +1,120 @@
+"""
+Full-text search over feeds, feed details and run details
+
+Feeds and feed details match on their GIN-indexed search_vector columns
+(sql/ddl/3_create_search_index.sql). Feeds also match a substring of their
+name or tag through the trigram indexes, so partial tags such as "batch5"
+are found. Run details match on feed.run_detail_search_vector(), the
+expression their GIN index is built on. Rebuilding that vector is what makes
+ranking expensive, so only the newest RUN_DETAIL_CANDIDATES matches are
+ranked. Each source is cut to `limit` rows on its own, and ts_headline (also
+expensive) only runs for the final top results.
+"""
+from app.core.database import get_connection
+
+SEARCH_SOURCES = ('feed', 'feed_detail', 'run_detail')
+# Newest matching run details that are ranked; older matches are not returned
+RUN_DETAIL_CANDIDATES = 500
+# Shorter substrings have no trigram to use the index with
+MIN_SUBSTRING_LENGTH = 3
+
+SEARCH_QUERY = """
+WITH q AS (
+    SELECT websearch_to_tsquery('simple', %(term)s) AS query
+),
+run_candidates AS (
+    -- No ranking here. "+ 0" keeps the planner on the GIN index instead of
+    -- walking the primary key backwards and re-parsing every row it passes.
+    SELECT frd.detail_id
+    FROM feed.feed_run_details frd, q
+    WHERE 'run_detail' = ANY(%(sources)s)
+      AND feed.run_detail_search_vector(frd.detail_desc, frd.detail_data) @@ q.query
+    ORDER BY frd.detail_id + 0 DESC
+    LIMIT %(candidates)s
+),
+hits AS (
+    (SELECT 'feed' AS source, f.feed_id, NULL::INTEGER AS feed_run_id,
+            f.feed_id AS record_id, f.feed_name AS title,
+            concat_ws(' ', f.feed_tag, f.feed_description) AS body,
+            GREATEST(ts_rank_cd(f.search_vector, q.query),
+                     CASE WHEN %(pattern)s::TEXT IS NOT NULL
+                          THEN word_similarity(%(term)s, f.feed_name || ' ' || f.feed_tag) ELSE 0 END) AS rank,
+            f.created_at
+     FROM feed.feed f, q
+     WHERE 'feed' = ANY(%(sources)s)
+       AND (f.search_vector @@ q.query
+            OR f.feed_name ILIKE %(pattern)s
+            OR f.feed_tag ILIKE %(pattern)s)
+     ORDER BY rank DESC
+     LIMIT %(limit)s)
+    UNION ALL
+    (SELECT 'feed_detail', fd.feed_id, NULL::INTEGER,
+            fd.detail_id, f.feed_name || ': ' || fd.detail_desc,
+            coalesce(fd.detail_data, ''),
+            ts_rank_cd(fd.search_vector, q.query), fd.created_at
+     FROM feed.feed_details fd
+     JOIN feed.feed f ON fd.feed_id = f.feed_id, q
+     WHERE 'feed_detail' = ANY(%(sources)s) AND fd.search_vector @@ q.query
+     ORDER BY 7 DESC
+     LIMIT %(limit)s)
+    UNION ALL
+    (SELECT 'run_detail', fr.feed_id, frd.feed_run_id,
+            frd.detail_id, f.feed_name || ' run ' || frd.feed_run_id || ': ' || frd.detail_desc,
+            frd.detail_data,
+            ts_rank_cd(feed.run_detail_search_vector(frd.detail_desc, frd.detail_data), q.query),
+            frd.created_at
+     FROM run_candidates c
+     JOIN feed.feed_run_details frd ON frd.detail_id = c.detail_id
+     JOIN feed.feed_run fr ON frd.feed_run_id = fr.feed_run_id
+     JOIN feed.feed f ON fr.feed_id = f.feed_id, q
+     ORDER BY 7 DESC
+     LIMIT %(limit)s)
+),
+top_hits AS (
+    SELECT * FROM hits ORDER BY rank DESC, created_at DESC LIMIT %(limit)s
+)
+SELECT th.source, th.feed_id, th.feed_run_id, th.record_id, th.title,
+       th.rank, th.created_at,
+       ts_headline('simple', left(th.body, 100000), q.query, %(headline_options)s) AS snippet
+FROM top_hits th, q
+ORDER BY th.rank DESC, th.created_at DESC;
+"""
+
+
+def substring_pattern(term):
+    """ILIKE pattern matching `term` anywhere, or None when it is too short for the trigram index"""
+    if len(term) < MIN_SUBSTRING_LENGTH:
+        return None
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def search(term, limit=20, sources=SEARCH_SOURCES, start_sel='<mark>', stop_sel='</mark>', conn=None):
+    """Return ranked matches for a web-style search term as a list of dicts
+
+    Matches are highlighted in `snippet` with start_sel/stop_sel.
+    """
+    if not term or not term.strip():
+        return []
+
+    term = term.strip()
+    params = {
+        'term': term,
+        'pattern': substring_pattern(term),
+        'candidates': max(limit, RUN_DETAIL_CANDIDATES),
+        'limit': limit,
+        'sources': list(sources),
+        'headline_options': f"StartSel={start_sel}, StopSel={stop_sel}, MaxFragments=2, MaxWords=25, MinWords=8",
+    }
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SEARCH_QUERY, params)
+            columns = [desc[0] for desc in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
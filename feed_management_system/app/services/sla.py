@@ -0,0 +1,316 @@
+"""
+Feed SLA evaluation
+
+An SLA (feed.feed_sla) says when a feed is expected to start in an
+environment (a five-field cron expression), how late it may start and how
+long it may take. Each evaluation pass:
+
+1. loads the active SLAs and the database clock in one query,
+2. computes each SLA's most recent scheduled start in Python, parsing every
+   distinct cron expression once and its previous fire time once per pass,
+3. checks every SLA in a single set-based statement: the slots are passed as
+   unnest()ed arrays and the latest run per feed/environment comes from a
+   LATERAL lookup on the run-stats index (feed_id, environment_id, start_dt
+   DESC), then new breaches are inserted and cleared ones resolved.
+
+Only the current slot is re-evaluated. An open breach from an earlier slot
+stays open until its own condition clears: NOT_STARTED once a run started
+for that slot, OVERRUN once the run ended. A new slot coming due never
+resolves it.
+
+So a pass is two round trips regardless of the number of feeds.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from app.core.database import get_connection
+
+BREACH_TYPES = ('NOT_STARTED', 'OVERRUN', 'LATE', 'FAILED')
+DEFAULT_INTERVAL = 60
+# How far back previous_fire() searches before giving up (covers yearly crons)
+MAX_LOOKBACK_DAYS = 366 * 5
+
+_FIELD_RANGES = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+)
+_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+
+class CronExpression:
+    """A parsed five-field cron expression (minute hour dom month dow)"""
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} must have 5 fields")
+        parsed = [_parse_field(field, name, low, high)
+                  for field, (name, low, high) in zip(fields, _FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        # Standard cron: when both day fields are restricted, either may match
+        self.day_or = fields[2] != '*' and fields[4] != '*'
+        self.minutes_desc = sorted(self.minutes, reverse=True)
+        self.hours_desc = sorted(self.hours, reverse=True)
+
+    def matches_day(self, day):
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = (day.weekday() + 1) % 7 in self.weekdays
+        return (dom or dow) if self.day_or else (dom and dow)
+
+    def previous_fire(self, now):
+        """Latest fire time <= now (to the minute), or None within MAX_LOOKBACK_DAYS"""
+        now = now.replace(second=0, microsecond=0)
+        day = now.date()
+        for offset in range(MAX_LOOKBACK_DAYS):
+            if self.matches_day(day):
+                same_day = offset == 0
+                for hour in self.hours_desc:
+                    if same_day and hour > now.hour:
+                        continue
+                    for minute in self.minutes_desc:
+                        if same_day and hour == now.hour and minute > now.minute:
+                            continue
+                        return datetime(day.year, day.month, day.day, hour, minute)
+            day -= timedelta(days=1)
+        return None
+
+
+def _parse_field(field, name, low, high):
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron {name} field: {field!r}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron {name} field {field!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@lru_cache(maxsize=1024)
+def parse_cron(expression):
+    """Parse a cron expression once per process"""
+    return CronExpression(expression)
+
+
+def previous_fire(expression, now):
+    """Most recent scheduled time <= now for a cron expression"""
+    return parse_cron(expression).previous_fire(now)
+
+
+EVALUATE_QUERY = """
+    WITH slot AS (
+        SELECT * FROM unnest(%(sla_ids)s::INTEGER[], %(expected)s::TIMESTAMP[]) AS s(sla_id, expected_start)
+    ),
+    evaluated AS (
+        SELECT s.sla_id, s.expected_start, r.feed_run_id, r.end_dt,
+               CASE
+                   WHEN r.feed_run_id IS NULL
+                        AND %(now)s > s.expected_start + make_interval(mins => sla.start_grace_minutes)
+                       THEN 'NOT_STARTED'
+                   WHEN r.status_cd = 'FAILED' THEN 'FAILED'
+                   WHEN r.end_dt IS NULL
+                        AND %(now)s > s.expected_start + make_interval(mins => sla.max_duration_minutes)
+                       THEN 'OVERRUN'
+                   WHEN r.end_dt > s.expected_start + make_interval(mins => sla.max_duration_minutes)
+                       THEN 'LATE'
+               END AS breach_type
+        FROM slot s
+        JOIN feed.feed_sla sla ON sla.sla_id = s.sla_id
+        LEFT JOIN LATERAL (
+            -- Latest attempt for this slot; a successful retry supersedes a failure
+            SELECT fr.feed_run_id, fr.end_dt, fr.status_cd
+            FROM feed.feed_run fr
+            WHERE fr.feed_id = sla.feed_id
+              AND fr.environment_id = sla.environment_id
+              AND fr.start_dt >= s.expected_start - make_interval(mins => sla.start_grace_minutes)
+            ORDER BY fr.start_dt DESC
+            LIMIT 1
+        ) r ON TRUE
+    ),
+    breaching AS (
+        SELECT * FROM evaluated WHERE breach_type IS NOT NULL
+    ),
+    inserted AS (
+        INSERT INTO feed.feed_sla_breach (sla_id, expected_start, breach_type, feed_run_id, resolved_at)
+        SELECT sla_id, expected_start, breach_type, feed_run_id,
+               -- LATE and FAILED describe finished runs, so they are closed on arrival
+               CASE WHEN breach_type IN ('LATE', 'FAILED') THEN COALESCE(end_dt, %(now)s) END
+        FROM breaching
+        ON CONFLICT (sla_id, expected_start, breach_type) DO NOTHING
+        RETURNING breach_id
+    ),
+    resolved AS (
+        UPDATE feed.feed_sla_breach b
+        SET resolved_at = %(now)s
+        FROM slot s
+        JOIN feed.feed_sla sla ON sla.sla_id = s.sla_id
+        WHERE b.sla_id = s.sla_id
+          AND b.resolved_at IS NULL
+          AND CASE
+              -- The current slot clears as soon as it stops breaching
+              WHEN b.expected_start = s.expected_start THEN NOT EXISTS (
+                  SELECT 1 FROM breaching x
+                  WHERE x.sla_id = b.sla_id
+                    AND x.expected_start = b.expected_start
+                    AND x.breach_type = b.breach_type
+              )
+              -- Earlier slots only clear on their own condition: a run started
+              -- for the slot (before the current slot's window) ...
+              WHEN b.breach_type = 'NOT_STARTED' THEN EXISTS (
+                  SELECT 1 FROM feed.feed_run fr
+                  WHERE fr.feed_id = sla.feed_id
+                    AND fr.environment_id = sla.environment_id
+                    AND fr.start_dt >= b.expected_start - make_interval(mins => sla.start_grace_minutes)
+                    AND fr.start_dt < s.expected_start - make_interval(mins => sla.start_grace_minutes)
+              )
+              -- ... or the overrunning run has ended
+              WHEN b.breach_type = 'OVERRUN' THEN EXISTS (
+                  SELECT 1 FROM feed.feed_run fr
+                  WHERE fr.feed_run_id = b.feed_run_id AND fr.end_dt IS NOT NULL
+              )
+              ELSE FALSE
+          END
+        RETURNING b.breach_id
+    )
+    SELECT (SELECT COUNT(*) FROM breaching),
+           (SELECT COUNT(*) FROM inserted),
+           (SELECT COUNT(*) FROM resolved);
+"""
+
+BREACHES_QUERY = """
+    SELECT b.breach_id, b.sla_id, f.feed_id, f.feed_tag, f.feed_name,
+           sc.common_cd AS environment, b.breach_type, b.expected_start,
+           b.expected_start + make_interval(mins => sla.max_duration_minutes) AS deadline,
+           b.feed_run_id, b.detected_at, b.resolved_at
+    FROM feed.feed_sla_breach b
+    JOIN feed.feed_sla sla ON b.sla_id = sla.sla_id
+    JOIN feed.feed f ON sla.feed_id = f.feed_id
+    JOIN feed.feed_environment fe ON sla.environment_id = fe.environment_id
+    JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+    WHERE (%(include_resolved)s OR b.resolved_at IS NULL)
+      AND b.detected_at >= %(since)s
+    ORDER BY b.detected_at DESC
+    LIMIT %(limit)s;
+"""
+
+
+def evaluate_slas(conn=None):
+    """Run one evaluation pass; returns counts and the elapsed time in ms"""
+    started = time.perf_counter()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT LOCALTIMESTAMP, sla_id, expected_start_cron
+                FROM feed.feed_sla
+                WHERE is_active = true;
+            """)
+            rows = cur.fetchall()
+            now = rows[0][0] if rows else None
+
+            sla_ids, expected, invalid = [], [], []
+            fires = {}
+            for _, sla_id, cron in rows:
+                if cron not in fires:
+                    try:
+                        fires[cron] = previous_fire(cron, now)
+                    except ValueError:
+                        fires[cron] = None
+                        invalid.append(cron)
+                if fires[cron] is not None:
+                    sla_ids.append(sla_id)
+                    expected.append(fires[cron])
+
+            breaching = inserted = resolved = 0
+            if sla_ids:
+                cur.execute(EVALUATE_QUERY, {'sla_ids': sla_ids, 'expected': expected, 'now': now})
+                breaching, inserted, resolved = cur.fetchone()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+    return {
+        'evaluated': len(sla_ids),
+        'breaching': breaching,
+        'new_breaches': inserted,
+        'resolved': resolved,
+        'invalid_crons': sorted(set(invalid)),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def list_breaches(include_resolved=False, since=None, limit=100, conn=None):
+    """Breaches newest first as dicts; open ones only unless include_resolved"""
+    since = since or datetime(1970, 1, 1)
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(BREACHES_QUERY, {'include_resolved': include_resolved, 'since': since, 'limit': limit})
+            columns = [desc[0] for desc in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate feed SLAs and record breaches")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args()
+
+    while True:
+        started = time.monotonic()
+        try:
+            result = evaluate_slas()
+            print(f"✅ {result['evaluated']} SLA(s) checked in {result['elapsed_ms']} ms: "
+                  f"{result['breaching']} breaching, {result['new_breaches']} new, "
+                  f"{result['resolved']} resolved")
+            for cron in result['invalid_crons']:
+                print(f"⚠️ Invalid cron expression skipped: {cron!r}")
+        except Exception as e:
+            print(f"❌ SLA evaluation failed: {e}")
+        if args.once:
+            break
+        time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
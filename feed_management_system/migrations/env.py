@@ -0,0 +1,76 @@
+"""
+Alembic environment for the feed management schema
+
+Connection settings come from app.core.database.DB_CONFIG. Every migration
+connection sets lock_timeout (MIGRATION_LOCK_TIMEOUT, default 5s) so DDL that
+cannot get its lock fails fast instead of queueing behind running jobs and
+blocking their writes; statement_timeout (MIGRATION_STATEMENT_TIMEOUT) is off
+by default because concurrent index builds on large tables take a while.
+"""
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.database import sqlalchemy_url
+from app.models import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+MANAGED_SCHEMAS = {"admin", "feed"}
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+STATEMENT_TIMEOUT = os.getenv("MIGRATION_STATEMENT_TIMEOUT", "0")
+
+
+def include_name(name, type_, parent_names):
+    """Limit autogenerate to the schemas the models describe"""
+    if type_ == "schema":
+        return name in MANAGED_SCHEMAS
+    return True
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)"""
+    context.configure(
+        url=sqlalchemy_url().render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_schemas=True,
+        include_name=include_name,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        context.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations against the configured database"""
+    engine = create_engine(sqlalchemy_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        # Session-level settings, so they also apply inside autocommit_block()
+        connection.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        connection.exec_driver_sql(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+        connection.commit()
+
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_schemas=True,
+            include_name=include_name,
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
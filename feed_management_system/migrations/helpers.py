@@ -0,0 +1,103 @@
+"""
+Shared operations for migration scripts
+
+Revisions never read the live files under sql/, which keep changing as the
+schema grows. Each revision runs its own frozen copy from
+migrations/sql/<revision>/, taken when the revision was written, so upgrading
+a fresh database to any intermediate revision runs exactly that schema.
+"""
+import os
+import time
+
+from alembic import context, op
+from sqlalchemy.exc import OperationalError
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+# SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+INDEX_BUILD_ATTEMPTS = int(os.getenv("MIGRATION_INDEX_ATTEMPTS", "5"))
+INDEX_RETRY_DELAY = float(os.getenv("MIGRATION_INDEX_RETRY_DELAY", "10"))
+
+
+def sql_statements(text, split=True):
+    """Statements of a SQL file; DDL is split on ';' and comment-only pieces are skipped"""
+    if not split:
+        return [text]
+    statements = []
+    for piece in text.split(";"):
+        code = [line for line in piece.splitlines() if line.strip() and not line.strip().startswith("--")]
+        if code:
+            statements.append(piece)
+    return statements
+
+
+def run_sql_file(revision, relative_path, split=True):
+    """Execute a revision's snapshot of a file under sql/; DDL files are split on ';', function files run whole"""
+    with open(os.path.join(SNAPSHOT_DIR, revision, relative_path), "r") as f:
+        text = f.read()
+    for statement in sql_statements(text, split):
+        op.execute(statement)
+
+
+def _drop_invalid_index(name, schema):
+    """Drop a leftover INVALID index from a failed concurrent build"""
+    if context.is_offline_mode():
+        # No database to ask; the emitted script checks for itself
+        op.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE c.relname = '{name}' AND n.nspname = '{schema}' AND NOT i.indisvalid
+                ) THEN
+                    EXECUTE 'DROP INDEX {schema}.{name}';
+                END IF;
+            END $$
+            """
+        )
+        return
+    invalid = op.get_bind().exec_driver_sql(
+        """
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relname = %s AND n.nspname = %s AND NOT i.indisvalid
+        """,
+        (name, schema),
+    ).first()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema}.{name}")
+
+
+def create_index_concurrently(name, table, definition, where=None):
+    """Build an index without blocking writes; must be called inside autocommit_block()
+
+    A build that runs into lock_timeout leaves an INVALID index behind, which
+    IF NOT EXISTS would then silently accept. The leftover is dropped and the
+    build retried up to MIGRATION_INDEX_ATTEMPTS times; if it still fails,
+    the leftover is dropped again before the error is raised, so rerunning
+    the upgrade starts clean.
+    """
+    schema, _, _ = table.rpartition(".")
+    schema = schema or "public"
+    predicate = f" WHERE {where}" if where else ""
+    statement = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}{predicate}"
+    for attempt in range(1, INDEX_BUILD_ATTEMPTS + 1):
+        _drop_invalid_index(name, schema)
+        try:
+            op.execute(statement)
+            return
+        except OperationalError as e:
+            lock_timeout = getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+            if not lock_timeout or attempt == INDEX_BUILD_ATTEMPTS:
+                _drop_invalid_index(name, schema)
+                raise
+            time.sleep(INDEX_RETRY_DELAY * attempt)
+
+
+def drop_index_concurrently(name, schema):
+    """Drop an index without blocking writes; must be called inside autocommit_block()"""
+    op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema}.{name}")
@@ -0,0 +1,37 @@
+-- Create trigger function: bump_change_counter
+-- Statement-level, so a bulk insert of 10k rows costs one counter update.
+-- The notification is delivered on commit (and de-duplicated per transaction);
+-- app/services/cache_listener.py relays it to the shared cache.
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS TRIGGER AS $$
+DECLARE
+    v_table TEXT := TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME;
+BEGIN
+    INSERT INTO admin.table_change_counter (table_name, change_count, changed_at)
+    VALUES (v_table, 1, clock_timestamp())
+    ON CONFLICT (table_name) DO UPDATE
+    SET change_count = admin.table_change_counter.change_count + 1,
+        changed_at = EXCLUDED.changed_at;
+    PERFORM pg_notify('table_changed', v_table);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Attach the counter to every table the read API serves (not the
+-- high-volume append tables such as feed.feed_run_log)
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY[
+        'admin.code_type', 'admin.system_codes', 'feed.feed', 'feed.feed_environment',
+        'feed.feed_dependency', 'feed.feed_details', 'feed.feed_run'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_change_counter ON %s', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_change_counter AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()', v_table
+        );
+        INSERT INTO admin.table_change_counter (table_name) VALUES (v_table)
+        ON CONFLICT (table_name) DO NOTHING;
+    END LOOP;
+END $$;
@@ -0,0 +1,19 @@
+-- Append-only change log for admin edits, written by the audit triggers in
+-- sql/functions/7_audit_log.sql. operation is I/U/D and diff holds the new row
+-- for inserts, the old row for deletes and {"column": [old, new]} for only
+-- the changed columns of updates.
+CREATE TABLE IF NOT EXISTS admin.audit_log (
+    audit_id BIGSERIAL PRIMARY KEY,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    table_name VARCHAR(100) NOT NULL,
+    operation CHAR(1) NOT NULL,
+    row_key VARCHAR(100) NOT NULL,
+    changed_by VARCHAR(100) NOT NULL DEFAULT COALESCE(NULLIF(current_setting('app.user', true), ''), session_user),
+    diff JSONB NOT NULL,
+    CHECK (operation IN ('I', 'U', 'D'))
+);
+
+-- Rows arrive in time order, so a BRIN index covers time-range scans at a tiny fraction of a btree's size
+CREATE INDEX IF NOT EXISTS idx_audit_log_changed_at ON admin.audit_log USING BRIN (changed_at);
+-- History of one record
+CREATE INDEX IF NOT EXISTS idx_audit_log_row ON admin.audit_log(table_name, row_key, audit_id);
@@ -0,0 +1,101 @@
+-- Create trigger function: set_updated_at
+-- Keeps updated_at current on real changes (no-op updates leave it alone)
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW IS DISTINCT FROM OLD THEN
+        NEW.updated_at := CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create trigger function: audit_row_changes
+-- Statement-level with transition tables, so one INSERT ... SELECT records
+-- every row a statement touched. TG_ARGV[0] is the table's key column.
+CREATE OR REPLACE FUNCTION audit_row_changes() RETURNS TRIGGER AS $$
+DECLARE
+    v_table TEXT := TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME;
+    v_key TEXT := TG_ARGV[0];
+    -- Maintained by triggers/search indexing; not worth recording
+    v_ignored TEXT[] := ARRAY['updated_at', 'search_vector'];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO admin.audit_log (table_name, operation, row_key, diff)
+        SELECT v_table, 'I', to_jsonb(n) ->> v_key, to_jsonb(n) - v_ignored
+        FROM new_rows n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO admin.audit_log (table_name, operation, row_key, diff)
+        SELECT v_table, 'D', to_jsonb(o) ->> v_key, to_jsonb(o) - v_ignored
+        FROM old_rows o;
+    ELSE
+        INSERT INTO admin.audit_log (table_name, operation, row_key, diff)
+        SELECT v_table, 'U', o.row_key, d.diff
+        FROM (SELECT to_jsonb(x) AS j, to_jsonb(x) ->> v_key AS row_key FROM old_rows x) o
+        JOIN (SELECT to_jsonb(x) AS j, to_jsonb(x) ->> v_key AS row_key FROM new_rows x) n
+          ON n.row_key = o.row_key
+        CROSS JOIN LATERAL (
+            SELECT jsonb_object_agg(nv.key, jsonb_build_array(ov.value, nv.value)) AS diff
+            FROM jsonb_each(n.j) nv
+            JOIN jsonb_each(o.j) ov ON ov.key = nv.key
+            WHERE nv.value IS DISTINCT FROM ov.value
+              AND nv.key <> ALL (v_ignored)
+        ) d
+        WHERE d.diff IS NOT NULL;  -- no-op updates are not recorded
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create trigger function: reject_audit_change
+CREATE OR REPLACE FUNCTION reject_audit_change() RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'admin.audit_log is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    v_audited TEXT[][] := ARRAY[
+        ['admin.code_type', 'code_type_cd'],
+        ['admin.system_codes', 'code_id'],
+        ['feed.feed', 'feed_id'],
+        ['feed.feed_environment', 'environment_id'],
+        ['feed.feed_details', 'detail_id']
+    ];
+    v_table TEXT;
+    i INTEGER;
+BEGIN
+    -- Transition tables need one trigger per event
+    FOR i IN 1 .. array_length(v_audited, 1) LOOP
+        v_table := v_audited[i][1];
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_insert ON %s', v_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_update ON %s', v_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_delete ON %s', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_audit_insert AFTER INSERT ON %s REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit_row_changes(%L)', v_table, v_audited[i][2]
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trg_audit_update AFTER UPDATE ON %s '
+            'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit_row_changes(%L)', v_table, v_audited[i][2]
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trg_audit_delete AFTER DELETE ON %s REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit_row_changes(%L)', v_table, v_audited[i][2]
+        );
+    END LOOP;
+
+    -- updated_at on the tables that have the column
+    FOREACH v_table IN ARRAY ARRAY['admin.code_type', 'admin.system_codes', 'feed.feed', 'feed.feed_sla'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_set_updated_at ON %s', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_set_updated_at BEFORE UPDATE ON %s '
+            'FOR EACH ROW EXECUTE FUNCTION set_updated_at()', v_table
+        );
+    END LOOP;
+
+    DROP TRIGGER IF EXISTS trg_audit_append_only ON admin.audit_log;
+    CREATE TRIGGER trg_audit_append_only BEFORE UPDATE OR DELETE ON admin.audit_log
+        FOR EACH STATEMENT EXECUTE FUNCTION reject_audit_change();
+END $$;
@@ -0,0 +1,67 @@
+-- Create trigger function: capture_run_events
+-- Statement-level with transition tables: start_feed_run, complete_feed_run,
+-- the embedded executor and direct SQL all produce events in their own
+-- transaction, with one INSERT ... SELECT per statement.
+CREATE OR REPLACE FUNCTION capture_run_events() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'feed_run' AND TG_OP = 'INSERT' THEN
+        INSERT INTO feed.run_event_outbox (event_type, feed_run_id, payload)
+        SELECT 'RUN_STARTED', n.feed_run_id,
+               jsonb_build_object(
+                   'feed_id', n.feed_id, 'feed_tag', f.feed_tag,
+                   'environment', lower(sc.common_cd), 'status_cd', n.status_cd,
+                   'start_dt', n.start_dt
+               )
+        FROM new_rows n
+        JOIN feed.feed f ON f.feed_id = n.feed_id
+        JOIN feed.feed_environment fe ON fe.environment_id = n.environment_id
+        JOIN admin.system_codes sc ON sc.code_id = fe.env_system_cd
+        ORDER BY n.feed_run_id;
+
+    ELSIF TG_TABLE_NAME = 'feed_run' THEN
+        -- Only status changes are events (not description or timestamp edits)
+        INSERT INTO feed.run_event_outbox (event_type, feed_run_id, payload)
+        SELECT CASE WHEN n.end_dt IS NOT NULL THEN 'RUN_FINISHED' ELSE 'RUN_STATUS' END,
+               n.feed_run_id,
+               jsonb_build_object(
+                   'feed_id', n.feed_id, 'feed_tag', f.feed_tag,
+                   'previous_status_cd', o.status_cd, 'status_cd', n.status_cd,
+                   'start_dt', n.start_dt, 'end_dt', n.end_dt,
+                   'duration_seconds', EXTRACT(EPOCH FROM (n.end_dt - n.start_dt))
+               )
+        FROM new_rows n
+        JOIN old_rows o ON o.feed_run_id = n.feed_run_id
+        JOIN feed.feed f ON f.feed_id = n.feed_id
+        WHERE n.status_cd IS DISTINCT FROM o.status_cd
+        ORDER BY n.feed_run_id;
+
+    ELSE
+        -- feed_run_details: compact events, long detail_data is truncated
+        INSERT INTO feed.run_event_outbox (event_type, feed_run_id, payload)
+        SELECT 'RUN_DETAIL', n.feed_run_id,
+               jsonb_build_object(
+                   'detail_id', n.detail_id, 'parent_detail_id', n.parent_detail_id,
+                   'detail_desc', n.detail_desc, 'detail_data', left(n.detail_data, 2000),
+                   'truncated', length(n.detail_data) > 2000
+               )
+        FROM new_rows n
+        ORDER BY n.detail_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_run_events_insert ON feed.feed_run;
+CREATE TRIGGER trg_run_events_insert AFTER INSERT ON feed.feed_run
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION capture_run_events();
+
+DROP TRIGGER IF EXISTS trg_run_events_update ON feed.feed_run;
+CREATE TRIGGER trg_run_events_update AFTER UPDATE ON feed.feed_run
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION capture_run_events();
+
+DROP TRIGGER IF EXISTS trg_run_events_detail ON feed.feed_run_details;
+CREATE TRIGGER trg_run_events_detail AFTER INSERT ON feed.feed_run_details
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION capture_run_events();
@@ -0,0 +1,14 @@
+-- Latest progress and liveness per running feed run, overwritten in place by
+-- the executor and PUT /runs/{id}/heartbeat. UNLOGGED because it is volatile
+-- state (it is emptied after a crash, and the next heartbeat repopulates it).
+-- Only the primary key is indexed and fillfactor leaves room on each page, so
+-- every heartbeat is a HOT update that touches no index.
+-- complete_feed_run deletes the row when the run finishes.
+CREATE UNLOGGED TABLE IF NOT EXISTS feed.feed_run_heartbeat (
+    feed_run_id INTEGER PRIMARY KEY,
+    progress_pct NUMERIC(5,2) CHECK (progress_pct BETWEEN 0 AND 100),
+    records_processed BIGINT,
+    records_total BIGINT,
+    message VARCHAR(200),
+    heartbeat_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) WITH (fillfactor = 50);
@@ -0,0 +1,149 @@
+-- Create stored procedure: purge_feeds
+-- Deletes feeds and everything that references them in one transaction using
+-- set-based statements, optionally copying the rows into the archive schema first.
+CREATE OR REPLACE FUNCTION purge_feeds(
+    p_feed_ids INTEGER[],
+    p_archive BOOLEAN DEFAULT FALSE
+) RETURNS INTEGER AS $$
+DECLARE
+    v_deleted_feeds INTEGER;
+BEGIN
+    IF p_feed_ids IS NULL OR cardinality(p_feed_ids) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    IF p_archive THEN
+        INSERT INTO archive.feed (
+            feed_id, feed_type_cd, feed_type_cd_type, feed_status_id, feed_name,
+            feed_description, feed_tag, is_active, created_at, updated_at
+        )
+        SELECT feed_id, feed_type_cd, feed_type_cd_type, feed_status_id, feed_name,
+               feed_description, feed_tag, is_active, created_at, updated_at
+        FROM feed.feed
+        WHERE feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_environment (environment_id, feed_id, env_system_cd, created_at)
+        SELECT environment_id, feed_id, env_system_cd, created_at
+        FROM feed.feed_environment
+        WHERE feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_dependency (feed_id, depends_on_feed_id, created_at)
+        SELECT feed_id, depends_on_feed_id, created_at
+        FROM feed.feed_dependency
+        WHERE feed_id = ANY(p_feed_ids) OR depends_on_feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_details (
+            detail_id, parent_detail_id, feed_id, environment_id, detail_type_cd,
+            detail_type_cd_type, detail_desc, detail_data, created_at
+        )
+        SELECT detail_id, parent_detail_id, feed_id, environment_id, detail_type_cd,
+               detail_type_cd_type, detail_desc, detail_data, created_at
+        FROM feed.feed_details
+        WHERE feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_run (
+            feed_run_id, feed_id, environment_id, start_dt, end_dt, description,
+            status_cd, status_cd_type, created_at, updated_at
+        )
+        SELECT feed_run_id, feed_id, environment_id, start_dt, end_dt, description,
+               status_cd, status_cd_type, created_at, updated_at
+        FROM feed.feed_run
+        WHERE feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_run_details (
+            detail_id, parent_detail_id, feed_run_id, detail_desc, detail_data, created_at
+        )
+        SELECT frd.detail_id, frd.parent_detail_id, frd.feed_run_id, frd.detail_desc,
+               frd.detail_data, frd.created_at
+        FROM feed.feed_run_details frd
+        JOIN feed.feed_run fr ON frd.feed_run_id = fr.feed_run_id
+        WHERE fr.feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_run_log (feed_run_id, seq, stream, chunk, created_at)
+        SELECT frl.feed_run_id, frl.seq, frl.stream, frl.chunk, frl.created_at
+        FROM feed.feed_run_log frl
+        JOIN feed.feed_run fr ON frl.feed_run_id = fr.feed_run_id
+        WHERE fr.feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_sla (
+            sla_id, feed_id, environment_id, expected_start_cron, start_grace_minutes,
+            max_duration_minutes, is_active, created_at, updated_at
+        )
+        SELECT sla_id, feed_id, environment_id, expected_start_cron, start_grace_minutes,
+               max_duration_minutes, is_active, created_at, updated_at
+        FROM feed.feed_sla
+        WHERE feed_id = ANY(p_feed_ids);
+
+        INSERT INTO archive.feed_sla_breach (
+            breach_id, sla_id, expected_start, breach_type, feed_run_id, detected_at, resolved_at
+        )
+        SELECT b.breach_id, b.sla_id, b.expected_start, b.breach_type, b.feed_run_id,
+               b.detected_at, b.resolved_at
+        FROM feed.feed_sla_breach b
+        JOIN feed.feed_sla sla ON b.sla_id = sla.sla_id
+        WHERE sla.feed_id = ANY(p_feed_ids);
+    END IF;
+
+    -- Children first; each statement removes a whole level for every feed at once
+    DELETE FROM feed.feed_run_details frd
+    USING feed.feed_run fr
+    WHERE frd.feed_run_id = fr.feed_run_id
+    AND fr.feed_id = ANY(p_feed_ids);
+
+    DELETE FROM feed.feed_run_log frl
+    USING feed.feed_run fr
+    WHERE frl.feed_run_id = fr.feed_run_id
+    AND fr.feed_id = ANY(p_feed_ids);
+
+    DELETE FROM feed.feed_run_heartbeat h
+    USING feed.feed_run fr
+    WHERE h.feed_run_id = fr.feed_run_id
+    AND fr.feed_id = ANY(p_feed_ids);
+
+    DELETE FROM feed.feed_sla_breach b
+    USING feed.feed_sla sla
+    WHERE b.sla_id = sla.sla_id
+    AND sla.feed_id = ANY(p_feed_ids);
+
+    DELETE FROM feed.feed_sla WHERE feed_id = ANY(p_feed_ids);
+    DELETE FROM feed.feed_run WHERE feed_id = ANY(p_feed_ids);
+    DELETE FROM feed.feed_details WHERE feed_id = ANY(p_feed_ids);
+    DELETE FROM feed.feed_dependency
+    WHERE feed_id = ANY(p_feed_ids) OR depends_on_feed_id = ANY(p_feed_ids);
+    DELETE FROM feed.feed_environment WHERE feed_id = ANY(p_feed_ids);
+    DELETE FROM feed.feed WHERE feed_id = ANY(p_feed_ids);
+
+    GET DIAGNOSTICS v_deleted_feeds = ROW_COUNT;
+
+    RAISE NOTICE 'Purged % feed(s) (archive: %)', v_deleted_feeds, p_archive;
+
+    RETURN v_deleted_feeds;
+
+EXCEPTION
+    WHEN OTHERS THEN
+        RAISE EXCEPTION 'Error in purge_feeds: %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create stored procedure: delete_feed
+CREATE OR REPLACE FUNCTION delete_feed(
+    p_feed_id INTEGER,
+    p_archive BOOLEAN DEFAULT FALSE
+) RETURNS BOOLEAN AS $$
+BEGIN
+    IF NOT EXISTS(SELECT 1 FROM feed.feed WHERE feed_id = p_feed_id) THEN
+        RAISE EXCEPTION 'Feed ID % not found', p_feed_id;
+    END IF;
+
+    RETURN purge_feeds(ARRAY[p_feed_id], p_archive) = 1;
+
+EXCEPTION
+    WHEN OTHERS THEN
+        RAISE EXCEPTION 'Error in delete_feed: %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Example usage:
+-- SELECT delete_feed(42);                      -- delete feed 42 and its history
+-- SELECT delete_feed(42, TRUE);                -- archive, then delete
+-- SELECT purge_feeds(ARRAY[42, 43, 44], TRUE); -- bulk archive + delete
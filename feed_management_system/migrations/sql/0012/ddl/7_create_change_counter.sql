@@ -0,0 +1,12 @@
+-- Per-table change counters, bumped once per writing statement by the triggers
+-- in sql/functions/6_change_counter.sql. Used for HTTP ETag / Last-Modified.
+CREATE TABLE IF NOT EXISTS admin.table_change_counter (
+    table_name VARCHAR(100) PRIMARY KEY,
+    change_count BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- feed.feed_run is written by every run start and finish, so it has no counter
+-- row (that row would serialize run writes). Its statements bump this sequence,
+-- which takes no row lock and never waits.
+CREATE SEQUENCE IF NOT EXISTS admin.feed_run_version_seq;
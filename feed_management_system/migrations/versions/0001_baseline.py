@@ -0,0 +1,37 @@
+"""Baseline schema: the original tables and run functions
+
+Every statement is idempotent (IF NOT EXISTS / CREATE OR REPLACE), so this
+revision can run against a database created by the Streamlit setup page as
+well as an empty one. Later schema objects have their own revisions, and
+indexes on the run history tables are built concurrently in 0001b.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+DDL_FILES = [
+    "ddl/1_create_tables.sql",
+]
+FUNCTION_FILES = [
+    "functions/3_start_feed_run.sql",
+    "functions/4_complete_feed_run.sql",
+]
+
+
+def upgrade():
+    for path in DDL_FILES:
+        run_sql_file(revision, path)
+    for path in FUNCTION_FILES:
+        run_sql_file(revision, path, split=False)
+
+
+def downgrade():
+    # Dropping the baseline would drop every table; use sql/clear_database instead
+    pass
@@ -0,0 +1,26 @@
+"""Feed dependencies, feed search columns, archive tables and purge_feeds
+
+These create new tables or touch only the small feed definition tables, so
+they run in one transaction.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0001a"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/2_create_feed_dependency.sql")
+    run_sql_file(revision, "ddl/3_create_search_index.sql")
+    run_sql_file(revision, "ddl/4_create_archive_tables.sql")
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,44 @@
+"""Export watermark and run detail search indexes, built concurrently
+
+The same indexes as sql/ddl/12_create_run_history_indexes.sql.
+
+Revision ID: 0001b
+Revises: 0001a
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+revision = "0001b"
+down_revision = "0001a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # Incremental exports read past a (timestamp, id) watermark
+        create_index_concurrently(
+            "idx_feed_run_updated_at",
+            "feed.feed_run",
+            "(updated_at, feed_run_id)",
+        )
+        create_index_concurrently(
+            "idx_feed_run_details_created_at",
+            "feed.feed_run_details",
+            "(created_at, detail_id)",
+        )
+        # Full-text search over run details (see feed.run_detail_search_vector)
+        create_index_concurrently(
+            "idx_feed_run_details_search_expr",
+            "feed.feed_run_details",
+            "USING GIN (feed.run_detail_search_vector(detail_desc, detail_data))",
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        drop_index_concurrently("idx_feed_run_details_search_expr", "feed")
+        drop_index_concurrently("idx_feed_run_details_created_at", "feed")
+        drop_index_concurrently("idx_feed_run_updated_at", "feed")
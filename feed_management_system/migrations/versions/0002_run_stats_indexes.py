@@ -0,0 +1,44 @@
+"""Performance indexes on feed_run and feed_run_details, built concurrently
+
+Revision ID: 0002
+Revises: 0001b
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+revision = "0002"
+down_revision = "0001b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # Latest runs per feed/environment (dashboards, SLA checks) without heap visits
+        create_index_concurrently(
+            "idx_feed_run_run_stats",
+            "feed.feed_run",
+            "(feed_id, environment_id, start_dt DESC) INCLUDE (end_dt, status_cd)",
+        )
+        # Small partial index for "what is running now" lookups
+        create_index_concurrently(
+            "idx_feed_run_active",
+            "feed.feed_run",
+            "(environment_id, start_dt)",
+            where="status_cd IN ('PENDING', 'RUNNING')",
+        )
+        # Run details of one run in insertion order (detail viewer, log tail)
+        create_index_concurrently(
+            "idx_feed_run_details_run_created",
+            "feed.feed_run_details",
+            "(feed_run_id, created_at, detail_id)",
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        drop_index_concurrently("idx_feed_run_details_run_created", "feed")
+        drop_index_concurrently("idx_feed_run_active", "feed")
+        drop_index_concurrently("idx_feed_run_run_stats", "feed")
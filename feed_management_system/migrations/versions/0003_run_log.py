@@ -0,0 +1,21 @@
+"""Run log table and purge_feeds support for it
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/5_create_run_log.sql")
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
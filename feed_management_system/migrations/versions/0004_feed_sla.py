@@ -0,0 +1,21 @@
+"""Feed SLA definitions and breaches
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/6_create_feed_sla.sql")
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
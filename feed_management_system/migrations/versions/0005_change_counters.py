@@ -0,0 +1,21 @@
+"""Per-table change counters for HTTP caching
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/7_create_change_counter.sql")
+    run_sql_file(revision, "functions/6_change_counter.sql", split=False)
+
+
+def downgrade():
+    pass
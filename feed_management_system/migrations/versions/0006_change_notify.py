@@ -0,0 +1,21 @@
+"""Notify table_changed from the change-counter trigger for shared cache invalidation
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE OR REPLACE plus DROP/CREATE TRIGGER, so re-running the file is safe
+    run_sql_file(revision, "functions/6_change_counter.sql", split=False)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,21 @@
+"""Audit log for admin edits and updated_at maintenance
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/8_create_audit_log.sql")
+    run_sql_file(revision, "functions/7_audit_log.sql", split=False)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,21 @@
+"""Outbox and consumer offsets for the feed run event stream
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/9_create_run_event_outbox.sql")
+    run_sql_file(revision, "functions/8_run_events.sql", split=False)
+
+
+def downgrade():
+    pass
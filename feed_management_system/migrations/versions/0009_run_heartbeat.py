@@ -0,0 +1,22 @@
+"""Run heartbeat table; runs drop their heartbeat when they complete or are purged
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/10_create_run_heartbeat.sql")
+    run_sql_file(revision, "functions/4_complete_feed_run.sql", split=False)
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,21 @@
+"""Per-run numeric metrics; purge_feeds archives and deletes them
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/11_create_run_metrics.sql")
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
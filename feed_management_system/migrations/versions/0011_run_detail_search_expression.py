@@ -0,0 +1,35 @@
+"""Search run details through an expression index instead of a stored column
+
+The stored search_vector column on feed.feed_run_details rewrote the whole
+table when it was added. The replacement GIN index is built concurrently,
+then the old column (and its index) is dropped. Dropping a column only
+changes the catalog, so that step is brief and bounded by lock_timeout.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run_sql_file
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/3_create_search_index.sql")
+    with op.get_context().autocommit_block():
+        create_index_concurrently(
+            "idx_feed_run_details_search_expr",
+            "feed.feed_run_details",
+            "USING GIN (feed.run_detail_search_vector(detail_desc, detail_data))",
+        )
+        drop_index_concurrently("idx_feed_run_details_search", "feed")
+    op.execute("ALTER TABLE feed.feed_run_details DROP COLUMN IF EXISTS search_vector")
+
+
+def downgrade():
+    pass
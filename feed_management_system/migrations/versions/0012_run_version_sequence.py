@@ -0,0 +1,28 @@
+"""Version feed.feed_run through a sequence instead of a change-counter row
+
+Every run start and finish bumped the same counter row and queued a
+table_changed notification, so concurrent run writes serialized on that row
+lock until commit. The run table now advances admin.feed_run_version_seq,
+which never blocks, and sends no notification. purge_feeds locks the
+remaining counter rows in name order to avoid deadlocks with start_feed_run.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "ddl/7_create_change_counter.sql")
+    run_sql_file(revision, "functions/6_change_counter.sql", split=False)
+    run_sql_file(revision, "functions/5_delete_feed.sql", split=False)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,47 @@
+"""Version feed.feed_run through transactional counter slots
+
+The admin.feed_run_version_seq sequence moved before the writing
+transaction committed, so a poll in between could cache the new ETag with
+the old rows. Run statements now bump one of 16 counter slots inside the
+transaction, and the version is their sum. The SQL is inlined so the
+revision does not change with the files under sql/.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS admin.feed_run_version (
+            slot SMALLINT PRIMARY KEY,
+            change_count BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    op.execute("""
+        INSERT INTO admin.feed_run_version (slot)
+        SELECT generate_series(0, 15)
+        ON CONFLICT (slot) DO NOTHING
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_run_version() RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO admin.feed_run_version AS v (slot, change_count)
+            VALUES (pg_backend_pid() % 16, 1)
+            ON CONFLICT (slot) DO UPDATE SET change_count = v.change_count + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP SEQUENCE IF EXISTS admin.feed_run_version_seq")
+
+
+def downgrade():
+    pass
@@ -0,0 +1,20 @@
+"""complete_feed_run only finishes RUNNING runs and returns whether it did
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+"""
+from migrations.helpers import run_sql_file
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_sql_file(revision, "functions/4_complete_feed_run.sql", split=False)
+
+
+def downgrade():
+    pass
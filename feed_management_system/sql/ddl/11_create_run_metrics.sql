@@ -0,0 +1,44 @@
+-- Numeric metrics per feed run (rows read/written, bytes, errors, custom counters).
+-- Metric names are stored once in feed.run_metric_name and referenced by a
+-- SMALLINT id. Columns run widest first, so a metric row packs into
+-- 22 bytes of data with no alignment padding.
+CREATE TABLE IF NOT EXISTS feed.run_metric_name (
+    metric_id SMALLSERIAL PRIMARY KEY,
+    metric_name VARCHAR(63) NOT NULL UNIQUE,
+    unit VARCHAR(20),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO feed.run_metric_name (metric_name, unit) VALUES
+    ('rows_read', 'rows'),
+    ('rows_written', 'rows'),
+    ('bytes_read', 'bytes'),
+    ('bytes_written', 'bytes'),
+    ('errors', 'count')
+ON CONFLICT (metric_name) DO NOTHING;
+
+-- One value per run and metric. A resubmitted metric overwrites the old value,
+-- so clients can report running totals and retry batches safely.
+CREATE TABLE IF NOT EXISTS feed.feed_run_metric (
+    value DOUBLE PRECISION NOT NULL,
+    recorded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    feed_run_id INTEGER NOT NULL,
+    metric_id SMALLINT NOT NULL,
+    PRIMARY KEY (feed_run_id, metric_id),
+    FOREIGN KEY (feed_run_id) REFERENCES feed.feed_run(feed_run_id),
+    FOREIGN KEY (metric_id) REFERENCES feed.run_metric_name(metric_id)
+);
+
+-- Throughput rollups scan one metric across many runs
+CREATE INDEX IF NOT EXISTS idx_feed_run_metric_metric
+ON feed.feed_run_metric(metric_id, feed_run_id) INCLUDE (value);
+
+-- Archived copy used by purge_feeds(..., TRUE)
+CREATE TABLE IF NOT EXISTS archive.feed_run_metric (
+    feed_run_id INTEGER NOT NULL,
+    metric_id SMALLINT NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    recorded_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (feed_run_id, metric_id)
+);
@@ -0,0 +1,19 @@
+-- Indexes on the large run history tables, for databases created from the setup
+-- page. Migrations never run this file. They build the same indexes with
+-- CREATE INDEX CONCURRENTLY so that job writes keep flowing on live databases.
+
+-- Incremental exports read past a (timestamp, id) watermark
+CREATE INDEX IF NOT EXISTS idx_feed_run_updated_at ON feed.feed_run(updated_at, feed_run_id);
+CREATE INDEX IF NOT EXISTS idx_feed_run_details_created_at ON feed.feed_run_details(created_at, detail_id);
+
+-- Small partial index for "what is running now" lookups
+CREATE INDEX IF NOT EXISTS idx_feed_run_active ON feed.feed_run(environment_id, start_dt)
+WHERE status_cd IN ('PENDING', 'RUNNING');
+
+-- One run's details in insertion order (detail viewer, GET /runs/{id}/details pages)
+CREATE INDEX IF NOT EXISTS idx_feed_run_details_run_created
+ON feed.feed_run_details(feed_run_id, created_at, detail_id);
+
+-- Full-text search over run details (see feed.run_detail_search_vector)
+CREATE INDEX IF NOT EXISTS idx_feed_run_details_search_expr ON feed.feed_run_details
+USING GIN (feed.run_detail_search_vector(detail_desc, detail_data));
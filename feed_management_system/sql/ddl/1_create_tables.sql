@@ -101,6 +101,7 @@ CREATE TABLE IF NOT EXISTS feed.feed_details (
 );
 
 -- Create indexes
+CREATE INDEX IF NOT EXISTS idx_feed_tag ON feed.feed(feed_tag);
 CREATE INDEX IF NOT EXISTS idx_feed_run_feed_id ON feed.feed_run(feed_id);
 CREATE INDEX IF NOT EXISTS idx_feed_run_status ON feed.feed_run(status_cd);
 CREATE INDEX IF NOT EXISTS idx_feed_run_start_dt ON feed.feed_run(start_dt);
@@ -0,0 +1,14 @@
+-- Create feed_dependency table in feed schema
+-- A row means feed_id may only start once depends_on_feed_id has completed
+CREATE TABLE IF NOT EXISTS feed.feed_dependency (
+    feed_id INTEGER NOT NULL,
+    depends_on_feed_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (feed_id, depends_on_feed_id),
+    FOREIGN KEY (feed_id) REFERENCES feed.feed(feed_id),
+    FOREIGN KEY (depends_on_feed_id) REFERENCES feed.feed(feed_id),
+    CHECK (feed_id <> depends_on_feed_id)
+);
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_feed_dependency_upstream ON feed.feed_dependency(depends_on_feed_id);
@@ -0,0 +1,33 @@
+-- Full-text search over feeds, feed details and run details
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Feed definitions: names and tags weigh more than descriptions
+ALTER TABLE feed.feed ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(feed_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(feed_tag, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(feed_description, '')), 'B')
+    ) STORED;
+
+-- Feed details (commands, links, snippets). Very large values are truncated for indexing
+ALTER TABLE feed.feed_details ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(detail_desc, '')), 'A') ||
+        setweight(to_tsvector('simple', left(coalesce(detail_data, ''), 100000)), 'B')
+    ) STORED;
+
+-- Run details (errors, CloudWatch / ECS links, output chunks). feed_run_details is
+-- the largest table, so it gets no stored column (adding one rewrites the table).
+-- It is searched through an expression index on this function instead, see
+-- sql/ddl/12_create_run_history_indexes.sql. Queries must call the same function.
+CREATE OR REPLACE FUNCTION feed.run_detail_search_vector(p_desc TEXT, p_data TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', left(coalesce(p_desc, ''), 10000)), 'A') ||
+           setweight(to_tsvector('simple', left(coalesce(p_data, ''), 100000)), 'B')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_feed_search ON feed.feed USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_feed_details_search ON feed.feed_details USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_feed_name_trgm ON feed.feed USING GIN (feed_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_feed_tag_trgm ON feed.feed USING GIN (feed_tag gin_trgm_ops);
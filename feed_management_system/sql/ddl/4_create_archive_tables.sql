@@ -0,0 +1,72 @@
+-- Archive tables hold feeds (and their full history) removed via delete_feed / purge_feeds
+CREATE SCHEMA IF NOT EXISTS archive;
+
+CREATE TABLE IF NOT EXISTS archive.feed (
+    feed_id INTEGER PRIMARY KEY,
+    feed_type_cd VARCHAR(50) NOT NULL,
+    feed_type_cd_type VARCHAR(50) NOT NULL,
+    feed_status_id INTEGER,
+    feed_name VARCHAR(255) NOT NULL,
+    feed_description TEXT,
+    feed_tag VARCHAR(255),
+    is_active BOOLEAN,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_environment (
+    environment_id INTEGER PRIMARY KEY,
+    feed_id INTEGER NOT NULL,
+    env_system_cd INTEGER NOT NULL,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_dependency (
+    feed_id INTEGER NOT NULL,
+    depends_on_feed_id INTEGER NOT NULL,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_details (
+    detail_id INTEGER PRIMARY KEY,
+    parent_detail_id INTEGER,
+    feed_id INTEGER NOT NULL,
+    environment_id INTEGER NOT NULL,
+    detail_type_cd VARCHAR(50) NOT NULL,
+    detail_type_cd_type VARCHAR(50) NOT NULL,
+    detail_desc VARCHAR(500) NOT NULL,
+    detail_data TEXT,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_run (
+    feed_run_id INTEGER PRIMARY KEY,
+    feed_id INTEGER NOT NULL,
+    environment_id INTEGER NOT NULL,
+    start_dt TIMESTAMP NOT NULL,
+    end_dt TIMESTAMP,
+    description TEXT,
+    status_cd VARCHAR(50) NOT NULL,
+    status_cd_type VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_run_details (
+    detail_id INTEGER PRIMARY KEY,
+    parent_detail_id INTEGER,
+    feed_run_id INTEGER NOT NULL,
+    detail_desc TEXT NOT NULL,
+    detail_data TEXT NOT NULL,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_archive_feed_run_feed_id ON archive.feed_run(feed_id);
+CREATE INDEX IF NOT EXISTS idx_archive_feed_run_details_feed_run_id ON archive.feed_run_details(feed_run_id);
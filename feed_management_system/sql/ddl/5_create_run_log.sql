@@ -0,0 +1,21 @@
+-- Append-only run log: a job's output as ordered chunks per feed run
+CREATE TABLE IF NOT EXISTS feed.feed_run_log (
+    feed_run_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    stream VARCHAR(10) NOT NULL DEFAULT 'STDOUT',
+    chunk TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (feed_run_id, seq),
+    FOREIGN KEY (feed_run_id) REFERENCES feed.feed_run(feed_run_id)
+);
+
+-- Archived copy used by purge_feeds(..., TRUE)
+CREATE TABLE IF NOT EXISTS archive.feed_run_log (
+    feed_run_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    stream VARCHAR(10) NOT NULL,
+    chunk TEXT NOT NULL,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (feed_run_id, seq)
+);
@@ -0,0 +1,59 @@
+-- SLA definitions: when a feed is expected to start in an environment and how long it may take
+CREATE TABLE IF NOT EXISTS feed.feed_sla (
+    sla_id SERIAL PRIMARY KEY,
+    feed_id INTEGER NOT NULL,
+    environment_id INTEGER NOT NULL,
+    expected_start_cron VARCHAR(100) NOT NULL,       -- minute hour day-of-month month day-of-week
+    start_grace_minutes INTEGER NOT NULL DEFAULT 15,  -- how late the run may start
+    max_duration_minutes INTEGER NOT NULL,            -- must finish by expected start + this
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (feed_id, environment_id),
+    CHECK (start_grace_minutes >= 0 AND max_duration_minutes > 0),
+    FOREIGN KEY (feed_id) REFERENCES feed.feed(feed_id),
+    FOREIGN KEY (environment_id) REFERENCES feed.feed_environment(environment_id)
+);
+
+-- One row per SLA, scheduled start and breach type, open while resolved_at IS NULL
+CREATE TABLE IF NOT EXISTS feed.feed_sla_breach (
+    breach_id SERIAL PRIMARY KEY,
+    sla_id INTEGER NOT NULL,
+    expected_start TIMESTAMP NOT NULL,
+    breach_type VARCHAR(20) NOT NULL,                -- NOT_STARTED, OVERRUN, LATE, FAILED
+    feed_run_id INTEGER,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    resolved_at TIMESTAMP,
+    UNIQUE (sla_id, expected_start, breach_type),
+    FOREIGN KEY (sla_id) REFERENCES feed.feed_sla(sla_id)
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_sla (
+    sla_id INTEGER PRIMARY KEY,
+    feed_id INTEGER NOT NULL,
+    environment_id INTEGER NOT NULL,
+    expected_start_cron VARCHAR(100) NOT NULL,
+    start_grace_minutes INTEGER NOT NULL,
+    max_duration_minutes INTEGER NOT NULL,
+    is_active BOOLEAN,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.feed_sla_breach (
+    breach_id INTEGER PRIMARY KEY,
+    sla_id INTEGER NOT NULL,
+    expected_start TIMESTAMP NOT NULL,
+    breach_type VARCHAR(20) NOT NULL,
+    feed_run_id INTEGER,
+    detected_at TIMESTAMP,
+    resolved_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_feed_sla_breach_open ON feed.feed_sla_breach(detected_at) WHERE resolved_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_feed_sla_breach_detected ON feed.feed_sla_breach(detected_at);
+-- Latest run per feed/environment for the SLA evaluator (built concurrently by migration 0002 on live databases)
+CREATE INDEX IF NOT EXISTS idx_feed_run_run_stats ON feed.feed_run(feed_id, environment_id, start_dt DESC) INCLUDE (end_dt, status_cd);
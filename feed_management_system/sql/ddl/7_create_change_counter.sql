@@ -0,0 +1,20 @@
+-- Per-table change counters, bumped once per writing statement by the triggers
+-- in sql/functions/6_change_counter.sql. Used for HTTP ETag / Last-Modified.
+CREATE TABLE IF NOT EXISTS admin.table_change_counter (
+    table_name VARCHAR(100) PRIMARY KEY,
+    change_count BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- feed.feed_run is written by every run start and finish, so one counter row
+-- would serialize run writes. Its statements bump one of 16 slots instead
+-- (chosen by backend pid), and its version is the sum over the slots. The
+-- updates are transactional, so the sum only moves once a write commits.
+CREATE TABLE IF NOT EXISTS admin.feed_run_version (
+    slot SMALLINT PRIMARY KEY,
+    change_count BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO admin.feed_run_version (slot)
+SELECT generate_series(0, 15)
+ON CONFLICT (slot) DO NOTHING;
@@ -0,0 +1,25 @@
+-- Outbox of feed run events for downstream consumers, written in the same
+-- transaction as the change by the triggers in sql/functions/8_run_events.sql.
+-- txid is the writing transaction. The relay only reads transactions older
+-- than every running one, so events are delivered in (txid, event_id) order
+-- with no gaps.
+CREATE TABLE IF NOT EXISTS feed.run_event_outbox (
+    event_id BIGSERIAL PRIMARY KEY,
+    txid BIGINT NOT NULL DEFAULT txid_current(),
+    event_type VARCHAR(20) NOT NULL,                 -- RUN_STARTED, RUN_STATUS, RUN_FINISHED, RUN_DETAIL
+    feed_run_id INTEGER NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_run_event_outbox_position ON feed.run_event_outbox(txid, event_id);
+
+-- Position of each consumer in the outbox (last delivered txid/event_id)
+CREATE TABLE IF NOT EXISTS feed.run_event_consumer (
+    consumer_name VARCHAR(100) PRIMARY KEY,
+    last_txid BIGINT NOT NULL DEFAULT 0,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    delivered_count BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -38,17 +38,26 @@ BEGIN
         RAISE EXCEPTION 'Status code % not found in system_codes', v_status_code;
     END IF;
     
-    -- Update the feed_run record
+    -- Update the feed_run record; a run that already finished keeps its outcome
     UPDATE feed.feed_run 
     SET 
         end_dt = CURRENT_TIMESTAMP,
         status_cd = v_status_code,
         updated_at = CURRENT_TIMESTAMP
-    WHERE feed_run_id = p_feed_run_id;
+    WHERE feed_run_id = p_feed_run_id
+    AND status_cd = 'RUNNING';
+
+    IF NOT FOUND THEN
+        RAISE NOTICE 'Feed run ID % is no longer running; left unchanged', p_feed_run_id;
+        RETURN FALSE;
+    END IF;
+
+    -- Progress is only tracked while a run is active
+    DELETE FROM feed.feed_run_heartbeat WHERE feed_run_id = p_feed_run_id;
     
     RAISE NOTICE 'Feed run ID % completed with status: %', p_feed_run_id, v_status_code;
     
-    -- Return success
+    -- Return TRUE when this call finished the run
     RETURN TRUE;
     
 EXCEPTION
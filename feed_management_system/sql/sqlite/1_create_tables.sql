@@ -0,0 +1,126 @@
+-- SQLite schema for the embedded backend (app.core.storage.SQLiteBackend)
+-- "admin" and "feed" are attached databases, so queries keep their schema
+-- prefixes. SQLite cannot enforce foreign keys across attached databases,
+-- so only references within one schema are declared.
+
+CREATE TABLE IF NOT EXISTS admin.code_type (
+    code_type_cd VARCHAR(50) PRIMARY KEY,
+    code_type_description VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS admin.system_codes (
+    code_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    common_cd VARCHAR(50) NOT NULL,
+    code_type_cd VARCHAR(50) NOT NULL REFERENCES code_type(code_type_cd),
+    code_description VARCHAR(255) NOT NULL,
+    sort_order INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (common_cd, code_type_cd)
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed (
+    feed_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_type_cd VARCHAR(50) NOT NULL,
+    feed_type_cd_type VARCHAR(50) NOT NULL DEFAULT 'FEED_TYPE',
+    feed_status_id INTEGER,
+    feed_name VARCHAR(255) NOT NULL,
+    feed_description TEXT,
+    feed_tag VARCHAR(255),
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_environment (
+    environment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    env_system_cd INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_dependency (
+    feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    depends_on_feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    PRIMARY KEY (feed_id, depends_on_feed_id),
+    CHECK (feed_id <> depends_on_feed_id)
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_run (
+    feed_run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    environment_id INTEGER NOT NULL REFERENCES feed_environment(environment_id),
+    start_dt TIMESTAMP NOT NULL,
+    end_dt TIMESTAMP,
+    description TEXT,
+    status_cd VARCHAR(50) NOT NULL,
+    status_cd_type VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_run_details (
+    detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parent_detail_id INTEGER REFERENCES feed_run_details(detail_id),
+    feed_run_id INTEGER NOT NULL REFERENCES feed_run(feed_run_id),
+    detail_desc TEXT NOT NULL,
+    detail_data TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_details (
+    detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parent_detail_id INTEGER REFERENCES feed_details(detail_id),
+    feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    environment_id INTEGER NOT NULL REFERENCES feed_environment(environment_id),
+    detail_type_cd VARCHAR(50) NOT NULL,
+    detail_type_cd_type VARCHAR(50) NOT NULL,
+    detail_desc VARCHAR(500) NOT NULL,
+    detail_data TEXT,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_run_log (
+    feed_run_id INTEGER NOT NULL REFERENCES feed_run(feed_run_id),
+    seq INTEGER NOT NULL,
+    stream VARCHAR(10) NOT NULL DEFAULT 'STDOUT',
+    chunk TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    PRIMARY KEY (feed_run_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_sla (
+    sla_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NOT NULL REFERENCES feed(feed_id),
+    environment_id INTEGER NOT NULL REFERENCES feed_environment(environment_id),
+    expected_start_cron VARCHAR(100) NOT NULL,
+    start_grace_minutes INTEGER NOT NULL DEFAULT 15,
+    max_duration_minutes INTEGER NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (feed_id, environment_id)
+);
+
+CREATE TABLE IF NOT EXISTS feed.feed_sla_breach (
+    breach_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sla_id INTEGER NOT NULL REFERENCES feed_sla(sla_id),
+    expected_start TIMESTAMP NOT NULL,
+    breach_type VARCHAR(20) NOT NULL,
+    feed_run_id INTEGER,
+    detected_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    resolved_at TIMESTAMP,
+    UNIQUE (sla_id, expected_start, breach_type)
+);
+
+-- Create indexes (index names carry the schema; table names must not)
+CREATE INDEX IF NOT EXISTS admin.idx_system_codes_type ON system_codes(code_type_cd);
+CREATE INDEX IF NOT EXISTS feed.idx_feed_tag ON feed(feed_tag);
+CREATE INDEX IF NOT EXISTS feed.idx_feed_run_run_stats ON feed_run(feed_id, environment_id, start_dt DESC);
+CREATE INDEX IF NOT EXISTS feed.idx_feed_run_status ON feed_run(status_cd);
+CREATE INDEX IF NOT EXISTS feed.idx_feed_run_start_dt ON feed_run(start_dt);
+CREATE INDEX IF NOT EXISTS feed.idx_feed_run_details_feed_run_id ON feed_run_details(feed_run_id);
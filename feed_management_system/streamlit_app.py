@@ -3,62 +3,21 @@
 Feed Management System - Streamlit Admin Interface
 """
 import streamlit as st
-import pandas as pd
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
-from dotenv import load_dotenv
-import glob
-# Force cache clear at startup
-import uuid
-os.environ["CACHE_BUSTER"] = str(uuid.uuid4())
 
+# Heavy modules (pandas, psycopg2, yaml) and the page services are imported by
+# the pages that use them so a fresh process can render its first page sooner.
 
-# Load environment variables
-load_dotenv()
+# Database configuration (loads .env on import)
+from app.core.database import DB_CONFIG, ensure_database, get_connection, sql_files
+from app.core.query_cache import FUNCTION_TABLES, QueryCache, written_tables
 
-# Database configuration
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': os.getenv('DB_PORT', '5432'),
-    'database': os.getenv('DB_NAME', 'feed_management'),
-    'user': os.getenv('DB_USER', os.getenv('USER')),
-    'password': os.getenv('DB_PASSWORD', '')
-}
+# Feed details rendered per page on the Feed Management page
+DETAIL_PAGE_SIZE = 25
 
-def create_db_if_missing():
-    """Create the target database if it does not exist"""
-    from psycopg2 import sql, OperationalError
-
-    try:
-        # Try connecting to the target database
-        psycopg2.connect(**DB_CONFIG).close()
-        return  # Database exists
-    except OperationalError as e:
-        if f'database "{DB_CONFIG["database"]}" does not exist' not in str(e):
-            raise e  # Rethrow any error other than 'does not exist'
-
-    # Attempt to connect to 'postgres' DB to create the target DB
-    try:
-        fallback_config = DB_CONFIG.copy()
-        fallback_config["database"] = "postgres"
-
-        conn = psycopg2.connect(**fallback_config)
-        conn.autocommit = True
-
-        with conn.cursor() as cur:
-            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(DB_CONFIG["database"])))
-        conn.close()
-
-        print(f"✅ Created missing database '{DB_CONFIG['database']}'.")
-
-    except Exception as ex:
-        raise RuntimeError(f"❌ Failed to create database '{DB_CONFIG['database']}': {ex}")
-
-create_db_if_missing()
+# Create the target database if needed; runs once per process
+ensure_database()
 
 # Configure Streamlit page
 st.set_page_config(
@@ -68,33 +27,82 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_resource(hash_funcs={"builtins.str": lambda _: os.getenv("CACHE_BUSTER", "")})
+@st.cache_resource
 def init_connection():
     """Initialize database connection with caching"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = get_connection()
         return conn
     except Exception as e:
         st.error(f"Database connection failed: {e}")
         return None
 
 
-def execute_query(query, params=None, fetch=True):
-    """Execute database query with error handling"""
+@st.cache_resource
+def get_query_cache():
+    """Process-wide query result cache shared by all sessions"""
+    return QueryCache()
+
+
+def execute_query(query, params=None, fetch=True, tables=None, shared=False):
+    """Execute database query with error handling
+
+    A read that declares the `tables` it reads is served from the query cache
+    when possible; without them it always goes to the database. A successful
+    write evicts the cached reads of the `tables` it declares it changes, or
+    every cached read when it declares none (DDL, setup scripts). With
+    shared=True (and CACHE_URL set) a read is cached in the cross-process tier
+    instead, so every Streamlit worker sees the same result and the same
+    invalidation.
+    """
+    import pandas as pd
+
+    from app.core.shared_cache import ALL_TABLES, get_shared_cache
+
     if not query or query.strip() == "":
         return True  # Skip empty query safely
+
+    cache = get_query_cache()
+    shared_cache = get_shared_cache()
+    use_shared = shared and shared_cache is not None
+    use_cache = fetch and bool(tables)
+    # Versions are read before the query runs, so a write that lands meanwhile
+    # keeps this result out of the current namespace
+    shared_key = shared_cache.query_key(query, params, tables) if use_shared and use_cache else None
+    if use_cache:
+        cached = shared_cache.get(shared_key) if use_shared else cache.get(query, params)
+        if cached is not None:
+            return cached.copy()
+
     try:
         # Create a fresh connection for each query to avoid transaction issues
-        conn = psycopg2.connect(**DB_CONFIG)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        conn = get_connection()
+        with conn.cursor() as cur:
             cur.execute(query, params)
             if fetch:
+                # Plain tuples + column names avoid a second, dict-per-row copy
                 result = cur.fetchall()
+                columns = [desc[0] for desc in cur.description] if cur.description else []
                 conn.close()
-                return pd.DataFrame(result) if result else pd.DataFrame()
+                df = pd.DataFrame.from_records(result, columns=columns) if result else pd.DataFrame()
+                if use_cache:
+                    if use_shared:
+                        # Same bound as the local cache: run writes made by jobs
+                        # are not relayed, so the TTL limits staleness
+                        shared_cache.put(shared_key, df, cache.ttl)
+                    else:
+                        cache.put(query, params, df, tables)
+                    return df.copy()
+                return df
             else:
                 conn.commit()
                 conn.close()
+                if tables:
+                    cache.invalidate_tables(tables)
+                else:
+                    cache.clear()
+                if shared_cache is not None:
+                    shared_cache.invalidate_tables(tables or [ALL_TABLES])
                 return True
     except Exception as e:
         st.error(f"Query execution failed: {e}")
@@ -103,7 +111,7 @@ def execute_query(query, params=None, fetch=True):
 def clear_database():
     """Clear all user-defined objects by running sql/clear_database/*.sql in order"""
     clear_path = os.path.join("sql", "clear_database", "*.sql")
-    clear_files = sorted(glob.glob(clear_path))
+    clear_files = sql_files(clear_path)
 
     for file_path in clear_files:
         try:
@@ -120,7 +128,7 @@ def clear_database():
 def create_database_schema():
     """Execute all .sql files in sql/ddl/ directory in sorted order"""
     ddl_path = os.path.join("sql", "ddl", "*.sql")
-    ddl_files = sorted(glob.glob(ddl_path))
+    ddl_files = sql_files(ddl_path)
 
     for file_path in ddl_files:
         try:
@@ -136,7 +144,7 @@ def insert_sample_data():
     """Insert sample data by running all .sql files in sql/dcl/ directory in sorted order"""
 
     dcl_path = os.path.join("sql", "dcl", "*.sql")
-    dcl_files = sorted(glob.glob(dcl_path))
+    dcl_files = sql_files(dcl_path)
 
     for file_path in dcl_files:
         try:
@@ -149,7 +157,7 @@ def insert_sample_data():
             st.error(f"Failed to process {file_path}: {e}")
 
     functions_path = os.path.join("sql", "functions", "*.sql")
-    functions_files = sorted(glob.glob(functions_path))
+    functions_files = sql_files(functions_path)
 
     for file_path in functions_files:
         try:
@@ -164,6 +172,8 @@ def insert_sample_data():
 
 def admin_database_setup():
     """Database setup and initialization page"""
+    import pandas as pd
+
     st.header("🔧 Database Administration")
 
     # Connection status
@@ -209,6 +219,24 @@ def admin_database_setup():
 
 
 
+        # Query cache statistics
+        st.subheader("🧠 Query Cache")
+        cache_stats = get_query_cache().stats()
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate']}%")
+        with col2:
+            st.metric("Hits / Misses", f"{cache_stats['hits']} / {cache_stats['misses']}")
+        with col3:
+            st.metric("Entries", cache_stats['entries'])
+        with col4:
+            st.metric("Size", f"{cache_stats['bytes'] / 1024 / 1024:.1f} / {cache_stats['max_bytes'] / 1024 / 1024:.0f} MB")
+        with col5:
+            st.metric("Evictions / Invalidations", f"{cache_stats['evictions']} / {cache_stats['invalidations']}")
+        if st.button("🧹 Clear Query Cache"):
+            get_query_cache().clear()
+            st.rerun()
+
         # Database status
         st.subheader("📈 Database Status")
 
@@ -269,7 +297,7 @@ def admin_system_codes():
         JOIN admin.code_type ct ON sc.code_type_cd = ct.code_type_cd
         ORDER BY sc.code_type_cd, sc.sort_order, sc.common_cd;
         """
-        codes_df = execute_query(codes_query)
+        codes_df = execute_query(codes_query, tables=('admin.system_codes', 'admin.code_type'), shared=True)
         
         if not codes_df.empty:
             # Filter options
@@ -319,7 +347,8 @@ def admin_system_codes():
                     INSERT INTO admin.code_type (code_type_cd, code_type_description)
                     VALUES (%s, %s);
                     """
-                    if execute_query(query, (code_type_cd.upper(), code_type_desc), fetch=False):
+                    if execute_query(query, (code_type_cd.upper(), code_type_desc), fetch=False,
+                                     tables=written_tables('admin.code_type')):
                         st.success(f"Code type '{code_type_cd}' added successfully!")
                         st.rerun()
                 else:
@@ -330,7 +359,7 @@ def admin_system_codes():
         
         # Get available code types
         types_query = "SELECT code_type_cd, code_type_description FROM admin.code_type ORDER BY code_type_cd;"
-        types_df = execute_query(types_query)
+        types_df = execute_query(types_query, tables=('admin.code_type',), shared=True)
         
         if not types_df.empty:
             with st.form("add_system_code"):
@@ -355,7 +384,8 @@ def admin_system_codes():
                         INSERT INTO admin.system_codes (common_cd, code_type_cd, code_description, sort_order, is_active)
                         VALUES (%s, %s, %s, %s, %s);
                         """
-                        if execute_query(query, (common_cd.upper(), code_type, code_desc, sort_order, is_active), fetch=False):
+                        if execute_query(query, (common_cd.upper(), code_type, code_desc, sort_order, is_active), fetch=False,
+                                         tables=written_tables('admin.system_codes')):
                             st.success(f"System code '{common_cd}' added successfully!")
                             st.rerun()
                     else:
@@ -373,7 +403,7 @@ def admin_system_codes():
         FROM admin.system_codes sc
         ORDER BY sc.code_type_cd, sc.common_cd;
         """
-        all_codes_df = execute_query(all_codes_query)
+        all_codes_df = execute_query(all_codes_query, tables=('admin.system_codes',), shared=True)
         
         if not all_codes_df.empty:
             # Create selection options
@@ -407,7 +437,8 @@ def admin_system_codes():
                             SET code_description = %s, sort_order = %s, is_active = %s, updated_at = CURRENT_TIMESTAMP
                             WHERE code_id = %s;
                             """
-                            if execute_query(update_query, (new_desc, new_sort, new_active, selected_code), fetch=False):
+                            if execute_query(update_query, (new_desc, new_sort, new_active, selected_code), fetch=False,
+                                             tables=written_tables('admin.system_codes')):
                                 st.success("System code updated successfully!")
                                 st.rerun()
                 
@@ -436,7 +467,8 @@ def admin_system_codes():
                         
                         if st.button("🗑️ DELETE SYSTEM CODE", type="primary", disabled=not confirm_delete):
                             delete_query = "DELETE FROM admin.system_codes WHERE code_id = %s;"
-                            if execute_query(delete_query, (selected_code,), fetch=False):
+                            if execute_query(delete_query, (selected_code,), fetch=False,
+                                             tables=written_tables('admin.system_codes')):
                                 st.success("System code deleted successfully!")
                                 st.rerun()
                     else:
@@ -447,13 +479,15 @@ def admin_system_codes():
 
 def admin_feeds():
     """Feed management interface"""
+    import pandas as pd
+
     st.header("📡 Feed Management")
 
     # Use modern query params
     query_params = st.query_params
     default_tab = query_params.get("tab", "view")
 
-    tab1, tab2, tab3 = st.tabs(["View Feeds", "Add/Edit Feed", "Feed Environments & Details"])
+    tab1, tab2, tab3, tab4 = st.tabs(["View Feeds", "Add/Edit Feed", "Feed Environments & Details", "Bulk Import"])
 
     with tab1:
         st.subheader("Current Feeds")
@@ -469,7 +503,8 @@ def admin_feeds():
         LEFT JOIN admin.system_codes scc ON f.feed_status_id = scc.code_id
         ORDER BY f.feed_name;
         """
-        feeds_df = execute_query(feeds_query)
+        feeds_df = execute_query(feeds_query, tables=('feed.feed', 'feed.feed_run', 'admin.system_codes'),
+                                 shared=True)
 
         if not feeds_df.empty:
             # Display feeds table
@@ -490,6 +525,23 @@ def admin_feeds():
                     st.session_state['selected_feed_id_for_edit'] = selected_feed
                     st.query_params["tab"] = "edit"
                     st.rerun()
+            # Bulk purge
+            with st.expander("🧨 Bulk Purge Feeds", expanded=False):
+                purge_ids = st.multiselect(
+                    "Feeds to purge",
+                    options=feeds_df['feed_id'].tolist(),
+                    format_func=lambda fid: feeds_df[feeds_df['feed_id'] == fid]['feed_name'].iloc[0],
+                    key="purge_feed_ids"
+                )
+                archive_purged = st.checkbox("Archive before purging", value=True, key="archive_purged")
+                confirm_purge = st.checkbox("I understand the selected feeds and all their runs will be deleted",
+                                            key="confirm_purge")
+                if st.button("🗑️ PURGE SELECTED FEEDS", disabled=not (purge_ids and confirm_purge)):
+                    if execute_query("SELECT purge_feeds(%s::INTEGER[], %s);",
+                                     ([int(fid) for fid in purge_ids], archive_purged), fetch=False,
+                                     tables=FUNCTION_TABLES['purge_feeds']):
+                        st.success(f"Purged {len(purge_ids)} feed(s).")
+                        st.rerun()
         else:
             st.warning("No feeds found.")
             if st.button("Add First Feed"):
@@ -505,14 +557,14 @@ def admin_feeds():
             FROM admin.system_codes 
             WHERE code_type_cd = 'FEED_TYPE' AND is_active = true
             ORDER BY sort_order, common_cd;
-        """)
+        """, tables=('admin.system_codes',), shared=True)
         
         feed_status_df = execute_query("""
             SELECT code_id, code_description
             FROM admin.system_codes
             WHERE code_type_cd = 'FEED_STATUS' AND is_active = true
             ORDER BY sort_order, code_description;
-        """)
+        """, tables=('admin.system_codes',), shared=True)
 
         # Determine mode and get existing data
         feed_id = st.session_state.get('selected_feed_id_for_edit')
@@ -520,7 +572,8 @@ def admin_feeds():
         
         if mode == "Edit":
             st.info(f"Editing feed ID: {feed_id}")
-            feed_data = execute_query("SELECT * FROM feed.feed WHERE feed_id = %s", (feed_id,))
+            feed_data = execute_query("SELECT * FROM feed.feed WHERE feed_id = %s", (feed_id,),
+                                      tables=('feed.feed',))
             if feed_data.empty:
                 st.error("Feed not found!")
                 st.session_state.pop('selected_feed_id_for_edit', None)
@@ -615,7 +668,7 @@ def admin_feeds():
                             """
                             params = (feed_name, feed_type, feed_status, feed_desc, feed_tag if feed_tag.strip() else None, is_active, feed_id)
                         
-                        if execute_query(query, params, fetch=False):
+                        if execute_query(query, params, fetch=False, tables=written_tables('feed.feed')):
                             st.success(f"Feed '{feed_name}' {mode.lower()}ed successfully!")
                             st.session_state.pop('selected_feed_id_for_edit', None)
                             st.query_params.clear()
@@ -632,28 +685,17 @@ def admin_feeds():
             
             with st.expander("Delete Feed", expanded=False):
                 st.warning("This action cannot be undone. All related data (environments, details, runs) will be deleted.")
-                
+
+                archive_feed = st.checkbox("Archive the feed and its run history before deleting", value=True)
                 confirm_delete = st.checkbox("I understand this will delete all related data")
                 
                 if confirm_delete:
                     if st.button("🗑️ DELETE FEED", type="secondary"):
                         try:
-                            # Delete in correct order to handle foreign key constraints
-                            delete_queries = [
-                                "DELETE FROM feed.feed_details WHERE feed_id = %s;",
-                                "DELETE FROM feed.feed_run WHERE feed_id = %s;",
-                                "DELETE FROM feed.feed_environment WHERE feed_id = %s;",
-                                "DELETE FROM feed.feed WHERE feed_id = %s;"
-                            ]
-                            
-                            success = True
-                            for query in delete_queries:
-                                if not execute_query(query, (feed_id,), fetch=False):
-                                    success = False
-                                    break
-                            
-                            if success:
-                                st.success("Feed deleted successfully.")
+                            # Single server-side call: one transaction, set-based deletes
+                            if execute_query("SELECT delete_feed(%s, %s);", (int(feed_id), archive_feed), fetch=False,
+                                             tables=FUNCTION_TABLES['delete_feed']):
+                                st.success("Feed archived and deleted successfully." if archive_feed else "Feed deleted successfully.")
                                 st.session_state.pop('selected_feed_id_for_edit', None)
                                 st.query_params.clear()
                                 st.rerun()
@@ -672,7 +714,8 @@ def admin_feeds():
     with tab3:
         st.subheader("Feed Environments & Details")
 
-        feeds = execute_query("SELECT feed_id, feed_name FROM feed.feed ORDER BY feed_name;")
+        feeds = execute_query("SELECT feed_id, feed_name FROM feed.feed ORDER BY feed_name;",
+                              tables=('feed.feed',), shared=True)
 
         if not feeds.empty:
             feed_options = feeds.set_index("feed_id")['feed_name'].to_dict()
@@ -690,7 +733,7 @@ def admin_feeds():
                 JOIN admin.system_codes s ON e.env_system_cd = s.code_id
                 WHERE e.feed_id = %s
                 ORDER BY e.created_at DESC;
-            """, (selected_feed_id,))
+            """, (selected_feed_id,), tables=('feed.feed_environment', 'admin.system_codes'))
 
             if not envs_df.empty:
                 st.dataframe(envs_df, use_container_width=True)
@@ -700,7 +743,7 @@ def admin_feeds():
                 SELECT code_id, code_description FROM admin.system_codes
                 WHERE code_type_cd = 'FEED_ENVIRONMENT' AND is_active = true
                 ORDER BY sort_order;
-            """)
+            """, tables=('admin.system_codes',), shared=True)
 
             with st.form("add_env"):
                 if not env_codes_df.empty:
@@ -715,12 +758,19 @@ def admin_feeds():
                         INSERT INTO feed.feed_environment (feed_id, env_system_cd)
                         VALUES (%s, %s);
                         """
-                        if execute_query(insert_env_query, (selected_feed_id, env_code_id), fetch=False):
+                        if execute_query(insert_env_query, (selected_feed_id, env_code_id), fetch=False,
+                                         tables=written_tables('feed.feed_environment')):
                             st.success("Environment added successfully")
                             st.rerun()
 
-            # Feed Details
+            # Feed Details, one keyset page at a time (newest first). Buttons only
+            # record an action, which runs after the page has been rendered.
             st.markdown("### Feed Details")
+            if st.session_state.get('detail_pages_feed') != selected_feed_id:
+                st.session_state['detail_pages_feed'] = selected_feed_id
+                st.session_state['detail_pages'] = [None]
+            detail_pages = st.session_state['detail_pages']
+            before_id = detail_pages[-1]
             details_df = execute_query("""
                 SELECT fd.detail_id, fd.detail_desc, fd.detail_data, fd.created_at,
                        sc.code_description AS detail_type_desc,
@@ -731,101 +781,127 @@ def admin_feeds():
                 JOIN feed.feed_environment fe ON fd.environment_id = fe.environment_id
                 JOIN admin.system_codes senv ON fe.env_system_cd = senv.code_id
                 WHERE fd.feed_id = %s
-                ORDER BY fd.created_at DESC;
-            """, (selected_feed_id,))
-
-            if not details_df.empty:
-                # Display details with edit/delete options
-                for idx, detail in details_df.iterrows():
-                    with st.expander(f"Detail: {detail['detail_desc'][:50]}..." if len(detail['detail_desc']) > 50 else f"Detail: {detail['detail_desc']}"):
-                        col1, col2, col3 = st.columns([6, 1, 1])
-                        
-                        with col1:
-                            st.write(f"**Type:** {detail['detail_type_desc']}")
-                            st.write(f"**Environment:** {detail['environment_desc']}")
-                            st.write(f"**Created:** {detail['created_at']}")
-                            st.write(f"**Description:** {detail['detail_desc']}")
-                            st.write(f"**Data:** {detail['detail_data']}")
-                        
-                        with col2:
-                            if st.button("Edit", key=f"edit_detail_{detail['detail_id']}"):
-                                st.session_state[f'editing_detail_{detail["detail_id"]}'] = True
-                                st.rerun()
-                        
-                        with col3:
-                            if st.button("Delete", key=f"delete_detail_{detail['detail_id']}"):
-                                delete_detail_query = "DELETE FROM feed.feed_details WHERE detail_id = %s;"
-                                if execute_query(delete_detail_query, (detail['detail_id'],), fetch=False):
-                                    st.success("Detail deleted")
-                                    st.rerun()
+                  AND (%s::INTEGER IS NULL OR fd.detail_id < %s)
+                ORDER BY fd.detail_id DESC
+                LIMIT %s;
+            """, (selected_feed_id, before_id, before_id, DETAIL_PAGE_SIZE + 1),
+            tables=('feed.feed_details', 'feed.feed_environment', 'admin.system_codes'))
+            has_more = len(details_df) > DETAIL_PAGE_SIZE
+            details_df = details_df.iloc[:DETAIL_PAGE_SIZE]
 
-                        # Edit form (appears when edit button clicked)
-                        if st.session_state.get(f'editing_detail_{detail["detail_id"]}', False):
-                            st.markdown("---")
-                            
-                            detail_codes_df = execute_query("""
-                                SELECT common_cd, code_description FROM admin.system_codes
-                                WHERE code_type_cd = 'FEED_RUN_DETAIL_TYPE' AND is_active = true
-                                ORDER BY sort_order;
-                            """)
-                            
-                            with st.form(f"edit_detail_{detail['detail_id']}"):
-                                edit_desc = st.text_area("Detail Description", value=detail['detail_desc'])
-                                edit_data = st.text_area("Detail Data", value=detail['detail_data'])
-                                
-                                # Detail type
-                                type_index = 0
-                                try:
-                                    type_index = detail_codes_df['common_cd'].tolist().index(detail['detail_type_cd'])
-                                except ValueError:
-                                    pass
-                                
-                                edit_type = st.selectbox(
-                                    "Detail Type", 
-                                    detail_codes_df['common_cd'],
-                                    format_func=lambda x: detail_codes_df[detail_codes_df['common_cd'] == x]['code_description'].iloc[0],
-                                    index=type_index
-                                )
-                                
-                                # Environment
-                                env_index = 0
-                                try:
-                                    env_index = envs_df['environment_id'].tolist().index(detail['environment_id'])
-                                except ValueError:
-                                    pass
-                                
-                                edit_env = st.selectbox(
-                                    "Environment", 
-                                    envs_df['environment_id'],
-                                    format_func=lambda x: envs_df[envs_df['environment_id'] == x]['environment_label'].iloc[0],
-                                    index=env_index
-                                )
-                                
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    if st.form_submit_button("Save Changes"):
-                                        update_detail_query = """
-                                        UPDATE feed.feed_details 
-                                        SET detail_desc = %s, detail_data = %s, detail_type_cd = %s, environment_id = %s
-                                        WHERE detail_id = %s;
-                                        """
-                                        if execute_query(update_detail_query, (edit_desc, edit_data, edit_type, edit_env, detail['detail_id']), fetch=False):
-                                            st.success("Detail updated")
-                                            st.session_state.pop(f'editing_detail_{detail["detail_id"]}', None)
-                                            st.rerun()
-                                
-                                with col2:
-                                    if st.form_submit_button("Cancel"):
-                                        st.session_state.pop(f'editing_detail_{detail["detail_id"]}', None)
-                                        st.rerun()
-
-            # Add new detail
-            st.markdown("#### Add New Detail")
             detail_codes_df = execute_query("""
                 SELECT common_cd, code_description FROM admin.system_codes
                 WHERE code_type_cd = 'FEED_RUN_DETAIL_TYPE' AND is_active = true
                 ORDER BY sort_order;
-            """)
+            """, tables=('admin.system_codes',), shared=True)
+
+            action = None
+            for detail in details_df.itertuples():
+                detail_id = int(detail.detail_id)
+                editing_key = f'editing_detail_{detail_id}'
+                title = detail.detail_desc if len(detail.detail_desc) <= 50 else f"{detail.detail_desc[:50]}..."
+                with st.expander(f"Detail: {title}"):
+                    col1, col2, col3 = st.columns([6, 1, 1])
+
+                    with col1:
+                        st.write(f"**Type:** {detail.detail_type_desc}")
+                        st.write(f"**Environment:** {detail.environment_desc}")
+                        st.write(f"**Created:** {detail.created_at}")
+                        st.write(f"**Description:** {detail.detail_desc}")
+                        st.write(f"**Data:** {detail.detail_data}")
+
+                    with col2:
+                        if st.button("Edit", key=f"edit_detail_{detail_id}"):
+                            action = ('edit', detail_id, None)
+
+                    with col3:
+                        if st.button("Delete", key=f"delete_detail_{detail_id}"):
+                            action = ('delete', detail_id, None)
+
+                    # Edit form (appears when edit button clicked)
+                    if st.session_state.get(editing_key, False):
+                        st.markdown("---")
+
+                        with st.form(f"edit_detail_{detail_id}"):
+                            edit_desc = st.text_area("Detail Description", value=detail.detail_desc)
+                            edit_data = st.text_area("Detail Data", value=detail.detail_data)
+
+                            # Detail type
+                            type_index = 0
+                            try:
+                                type_index = detail_codes_df['common_cd'].tolist().index(detail.detail_type_cd)
+                            except ValueError:
+                                pass
+
+                            edit_type = st.selectbox(
+                                "Detail Type",
+                                detail_codes_df['common_cd'],
+                                format_func=lambda x: detail_codes_df[detail_codes_df['common_cd'] == x]['code_description'].iloc[0],
+                                index=type_index
+                            )
+
+                            # Environment
+                            env_index = 0
+                            try:
+                                env_index = envs_df['environment_id'].tolist().index(detail.environment_id)
+                            except ValueError:
+                                pass
+
+                            edit_env = st.selectbox(
+                                "Environment",
+                                envs_df['environment_id'],
+                                format_func=lambda x: envs_df[envs_df['environment_id'] == x]['environment_label'].iloc[0],
+                                index=env_index
+                            )
+
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                if st.form_submit_button("Save Changes"):
+                                    action = ('update', detail_id, (edit_desc, edit_data, edit_type, int(edit_env)))
+
+                            with col2:
+                                if st.form_submit_button("Cancel"):
+                                    action = ('cancel', detail_id, None)
+
+            col1, col2, col3 = st.columns([1, 1, 4])
+            with col1:
+                if st.button("⬅️ Newer", key="details_newer", disabled=len(detail_pages) == 1):
+                    detail_pages.pop()
+                    st.rerun()
+            with col2:
+                if st.button("Older ➡️", key="details_older", disabled=not has_more):
+                    detail_pages.append(int(details_df['detail_id'].iloc[-1]))
+                    st.rerun()
+            with col3:
+                st.caption(f"Page {len(detail_pages)}")
+
+            if action is not None:
+                kind, detail_id, values = action
+                editing_key = f'editing_detail_{detail_id}'
+                if kind == 'edit':
+                    st.session_state[editing_key] = True
+                    st.rerun()
+                elif kind == 'cancel':
+                    st.session_state.pop(editing_key, None)
+                    st.rerun()
+                elif kind == 'delete':
+                    delete_detail_query = "DELETE FROM feed.feed_details WHERE detail_id = %s;"
+                    if execute_query(delete_detail_query, (detail_id,), fetch=False, tables=written_tables('feed.feed_details')):
+                        st.success("Detail deleted")
+                        st.rerun()
+                elif kind == 'update':
+                    update_detail_query = """
+                    UPDATE feed.feed_details
+                    SET detail_desc = %s, detail_data = %s, detail_type_cd = %s, environment_id = %s
+                    WHERE detail_id = %s;
+                    """
+                    if execute_query(update_detail_query, (*values, detail_id), fetch=False, tables=written_tables('feed.feed_details')):
+                        st.success("Detail updated")
+                        st.session_state.pop(editing_key, None)
+                        st.rerun()
+
+            # Add new detail
+            st.markdown("#### Add New Detail")
 
             with st.form("add_detail"):
                 detail_desc = st.text_area("Detail Description")
@@ -852,7 +928,8 @@ def admin_feeds():
                                     feed_id, environment_id, detail_type_cd, detail_type_cd_type, detail_desc, detail_data
                                 ) VALUES (%s, %s, %s, 'FEED_RUN_DETAIL_TYPE', %s, %s);
                                 """
-                                if execute_query(insert_detail_query, (selected_feed_id, environment_id, detail_type, detail_desc, detail_data), fetch=False):
+                                if execute_query(insert_detail_query, (selected_feed_id, environment_id, detail_type, detail_desc, detail_data),
+                                                 fetch=False, tables=written_tables('feed.feed_details')):
                                     st.success("Detail added successfully")
                                     st.rerun()
                             else:
@@ -863,48 +940,98 @@ def admin_feeds():
         else:
             st.warning("No feeds available. Please create a feed first.")
 
+    with tab4:
+        st.subheader("Bulk Import")
+        st.caption("Upload a CSV or YAML manifest of feeds, environments and feed details. "
+                   "Feeds are matched on feed tag; re-importing updates existing rows.")
+
+        manifest = st.file_uploader("Manifest", type=["csv", "yaml", "yml"])
+        col1, col2 = st.columns(2)
+        with col1:
+            dry_run = st.checkbox("Dry run (validate and count, don't commit)", value=True)
+        with col2:
+            skip_invalid = st.checkbox("Load valid rows even if some rows have errors")
+
+        if manifest is not None and st.button("📥 Import Manifest", type="primary"):
+            # Imported here: bulk_import pulls in yaml
+            from app.services.bulk_import import IMPORTED_TABLES, import_manifest, parse_manifest
+
+            try:
+                records = parse_manifest(manifest.getvalue(), manifest.name)
+                with st.spinner(f"Importing {len(records)} manifest rows..."):
+                    result = import_manifest(records, dry_run=dry_run, skip_invalid=skip_invalid)
+            except Exception as e:
+                st.error(f"Import failed: {e}")
+            else:
+                if result.errors:
+                    st.error(f"{len(result.errors)} row(s) failed validation")
+                    st.dataframe(pd.DataFrame([error.as_dict() for error in result.errors]),
+                                 use_container_width=True)
+                if result.counts:
+                    st.dataframe(pd.DataFrame([result.counts]), use_container_width=True)
+                if result.loaded:
+                    get_query_cache().invalidate_tables(written_tables(*IMPORTED_TABLES))
+                    st.success("Import committed successfully!")
+                elif result.counts:
+                    st.info("Dry run complete - nothing was committed.")
+
 
 def dashboard():
     """Main dashboard with overview"""
+    from app.services.fleet import KPI_COLUMNS, KPI_QUERY, KPI_TABLES
+    from app.services.heartbeat import ACTIVE_RUNS_QUERY, STALE_AFTER_MINUTES, describe_progress
+
     st.header("📊 Feed Management Dashboard")
     
-    # Quick stats
+    # Quick stats (one round trip for all KPIs)
+    kpis = execute_query(KPI_QUERY, tables=KPI_TABLES, shared=True)
+    kpi = kpis.iloc[0] if not kpis.empty else dict.fromkeys(KPI_COLUMNS, 0)
     col1, col2, col3, col4 = st.columns(4)
-    
+
     with col1:
-        feeds_count = execute_query("SELECT COUNT(*) as count FROM feed.feed WHERE is_active = true;")
-        count = feeds_count.iloc[0, 0] if not feeds_count.empty else 0
-        st.metric("Active Feeds", count)
-    
+        st.metric("Active Feeds", kpi['active_feeds'])
+
     with col2:
-        runs_today = execute_query("""
-            SELECT COUNT(*) as count FROM feed.feed_run 
-            WHERE DATE(start_dt) = CURRENT_DATE;
-        """)
-        count = runs_today.iloc[0, 0] if not runs_today.empty else 0
-        st.metric("Runs Today", count)
-    
+        st.metric("Runs Today", kpi['runs_today'],
+                  delta=f"{kpi['failed_today']} failed" if kpi['failed_today'] else None,
+                  delta_color="inverse")
+
     with col3:
-        success_rate = execute_query("""
-            SELECT 
-                COALESCE(
-                    ROUND(
-                        COUNT(CASE WHEN status_cd = 'COMPLETED' THEN 1 END) * 100.0 / 
-                        NULLIF(COUNT(*), 0), 
-                        1
-                    ), 0
-                ) as success_rate
-            FROM feed.feed_run 
-            WHERE start_dt >= CURRENT_DATE - INTERVAL '30 days';
-        """)
-        rate = success_rate.iloc[0, 0] if not success_rate.empty else 0
-        st.metric("30-Day Success Rate", f"{rate}%")
-    
+        st.metric("30-Day Success Rate", f"{kpi['success_rate_30d']}%")
+
     with col4:
-        system_codes_count = execute_query("SELECT COUNT(*) as count FROM admin.system_codes WHERE is_active = true;")
-        count = system_codes_count.iloc[0, 0] if not system_codes_count.empty else 0
-        st.metric("Active System Codes", count)
-    
+        st.metric("Active System Codes", kpi['active_system_codes'])
+
+    # Live progress from run heartbeats; never cached, they change every few seconds
+    active = execute_query(ACTIVE_RUNS_QUERY, {'stale_after': STALE_AFTER_MINUTES})
+    if not active.empty:
+        stuck = int(active['is_stale'].sum())
+        st.subheader(f"🏃 Running Now ({len(active)})")
+        if stuck:
+            st.warning(f"{stuck} run(s) have not sent a heartbeat for {STALE_AFTER_MINUTES} minutes")
+        for run in active.itertuples(index=False):
+            progress, label = describe_progress(run)
+            st.progress(progress / 100, text=f"{label} · last seen {run.last_seen:%H:%M:%S}")
+
+    # SLA breaches (recorded by python -m app.services.sla)
+    breaches = execute_query("""
+        SELECT f.feed_name, sc.common_cd AS environment, b.breach_type, b.expected_start,
+               b.expected_start + make_interval(mins => sla.max_duration_minutes) AS deadline,
+               b.feed_run_id, b.detected_at
+        FROM feed.feed_sla_breach b
+        JOIN feed.feed_sla sla ON b.sla_id = sla.sla_id
+        JOIN feed.feed f ON sla.feed_id = f.feed_id
+        JOIN feed.feed_environment fe ON sla.environment_id = fe.environment_id
+        JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+        WHERE b.resolved_at IS NULL
+        ORDER BY b.detected_at DESC
+        LIMIT 50;
+    """, tables=('feed.feed_sla_breach', 'feed.feed_sla', 'feed.feed', 'feed.feed_environment',
+                 'admin.system_codes'))
+    if not breaches.empty:
+        st.subheader(f"🚨 Open SLA Breaches ({len(breaches)})")
+        st.dataframe(breaches, use_container_width=True, hide_index=True)
+
     # Recent activity
     st.subheader("🕒 Recent Feed Runs")
     recent_runs = execute_query("""
@@ -916,13 +1043,272 @@ def dashboard():
         WHERE sc.code_type_cd = 'STATUS'
         ORDER BY fr.start_dt DESC
         LIMIT 10;
-    """)
+    """, tables=('feed.feed_run', 'feed.feed', 'admin.system_codes'))
     
     if not recent_runs.empty:
         st.dataframe(recent_runs, use_container_width=True)
     else:
         st.info("No recent feed runs found.")
 
+def fleet_view():
+    """Dashboard KPIs across every configured database"""
+    import pandas as pd
+
+    from app.services.fleet import (
+        DB_TARGETS_FILE,
+        DEFAULT_TIMEOUT as DEFAULT_FLEET_TIMEOUT,
+        fleet_kpis,
+        fleet_totals,
+        load_targets,
+    )
+
+    st.header("🛰️ Fleet View")
+
+    try:
+        targets = load_targets()
+    except Exception as e:
+        st.error(f"Failed to load {DB_TARGETS_FILE}: {e}")
+        return
+    st.caption(f"{len(targets)} target(s) from `{DB_TARGETS_FILE}`"
+               if os.path.exists(DB_TARGETS_FILE) else
+               f"`{DB_TARGETS_FILE}` not found; showing the current database only")
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        timeout = st.number_input("Timeout per database (s)", min_value=1.0, max_value=60.0,
+                                  value=DEFAULT_FLEET_TIMEOUT, step=1.0)
+    with col2:
+        st.write("")
+        refresh = st.button("🔄 Refresh")
+
+    if refresh or 'fleet_results' not in st.session_state:
+        with st.spinner("Querying databases..."):
+            st.session_state.fleet_results = fleet_kpis(targets, timeout=timeout)
+    results = st.session_state.fleet_results
+
+    totals = fleet_totals(results)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Databases Responding", f"{totals['targets_ok']} / {totals['targets_total']}")
+    with col2:
+        st.metric("Active Feeds", totals['active_feeds'])
+    with col3:
+        st.metric("Runs Today", totals['runs_today'])
+    with col4:
+        st.metric("Failed Today", totals['failed_today'])
+
+    for result in results:
+        if result['status'] != 'ok':
+            st.warning(f"⚠️ {result['target']}: {result['status']} - {result['error']}")
+
+    st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+
+
+def run_log_page():
+    """Page through a feed run's log without loading all of it"""
+    from app.services.run_log import LOG_STREAMS, iter_log, log_summary
+
+    st.header("📜 Run Logs")
+
+    runs = execute_query("""
+        SELECT fr.feed_run_id, f.feed_name, fr.status_cd, fr.start_dt
+        FROM feed.feed_run fr
+        JOIN feed.feed f ON fr.feed_id = f.feed_id
+        ORDER BY fr.start_dt DESC
+        LIMIT 100;
+    """, tables=('feed.feed_run', 'feed.feed'))
+    if runs.empty:
+        st.info("No feed runs found.")
+        return
+
+    labels = {
+        int(row.feed_run_id): f"#{row.feed_run_id} · {row.feed_name} · {row.status_cd} · {row.start_dt}"
+        for row in runs.itertuples()
+    }
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        feed_run_id = st.selectbox("Feed run", list(labels), format_func=labels.get)
+    with col2:
+        per_page = st.number_input("Chunks per page", min_value=10, max_value=500, value=50, step=10)
+    with col3:
+        streams = st.multiselect("Streams", list(LOG_STREAMS), default=list(LOG_STREAMS))
+
+    try:
+        summary = log_summary(feed_run_id)
+    except Exception as e:
+        st.error(f"Failed to read run log: {e}")
+        return
+
+    if summary['chunks'] == 0:
+        st.info("This run has no log output yet.")
+        if st.button("🔄 Refresh"):
+            st.rerun()
+        return
+
+    pages = max(1, -(-summary['last_seq'] // int(per_page)))
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        page = st.number_input(f"Page (1-{pages}, newest last)", min_value=1, max_value=pages, value=pages)
+    with col2:
+        st.metric("Log Size", f"{summary['chars'] / 1024 / 1024:.2f} MB",
+                  delta=f"{summary['chunks']} chunks", delta_color="off")
+
+    # Only this page's chunks are fetched, through a server-side cursor
+    start_seq = (int(page) - 1) * int(per_page)
+    text = ''.join(
+        chunk for _, stream, chunk in iter_log(feed_run_id, after_seq=start_seq, until_seq=start_seq + int(per_page))
+        if stream in streams
+    )
+    st.caption(f"Chunks {start_seq + 1}-{min(start_seq + int(per_page), summary['last_seq'])}")
+    st.code(text or "(no output on the selected streams)", language=None)
+
+    if st.button("🔄 Refresh"):
+        st.rerun()
+
+
+def analytics_page():
+    """History rollups computed by DuckDB over the Parquet run snapshot"""
+    # Imported here: pyarrow and duckdb are only needed on this page
+    from app.services.analytics import (
+        DEFAULT_DAYS, PROCESSED_DIR, ROLLUPS, connect_parquet, refresh_snapshots, rollup, snapshot_files,
+    )
+
+    st.header("📈 Analytics")
+    st.caption(f"Queries read Parquet snapshots in `{PROCESSED_DIR}`, never the live database.")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        name = st.selectbox("Rollup", sorted(ROLLUPS), format_func=lambda n: n.replace('_', ' ').title())
+    with col2:
+        days = st.number_input("Days", min_value=1, max_value=3660, value=DEFAULT_DAYS, step=30)
+    with col3:
+        st.write("")
+        if st.button("🔄 Refresh Snapshot"):
+            try:
+                with st.spinner("Exporting newly finished runs..."):
+                    count = refresh_snapshots()
+                st.success(f"✅ Added {count} run(s)")
+            except Exception as e:
+                st.error(f"Snapshot refresh failed: {e}")
+
+    if not snapshot_files():
+        st.info("No snapshot yet. Use Refresh Snapshot to export the run history.")
+        return
+
+    try:
+        con = connect_parquet()
+        try:
+            df = rollup(con, name, int(days))
+        finally:
+            con.close()
+    except Exception as e:
+        st.error(f"Analytics query failed: {e}")
+        return
+
+    st.caption(f"{len(df)} row(s)")
+    if name == 'environment_comparison' and not df.empty:
+        st.dataframe(df.pivot_table(index='feed_tag', columns='environment',
+                                    values=['success_rate', 'p95_seconds']),
+                     use_container_width=True)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+def search_page():
+    """Full-text search across feeds, feed details and run details"""
+    from app.services.search_service import SEARCH_SOURCES, search
+
+    st.header("🔎 Search")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        term = st.text_input("Search", placeholder='e.g. "access denied" cloudwatch -retry')
+    with col2:
+        limit = st.number_input("Max results", min_value=5, max_value=200, value=25, step=5)
+
+    sources = st.multiselect("Search in", list(SEARCH_SOURCES), default=list(SEARCH_SOURCES))
+
+    if not term or len(term.strip()) < 2:
+        st.info("Enter at least two characters to search error messages, links, commands and feed names.")
+        return
+
+    try:
+        results = search(term, limit=int(limit), sources=sources or SEARCH_SOURCES,
+                         start_sel="**", stop_sel="**")
+    except Exception as e:
+        st.error(f"Search failed: {e}")
+        return
+
+    st.caption(f"{len(results)} result(s)")
+    for hit in results:
+        with st.container(border=True):
+            st.markdown(f"**{hit['title']}**  \n`{hit['source']}` · feed {hit['feed_id']}"
+                        + (f" · run {hit['feed_run_id']}" if hit['feed_run_id'] else "")
+                        + f" · {hit['created_at']} · rank {hit['rank']:.3f}")
+            st.markdown(hit['snippet'] or "")
+
+
+def audit_page():
+    """Paginated view of admin changes recorded by the audit triggers"""
+    import pandas as pd
+
+    from app.services.audit import AUDITED_TABLES, OPERATIONS as AUDIT_OPERATIONS, format_diff, list_changes
+
+    st.header("🧾 Audit Log")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        table_name = st.selectbox("Table", ["All"] + list(AUDITED_TABLES))
+    with col2:
+        row_key = st.text_input("Record key", placeholder="e.g. a feed_id or code_id")
+    with col3:
+        operation = st.selectbox("Operation", ["All"] + list(AUDIT_OPERATIONS.values()))
+    page_size = st.select_slider("Rows per page", options=[25, 50, 100, 250], value=50)
+
+    # Keyset pagination: remember the before_id that opened each page
+    filters = (table_name, row_key.strip(), operation, page_size)
+    if st.session_state.get('audit_filters') != filters:
+        st.session_state['audit_filters'] = filters
+        st.session_state['audit_pages'] = [None]
+    pages = st.session_state['audit_pages']
+
+    try:
+        page = list_changes(
+            table_name=None if table_name == "All" else table_name,
+            row_key=row_key.strip() or None,
+            operation=None if operation == "All" else operation[0],
+            before_id=pages[-1],
+            limit=page_size,
+        )
+    except Exception as e:
+        st.error(f"Failed to load the audit log: {e}")
+        return
+
+    if not page['entries']:
+        st.info("No changes recorded for this selection.")
+        return
+
+    st.dataframe(pd.DataFrame([{
+        'When': entry['changed_at'],
+        'By': entry['changed_by'],
+        'Operation': AUDIT_OPERATIONS[entry['operation']],
+        'Table': entry['table_name'],
+        'Key': entry['row_key'],
+        'Changes': format_diff(entry['operation'], entry['diff']),
+    } for entry in page['entries']]), use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("⬅️ Newer", disabled=len(pages) == 1):
+            pages.pop()
+            st.rerun()
+    with col2:
+        if st.button("Older ➡️", disabled=page['next_before_id'] is None):
+            pages.append(page['next_before_id'])
+            st.rerun()
+    with col3:
+        st.caption(f"Page {len(pages)}")
+
+
 def main():
     """Main application"""
     st.title("🔧 Feed Management System - Admin Interface")
@@ -931,7 +1317,7 @@ def main():
     st.sidebar.title("🧭 Navigation")
     page = st.sidebar.selectbox(
         "Choose a section",
-        ["Dashboard", "Database Setup", "System Codes", "Feed Management"]
+        ["Dashboard", "Fleet View", "Analytics", "Run Logs", "Search", "Audit Log", "Database Setup", "System Codes", "Feed Management"]
     )
     
     # Database connection info in sidebar
@@ -951,6 +1337,16 @@ def main():
     # Route to appropriate page
     if page == "Dashboard":
         dashboard()
+    elif page == "Fleet View":
+        fleet_view()
+    elif page == "Analytics":
+        analytics_page()
+    elif page == "Run Logs":
+        run_log_page()
+    elif page == "Search":
+        search_page()
+    elif page == "Audit Log":
+        audit_page()
     elif page == "Database Setup":
         admin_database_setup()
     elif page == "System Codes":
@@ -0,0 +1,54 @@
+"""
+DuckDB rollups over the embedded SQLite backend, copied in-process without extensions
+"""
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+from app.core.storage import SQLiteBackend  # noqa: E402
+from app.services.analytics import connect_backend, rollup  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    for feed_tag, environment, status in [("orders", "dev", "success"), ("orders", "dev", "failure"),
+                                          ("orders", "dev", "failure"), ("refunds", "prod", "success")]:
+        backend.complete_feed_run(backend.start_feed_run(environment, feed_tag), status)
+    return backend
+
+
+def test_runs_view_over_sqlite(backend):
+    con = connect_backend(backend)
+    try:
+        rows = con.execute("""
+            SELECT feed_tag, environment, status_cd, COUNT(*)
+            FROM runs GROUP BY ALL ORDER BY ALL
+        """).fetchall()
+        daily = rollup(con, "daily_runs", days=1)
+    finally:
+        con.close()
+
+    assert rows == [("orders", "dev", "COMPLETED", 1), ("orders", "dev", "FAILED", 2),
+                    ("refunds", "prod", "COMPLETED", 1)]
+    assert daily["runs"].sum() == 4
+    assert daily["failed"].sum() == 2
+
+
+def test_no_extensions_are_loaded_for_sqlite(backend):
+    con = connect_backend(backend)
+    try:
+        loaded = con.execute("SELECT extension_name FROM duckdb_extensions() WHERE loaded").fetchall()
+    finally:
+        con.close()
+    assert ("sqlite_scanner",) not in loaded and ("sqlite",) not in loaded
+
+
+def test_empty_store():
+    con = connect_backend(SQLiteBackend())
+    try:
+        assert con.execute("SELECT COUNT(*) FROM runs").fetchone() == (0,)
+    finally:
+        con.close()
@@ -0,0 +1,113 @@
+"""
+Polling GET /runs and GET /feeds with conditional requests
+
+A scaled-down benchmark: one full gzip response, then repeated polls with
+If-None-Match. The database is replaced by fixed version stamps and rows,
+so the numbers measure the HTTP layer only. Run with -s to see them.
+"""
+import contextlib
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import http_cache  # noqa: E402
+from app.api.main import app  # noqa: E402
+from app.api.routes import feeds, runs  # noqa: E402
+
+POLLS = 50
+CHANGED_AT = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    current = {
+        'feed.feed': (10, CHANGED_AT),
+        'feed.feed_environment': (3, CHANGED_AT),
+        'feed.feed_run': (500, None),
+        'admin.system_codes': (7, CHANGED_AT),
+    }
+    calls = {'main_query': 0}
+
+    def fake_list(*args, **kwargs):
+        calls['main_query'] += 1
+        return [{'feed_run_id': i, 'feed_tag': f'feed_{i % 40}', 'status_cd': 'COMPLETED',
+                 'description': 'nightly load ' * 5} for i in range(200)]
+
+    monkeypatch.setattr(http_cache, "_pooled_table_versions",
+                        lambda tables: {t: v for t, v in current.items() if t in tables})
+    monkeypatch.setattr(runs, "pooled_connection", lambda: contextlib.nullcontext())
+    monkeypatch.setattr(feeds, "pooled_connection", lambda: contextlib.nullcontext())
+    monkeypatch.setattr(runs, "list_runs", fake_list)
+    monkeypatch.setattr(feeds, "list_feeds", fake_list)
+    return current, calls
+
+
+def _poll(client, path, etag):
+    started = time.perf_counter()
+    response = client.get(path, headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    return response, time.perf_counter() - started
+
+
+@pytest.mark.parametrize("path", ["/runs", "/feeds"])
+def test_unchanged_polls_return_304_without_a_body(versions, path):
+    _, calls = versions
+    client = TestClient(app)
+
+    started = time.perf_counter()
+    first = client.get(path, headers={"Accept-Encoding": "gzip"})
+    full_latency = time.perf_counter() - started
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    full_bytes = int(first.headers.get("content-length", len(first.content)))
+
+    poll_bytes, poll_latency = 0, 0.0
+    for _ in range(POLLS):
+        response, elapsed = _poll(client, path, etag)
+        assert response.status_code == 304
+        assert response.content == b""
+        poll_bytes += len(response.content)
+        poll_latency += elapsed
+
+    # The main query runs once; every revalidation is answered from the stamps
+    assert calls['main_query'] == 1
+    assert poll_bytes < full_bytes * POLLS
+    print(f"\n{path}: full {full_bytes} B gzip in {full_latency * 1000:.2f} ms, "
+          f"{POLLS} polls {poll_bytes} B body in {poll_latency / POLLS * 1000:.2f} ms avg")
+
+
+def test_run_write_changes_the_etag(versions):
+    current, calls = versions
+    client = TestClient(app)
+    etag = client.get("/runs").headers["etag"]
+
+    current['feed.feed_run'] = (501, None)
+    response, _ = _poll(client, "/runs", etag)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert calls['main_query'] == 2
+
+
+def test_code_rename_changes_the_runs_etag(versions):
+    current, _ = versions
+    client = TestClient(app)
+    etag = client.get("/runs").headers["etag"]
+
+    current['admin.system_codes'] = (8, CHANGED_AT)
+    response, _ = _poll(client, "/runs", etag)
+    assert response.status_code == 200
+
+
+def test_runs_are_not_validated_by_date(versions):
+    client = TestClient(app)
+    first = client.get("/runs")
+    assert "last-modified" not in first.headers
+    assert "last-modified" in client.get("/feeds").headers
+
+    response = client.get("/runs", headers={"If-Modified-Since": "Mon, 19 Oct 2026 13:00:00 GMT"})
+    assert response.status_code == 200
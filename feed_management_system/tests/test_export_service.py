@@ -0,0 +1,88 @@
+"""
+Parquet export: part file names, --full replacement, watermark writes and the settle cutoff
+"""
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.core.database import RowBatch  # noqa: E402
+from app.services import export_service  # noqa: E402
+
+COLUMNS = ["feed_run_id", "feed_id", "feed_tag", "environment_id", "environment_cd", "start_dt", "end_dt",
+           "status_cd", "description", "created_at", "updated_at"]
+TS = datetime(2026, 10, 1, 12, 0, 0)
+
+
+class FakeConnection:
+    def set_session(self, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    calls = []
+
+    def fake_stream(query, params, batch_size, conn):
+        calls.append(params)
+        return iter([RowBatch(COLUMNS, [(len(calls), 1, "orders", 1, "DEV", TS, TS, "COMPLETED", None, TS, TS)])])
+
+    monkeypatch.setattr(export_service, "get_connection", FakeConnection)
+    monkeypatch.setattr(export_service, "stream_query", fake_stream)
+    return calls
+
+
+def partition_files(root):
+    return sorted((root / "feed_run" / "environment=DEV" / "month=2026-10").glob("part-*.parquet"))
+
+
+def test_exports_in_the_same_second_write_separate_files(tmp_path, queries):
+    for _ in range(2):
+        assert export_service.export_table("feed_run", output_dir=tmp_path) == 1
+    assert len(partition_files(tmp_path)) == 2
+
+
+def test_full_export_replaces_earlier_files(tmp_path, queries):
+    export_service.export_table("feed_run", output_dir=tmp_path)
+    export_service.export_table("feed_run", output_dir=tmp_path)
+    assert export_service.export_table("feed_run", output_dir=tmp_path, full=True) == 1
+
+    assert len(partition_files(tmp_path)) == 1
+    assert export_service.load_watermarks(tmp_path)["feed_run"]["id"] == 3
+    # Nothing is left of the staging or retired directories
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["_export.lock", "_watermarks.json", "feed_run"]
+
+
+def test_settle_cutoff_is_left_to_the_database(tmp_path, queries):
+    export_service.export_table("feed_run", output_dir=tmp_path, settle_seconds=90)
+    assert queries[0]["settle_seconds"] == 90
+    assert not any(isinstance(value, datetime) and key != "mark_ts" for key, value in queries[0].items())
+    assert "LOCALTIMESTAMP - make_interval(secs => %(settle_seconds)s)" in \
+        export_service.EXPORT_TABLES["feed_run"]["query"]
+
+
+def test_concurrent_watermark_writes_use_separate_temp_files(tmp_path):
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(50):
+                export_service.save_watermarks({"feed_run": {"id": n * 1000 + i}}, tmp_path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["_watermarks.json"]
+    json.loads((tmp_path / "_watermarks.json").read_text())
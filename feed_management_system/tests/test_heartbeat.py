@@ -0,0 +1,26 @@
+"""
+Dashboard progress labels for active runs with partly NULL progress fields
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services.heartbeat import describe_progress
+
+pd = pytest.importorskip("pandas")
+
+
+def test_mixed_null_and_integer_totals():
+    now = datetime(2026, 10, 19, 12, 0)
+    active = pd.DataFrame([
+        {'feed_name': 'Orders', 'environment': 'prod', 'progress_pct': 40.0, 'records_processed': 400,
+         'records_total': 1000, 'message': 'loading', 'is_stale': False, 'last_seen': now},
+        {'feed_name': 'Refunds', 'environment': 'prod', 'progress_pct': None, 'records_processed': None,
+         'records_total': None, 'message': None, 'is_stale': True, 'last_seen': now},
+    ])
+    # A NULL in an integer column turns the whole column into float with NaN
+    assert active['records_total'].dtype == float
+
+    orders, refunds = (describe_progress(run) for run in active.itertuples(index=False))
+    assert orders == (40.0, "Orders (prod) · 40% · 400/1,000 records · loading")
+    assert refunds == (0.0, "⚠️ Refunds (prod) · 0%")
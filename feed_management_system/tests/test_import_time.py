@@ -0,0 +1,47 @@
+"""
+Streamlit cold start: module-level imports stay light
+
+The page script is not imported directly (it connects to the database at
+import time). Its top-level imports are read from the source and imported in
+a fresh interpreter, which must not load any of the heavy modules the pages
+import on demand.
+"""
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "streamlit_app.py"
+HEAVY_MODULES = ('pandas', 'psycopg2', 'yaml', 'pyarrow', 'duckdb', 'numpy', 'sqlalchemy', 'plotly', 'redis')
+# Imported by the page script itself; not under test here
+FRAMEWORK_MODULES = ('streamlit',)
+
+
+def top_level_imports():
+    tree = ast.parse(APP.read_text())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return [m for m in modules if m.split('.')[0] not in FRAMEWORK_MODULES]
+
+
+def test_page_services_are_imported_lazily():
+    assert not [m for m in top_level_imports() if m.startswith('app.services')]
+
+
+def test_top_level_imports_load_no_heavy_modules():
+    modules = top_level_imports()
+    code = (
+        "import importlib, json, sys\n"
+        f"for name in {modules!r}:\n"
+        "    importlib.import_module(name)\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = {name.split('.')[0] for name in json.loads(result.stdout)}
+    assert not loaded & set(HEAVY_MODULES)
@@ -0,0 +1,64 @@
+"""
+GET /runs/{id}/log long-polling waits on the event loop, not in worker threads
+"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from app.api.main import app  # noqa: E402
+from app.api.routes import runs  # noqa: E402
+
+# More than the 40 threads Starlette runs sync endpoints on
+CLIENTS = 100
+WAIT = 1.0
+
+
+def empty_page(feed_run_id, after_seq, limit):
+    return {"feed_run_id": feed_run_id, "chunks": [], "next_seq": after_seq, "finished": False}
+
+
+def test_idle_long_polls_do_not_queue_for_threads(monkeypatch):
+    monkeypatch.setattr(runs, "_pooled_tail", empty_page)
+    monkeypatch.setattr(runs, "POLL_INTERVAL", 0.1)
+
+    async def poll_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.get(f"/runs/{i}/log", params={"wait": WAIT}) for i in range(CLIENTS)
+            ))
+
+    started = time.perf_counter()
+    responses = asyncio.run(poll_all())
+    elapsed = time.perf_counter() - started
+
+    assert all(r.status_code == 200 and r.json()["chunks"] == [] for r in responses)
+    # Thread-bound sleeps would need at least ceil(100 / 40) * WAIT seconds
+    assert elapsed < 2 * WAIT
+
+
+def test_long_poll_returns_as_soon_as_chunks_arrive(monkeypatch):
+    calls = []
+
+    def tail_after_two_polls(feed_run_id, after_seq, limit):
+        calls.append(after_seq)
+        page = empty_page(feed_run_id, after_seq, limit)
+        if len(calls) >= 3:
+            page["chunks"] = [{"seq": after_seq + 1, "stream": "STDOUT", "chunk": "hi"}]
+        return page
+
+    monkeypatch.setattr(runs, "_pooled_tail", tail_after_two_polls)
+    monkeypatch.setattr(runs, "POLL_INTERVAL", 0.01)
+    transport = httpx.ASGITransport(app=app)
+
+    async def poll():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/runs/7/log", params={"after_seq": 4, "wait": 5})
+
+    response = asyncio.run(poll())
+    assert response.json()["chunks"][0]["seq"] == 5
+    assert calls == [4, 4, 4]
@@ -0,0 +1,111 @@
+"""
+Migrations replay frozen SQL per revision, and concurrent index builds recover from lock timeouts
+"""
+import re
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("alembic")
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from migrations import helpers  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+VERSIONS = ROOT / "migrations" / "versions"
+TABLE_DEFINITION = re.compile(r"CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+\.\w+)", re.I)
+TABLE_REFERENCE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+((?:feed|admin|archive)\.\w+)", re.I)
+
+
+def revisions_in_order():
+    """[(revision, source)] from the base revision to head"""
+    by_parent = {}
+    for path in VERSIONS.glob("*.py"):
+        source = path.read_text()
+        revision = re.search(r'^revision = "(\w+)"', source, re.M).group(1)
+        parent = re.search(r'^down_revision = (?:"(\w+)"|None)', source, re.M).group(1)
+        by_parent[parent] = (revision, source)
+    chain, parent = [], None
+    while parent in by_parent:
+        revision, source = by_parent[parent]
+        chain.append((revision, source))
+        parent = revision
+    assert len(chain) == len(by_parent)
+    return chain
+
+
+def snapshot_files(revision, source):
+    paths = re.findall(r'"((?:ddl|functions)/[\w.]+\.sql)"', source)
+    return [helpers.SNAPSHOT_DIR + f"/{revision}/{path}" for path in paths]
+
+
+def test_every_revision_has_its_snapshots():
+    for revision, source in revisions_in_order():
+        for path in snapshot_files(revision, source):
+            assert Path(path).is_file(), path
+
+
+def test_snapshots_only_use_tables_of_earlier_revisions():
+    """Upgrading a fresh database revision by revision never references a later table"""
+    tables = set()
+    for revision, source in revisions_in_order():
+        texts = [Path(path).read_text() for path in snapshot_files(revision, source)]
+        texts += re.findall(r'op\.execute\("""(.*?)"""', source, re.S)
+        for text in texts:
+            tables |= {name.lower() for name in TABLE_DEFINITION.findall(text)}
+        for text in texts:
+            missing = {name.lower() for name in TABLE_REFERENCE.findall(text)} - tables
+            assert not missing, f"{revision} references {sorted(missing)} before they exist"
+
+
+def test_comment_only_pieces_are_not_executed():
+    text = "-- Tables\nCREATE TABLE a.b (id INT);\n-- DROP TABLE a.b;\n"
+    assert helpers.sql_statements(text) == ["-- Tables\nCREATE TABLE a.b (id INT)"]
+    assert helpers.sql_statements(text, split=False) == [text]
+
+
+class LockTimeout(Exception):
+    pgcode = helpers.LOCK_NOT_AVAILABLE
+
+
+class FakeOp:
+    def __init__(self, failures):
+        self.failures = failures
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        if statement.startswith("CREATE INDEX") and self.failures:
+            self.failures -= 1
+            raise OperationalError(statement, None, LockTimeout())
+
+
+@pytest.fixture
+def fake_op(monkeypatch):
+    dropped = []
+
+    def install(failures):
+        op = FakeOp(failures)
+        monkeypatch.setattr(helpers, "op", op)
+        monkeypatch.setattr(helpers, "_drop_invalid_index", lambda name, schema: dropped.append(name))
+        monkeypatch.setattr(helpers.time, "sleep", lambda seconds: None)
+        return op, dropped
+
+    return install
+
+
+def test_index_build_is_retried_after_a_lock_timeout(fake_op):
+    op, dropped = fake_op(failures=2)
+    helpers.create_index_concurrently("idx_x", "feed.feed_run", "(start_dt)")
+    assert len(op.statements) == 3
+    assert dropped == ["idx_x"] * 3
+
+
+def test_failed_index_build_leaves_no_invalid_index(fake_op):
+    op, dropped = fake_op(failures=helpers.INDEX_BUILD_ATTEMPTS)
+    with pytest.raises(OperationalError):
+        helpers.create_index_concurrently("idx_x", "feed.feed_run", "(start_dt)")
+    assert len(op.statements) == helpers.INDEX_BUILD_ATTEMPTS
+    # Dropped before every attempt and once more after the last failure
+    assert len(dropped) == helpers.INDEX_BUILD_ATTEMPTS + 1
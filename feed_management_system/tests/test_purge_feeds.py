@@ -0,0 +1,86 @@
+"""
+purge_feeds is set-based: a fixed number of statements for any number of feeds
+
+The stored function cannot run here, so its body is checked against the DDL:
+every table that references a feed (directly or through runs, environments
+or SLAs) is archived and deleted by exactly one statement keyed on the feed id
+array, children before parents, with no per-row loop.
+"""
+import re
+from pathlib import Path
+
+SQL_DIR = Path(__file__).resolve().parent.parent / "sql"
+FUNCTION_FILE = SQL_DIR / "functions" / "5_delete_feed.sql"
+
+FK_PATTERN = re.compile(r"REFERENCES\s+(feed\.\w+)\s*\(")
+TABLE_PATTERN = re.compile(r"CREATE (?:UNLOGGED )?TABLE IF NOT EXISTS (feed\.\w+)\s*\((.*?)\n\);", re.S)
+# Rows the purge never archives: heartbeats are transient
+NOT_ARCHIVED = {'feed.feed_run_heartbeat'}
+
+
+def strip_comments(sql):
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+def feed_owned_tables():
+    """{table: set(parent tables)} for every table reachable from feed.feed through foreign keys"""
+    parents = {}
+    for path in sorted((SQL_DIR / "ddl").glob("*.sql")):
+        for table, body in TABLE_PATTERN.findall(strip_comments(path.read_text())):
+            parents[table] = {ref for ref in FK_PATTERN.findall(body) if ref != table}
+    owned = {'feed.feed'}
+    changed = True
+    while changed:
+        changed = False
+        for table, refs in parents.items():
+            if table not in owned and refs & owned:
+                owned.add(table)
+                changed = True
+    return {table: parents[table] & owned for table in owned}
+
+
+def purge_statements():
+    text = strip_comments(FUNCTION_FILE.read_text())
+    body = text[text.index("FUNCTION purge_feeds"):]
+    body = body[body.index("BEGIN"):body.index("$$ LANGUAGE plpgsql")]
+    return [" ".join(statement.split()) for statement in body.split(";") if statement.strip()]
+
+
+def dml(statements, verb):
+    pattern = re.compile(rf"\b{verb}\s+(\w+\.\w+)")
+    return [(match.group(1), statement) for statement in statements if (match := pattern.search(statement))]
+
+
+def test_no_per_row_iteration():
+    body = " ".join(purge_statements()).upper()
+    assert not re.search(r"\bLOOP\b|\bFOREACH\b|\bFOR\s+\w+\s+IN\b|\bCURSOR\b|\bFETCH\b", body)
+
+
+def test_every_feed_table_is_deleted_once_children_first():
+    owned = feed_owned_tables()
+    deletes = [table for table, _ in dml(purge_statements(), "DELETE FROM")]
+    assert len(deletes) == len(set(deletes))
+    assert set(owned) <= set(deletes)
+
+    position = {table: i for i, table in enumerate(deletes)}
+    for table, refs in owned.items():
+        for parent in refs:
+            assert position[table] < position[parent], f"{table} must be deleted before {parent}"
+
+
+def test_every_deleted_table_is_archived_once():
+    statements = purge_statements()
+    deletes = {table for table, _ in dml(statements, "DELETE FROM")}
+    archived = [table for table, _ in dml(statements, "INSERT INTO")]
+    assert len(archived) == len(set(archived))
+    assert {table.replace("archive.", "feed.") for table in archived} == deletes - NOT_ARCHIVED
+
+
+def test_statement_count_is_fixed():
+    statements = purge_statements()
+    writes = dml(statements, "DELETE FROM") + dml(statements, "INSERT INTO")
+    # Each write covers every requested feed through the id array
+    for table, statement in writes:
+        assert "= ANY(p_feed_ids)" in statement, table
+    deletes = len(dml(statements, "DELETE FROM"))
+    assert len(writes) == deletes * 2 - len(NOT_ARCHIVED)
@@ -0,0 +1,33 @@
+"""
+Query cache invalidation by declared table dependencies
+"""
+import pytest
+
+from app.core.query_cache import AUDIT_LOG, FUNCTION_TABLES, QueryCache, written_tables
+
+# A comma join: both tables are dependencies although only one follows FROM
+COMMA_JOIN = "SELECT f.feed_name, sc.code_description FROM feed.feed f, admin.system_codes sc"
+
+
+def test_declared_tables_are_invalidated():
+    cache = QueryCache()
+    cache.put(COMMA_JOIN, None, [("orders", "Batch")], ("feed.feed", "admin.system_codes"))
+
+    cache.invalidate_tables(["feed.feed_run"])
+    assert cache.get(COMMA_JOIN) == [("orders", "Batch")]
+
+    cache.invalidate_tables(["admin.system_codes"])
+    assert cache.get(COMMA_JOIN) is None
+
+
+def test_reads_must_declare_their_tables():
+    with pytest.raises(ValueError):
+        QueryCache().put("SELECT 1", None, [(1,)], ())
+
+
+def test_writes_to_audited_tables_change_the_audit_log():
+    assert written_tables("feed.feed_details") == {"feed.feed_details", AUDIT_LOG}
+    assert written_tables("feed.feed_run") == {"feed.feed_run"}
+    assert AUDIT_LOG in FUNCTION_TABLES['start_feed_run']
+    assert AUDIT_LOG in FUNCTION_TABLES['purge_feeds']
+    assert AUDIT_LOG not in FUNCTION_TABLES['complete_feed_run']
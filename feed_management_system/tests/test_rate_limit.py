@@ -0,0 +1,51 @@
+"""
+Write rate limiting keyed on the remote address, or the forwarded one behind a trusted proxy
+"""
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.api.rate_limit import RateLimiter, client_address, parse_networks  # noqa: E402
+
+
+def make_request(host, client_id=None, forwarded_for=None):
+    headers = [(b"x-client-id", client_id.encode())] if client_id else []
+    if forwarded_for:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({"type": "http", "headers": headers, "client": (host, 50000)})
+
+
+def test_rotating_client_id_does_not_reset_the_bucket():
+    limiter = RateLimiter(rate=0.001, burst=2)
+    limiter(make_request("10.0.0.1", "a"))
+    limiter(make_request("10.0.0.1", "b"))
+    with pytest.raises(HTTPException) as excinfo:
+        limiter(make_request("10.0.0.1", "c"))
+    assert excinfo.value.status_code == 429
+    assert int(excinfo.value.headers["Retry-After"]) >= 1
+
+    # Another address has its own bucket
+    limiter(make_request("10.0.0.2", "a"))
+
+
+def test_forwarded_for_is_only_believed_from_trusted_proxies():
+    proxies = parse_networks("10.0.0.5, 172.16.0.0/12")
+    assert client_address(make_request("10.0.0.5", forwarded_for="203.0.113.7"), proxies) == "203.0.113.7"
+    # The client's own X-Forwarded-For entries sit left of what the proxies appended
+    request = make_request("172.16.3.4", forwarded_for="1.2.3.4, 203.0.113.7, 10.0.0.5")
+    assert client_address(request, proxies) == "203.0.113.7"
+    # Direct clients cannot pick their bucket
+    assert client_address(make_request("198.51.100.1", forwarded_for="203.0.113.7"), proxies) == "198.51.100.1"
+    assert client_address(make_request("10.0.0.5", forwarded_for="not-an-ip"), proxies) == "10.0.0.5"
+    assert client_address(make_request("10.0.0.5", forwarded_for="203.0.113.7")) == "10.0.0.5"
+
+
+def test_clients_behind_a_trusted_proxy_get_their_own_buckets():
+    limiter = RateLimiter(rate=0.001, burst=1, trusted_proxies="10.0.0.5")
+    limiter(make_request("10.0.0.5", forwarded_for="203.0.113.7"))
+    limiter(make_request("10.0.0.5", forwarded_for="203.0.113.8"))
+    with pytest.raises(HTTPException):
+        limiter(make_request("10.0.0.5", forwarded_for="203.0.113.7"))
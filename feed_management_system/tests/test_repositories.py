@@ -0,0 +1,154 @@
+"""
+Repository loader strategies: a fixed number of SELECTs per page, no N+1
+
+The ORM models run against in-memory SQLite with "admin" and "feed" attached
+as schemas. Every SELECT is counted through a before_cursor_execute listener,
+including lazy loads triggered while the page walks the object graph.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import (
+    Base,
+    CodeType,
+    Feed,
+    FeedDetail,
+    FeedEnvironment,
+    FeedRun,
+    FeedRunDetail,
+    SystemCode,
+)
+from app.services.repositories import FeedRepository, FeedRunRepository, SystemCodeRepository
+
+MODELS = (CodeType, SystemCode, Feed, FeedEnvironment, FeedDetail, FeedRun, FeedRunDetail)
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.selects = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+    def reset(self):
+        self.selects = 0
+
+
+def make_engine(feed_count):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def attach_schemas(dbapi_conn, _):
+        for schema in ("admin", "feed"):
+            dbapi_conn.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in MODELS])
+    now = datetime(2026, 10, 19, 12, 0)
+    with Session(engine) as session:
+        session.execute(insert(CodeType), [
+            {"code_type_cd": cd, "code_type_description": cd}
+            for cd in ("FEED_TYPE", "FEED_STATUS", "FEED_ENVIRONMENT", "DETAIL_TYPE", "STATUS")
+        ])
+        session.execute(insert(SystemCode), [
+            {"code_id": 1, "common_cd": "SFTP_FEED", "code_type_cd": "FEED_TYPE", "code_description": "SFTP"},
+            {"code_id": 2, "common_cd": "ACTIVE", "code_type_cd": "FEED_STATUS", "code_description": "Active"},
+            {"code_id": 3, "common_cd": "DEV", "code_type_cd": "FEED_ENVIRONMENT", "code_description": "Dev"},
+            {"code_id": 4, "common_cd": "PROD", "code_type_cd": "FEED_ENVIRONMENT", "code_description": "Prod"},
+            {"code_id": 5, "common_cd": "SQL_QUERY", "code_type_cd": "DETAIL_TYPE", "code_description": "SQL"},
+            {"code_id": 6, "common_cd": "COMPLETED", "code_type_cd": "STATUS", "code_description": "Done"},
+        ])
+        session.execute(insert(Feed), [
+            {"feed_id": i, "feed_type_cd": "SFTP_FEED", "feed_type_cd_type": "FEED_TYPE", "feed_status_id": 2,
+             "feed_name": f"Feed {i:03d}", "feed_tag": f"feed_{i}"}
+            for i in range(1, feed_count + 1)
+        ])
+        session.execute(insert(FeedEnvironment), [
+            {"environment_id": i * 2 + offset, "feed_id": i, "env_system_cd": 3 + offset}
+            for i in range(1, feed_count + 1) for offset in (0, 1)
+        ])
+        session.execute(insert(FeedDetail), [
+            {"feed_id": i, "environment_id": i * 2, "detail_type_cd": "SQL_QUERY",
+             "detail_type_cd_type": "DETAIL_TYPE", "detail_desc": f"step {n}", "detail_data": "SELECT 1"}
+            for i in range(1, feed_count + 1) for n in range(3)
+        ])
+        session.execute(insert(FeedRun), [
+            {"feed_run_id": i * 10 + n, "feed_id": i, "environment_id": i * 2,
+             "start_dt": now - timedelta(hours=n), "status_cd": "COMPLETED", "status_cd_type": "STATUS"}
+            for i in range(1, feed_count + 1) for n in range(3)
+        ])
+        session.execute(insert(FeedRunDetail), [
+            {"feed_run_id": i * 10 + n, "detail_desc": "rows", "detail_data": "100"}
+            for i in range(1, feed_count + 1) for n in range(3)
+        ])
+        session.commit()
+    return engine
+
+
+def walk_feeds(feeds):
+    return sum(len(feed.environments) + len(feed.feed_type.common_cd)
+               + sum(len(env.env_code.common_cd) for env in feed.environments) for feed in feeds)
+
+
+PAGES = {
+    # name: (load the page's data and touch what the page renders, expected SELECTs)
+    "list_code_types": (
+        lambda s: sum(len(code.common_cd) for ct in SystemCodeRepository(s).list_code_types() for code in ct.codes),
+        2,
+    ),
+    "list_codes": (
+        lambda s: sum(len(code.code_type.code_type_description) for code in SystemCodeRepository(s).list_codes()),
+        1,
+    ),
+    "list_feeds": (
+        lambda s: sum(walk_feeds([feed]) + len(feed.status.common_cd) for feed in FeedRepository(s).list_feeds()),
+        2,
+    ),
+    "list_feeds_with_run_counts": (
+        lambda s: walk_feeds(feed for feed, _ in FeedRepository(s).list_feeds_with_run_counts()),
+        2,
+    ),
+    "get_with_details": (
+        lambda s: sum(len(detail.detail_type.common_cd) + len(detail.environment.env_code.common_cd)
+                      for detail in FeedRepository(s).get_with_details(1).details),
+        3,
+    ),
+    "recent_runs": (
+        lambda s: sum(len(run.feed.feed_name) + len(run.status.common_cd) + len(run.environment.env_code.common_cd)
+                      for run in FeedRunRepository(s).recent_runs(limit=50)),
+        1,
+    ),
+    "runs_for_feed": (
+        lambda s: sum(len(run.details) + len(run.environment.env_code.common_cd)
+                      for run in FeedRunRepository(s).runs_for_feed(1)),
+        2,
+    ),
+}
+
+
+@pytest.mark.parametrize("feed_count", [5, 40])
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_page_loads_use_a_fixed_number_of_selects(page, feed_count):
+    engine = make_engine(feed_count)
+    counter = QueryCounter(engine)
+    load, expected = PAGES[page]
+    with Session(engine) as session:
+        counter.reset()
+        assert load(session) > 0
+    assert counter.selects == expected
+
+
+def test_batch_inserts_are_one_executemany():
+    engine = make_engine(1)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, params, context, many: statements.append(many))
+    with Session(engine) as session:
+        FeedRunRepository(session).add_run_details(10, [{"detail_desc": f"d{i}", "detail_data": "x"}
+                                                        for i in range(100)])
+    assert statements == [True]
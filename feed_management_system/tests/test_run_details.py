@@ -0,0 +1,91 @@
+"""
+Run detail streaming: pooled connections and the indexes its keyset pages rely on
+"""
+import contextlib
+import re
+from datetime import datetime
+from pathlib import Path
+
+from app.services import run_details
+
+ROOT = Path(__file__).resolve().parent.parent
+COLUMNS = ["detail_id", "parent_detail_id", "feed_run_id", "detail_desc", "detail_data", "created_at"]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = [(name,) for name in COLUMNS]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.rows = self.rows[:params['limit']]
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.events = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self.rows)
+
+    def rollback(self):
+        self.events.append("rollback")
+
+
+def fake_pool(monkeypatch, conn):
+    @contextlib.contextmanager
+    def pooled_connection():
+        conn.events.append("borrowed")
+        try:
+            yield conn
+        finally:
+            conn.events.append("returned")
+
+    monkeypatch.setattr(run_details, "pooled_connection", pooled_connection)
+
+
+def rows(n):
+    return [(i, None, 1, "step", "ok", datetime(2026, 10, 19, 12, 0, i % 60)) for i in range(n)]
+
+
+def test_stream_borrows_and_returns_a_pooled_connection(monkeypatch):
+    conn = FakeConnection(rows(5))
+    fake_pool(monkeypatch, conn)
+
+    pages = list(run_details.pooled_run_details(feed_run_id=1, limit=3, batch_size=2))
+    assert [len(batch) for batch, _ in pages] == [2, 1]
+    assert pages[-1][1] is True
+    assert conn.events == ["borrowed", "returned"]
+
+
+def test_abandoned_stream_rolls_back_before_returning(monkeypatch):
+    conn = FakeConnection(rows(10))
+    fake_pool(monkeypatch, conn)
+
+    pages = run_details.pooled_run_details(feed_run_id=1, limit=10, batch_size=2)
+    next(pages)
+    pages.close()
+    assert conn.events == ["borrowed", "rollback", "returned"]
+
+
+def test_migration_indexes_exist_in_ddl():
+    """Databases built from sql/ddl (the setup page) get every index the migrations build"""
+    ddl = " ".join(path.read_text() for path in (ROOT / "sql" / "ddl").glob("*.sql"))
+    created, dropped = set(), set()
+    for path in (ROOT / "migrations" / "versions").glob("*.py"):
+        upgrade = path.read_text().split("def upgrade", 1)[1].split("def downgrade", 1)[0]
+        created |= set(re.findall(r'create_index_concurrently\(\s*"(\w+)"', upgrade))
+        dropped |= set(re.findall(r'drop_index_concurrently\(\s*"(\w+)"', upgrade))
+    assert "idx_feed_run_details_run_created" in created
+    assert sorted(name for name in created - dropped if name not in ddl) == []
@@ -0,0 +1,58 @@
+"""
+Scheduler waits for externally executed runs: completion and timeout
+"""
+import threading
+import time
+
+import pytest
+
+from app.core.storage import SQLiteBackend, set_backend
+from app.services.scheduler import STATUS_COMPLETED, STATUS_FAILED, STATUS_SKIPPED, FeedScheduler
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def test_timed_out_external_run_is_failed_and_skips_downstream(backend):
+    scheduler = FeedScheduler("dev", max_concurrency=2, poll_interval=0.05, external_timeout=0.2)
+    results = scheduler.run(feeds={1: "extract", 2: "load"}, upstreams={2: {1}})
+
+    assert results == {"extract": STATUS_FAILED, "load": STATUS_SKIPPED}
+    _, rows = backend.query("""
+        SELECT fr.status_cd, fr.end_dt IS NOT NULL
+        FROM feed.feed_run fr JOIN feed.feed f ON fr.feed_id = f.feed_id
+        WHERE f.feed_tag = 'extract';
+    """)
+    assert rows == [('FAILED', 1)]
+
+
+def test_external_run_finished_before_the_timeout(backend):
+    scheduler = FeedScheduler("dev", poll_interval=0.05, external_timeout=5)
+    feed_run_id = backend.start_feed_run("dev", "extract")
+    threading.Timer(0.1, backend.complete_feed_run, (feed_run_id, "success")).start()
+
+    assert scheduler._wait_for_external(feed_run_id) == STATUS_COMPLETED
+
+
+def test_timeout_keeps_the_outcome_of_a_run_finished_meanwhile(backend, monkeypatch):
+    scheduler = FeedScheduler("dev", poll_interval=0.05, external_timeout=0.1)
+    feed_run_id = backend.start_feed_run("dev", "extract")
+    polls = []
+
+    # The last poll still sees RUNNING, but the run succeeds before the timeout fails it
+    def poll(ids):
+        polls.append(ids)
+        if len(polls) > 1:
+            return backend.get_run_statuses(ids)
+        time.sleep(0.15)
+        backend.complete_feed_run(feed_run_id, "success")
+        return {feed_run_id: 'RUNNING'}
+
+    monkeypatch.setattr("app.services.scheduler.get_run_statuses", poll)
+    assert scheduler._wait_for_external(feed_run_id) == STATUS_COMPLETED
+    assert backend.get_run_statuses([feed_run_id]) == {feed_run_id: STATUS_COMPLETED}
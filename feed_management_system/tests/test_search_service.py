@@ -0,0 +1,43 @@
+"""
+Search parameters: substring patterns for the trigram indexes and the run detail candidate cap
+"""
+from app.services import search_service
+from app.services.search_service import RUN_DETAIL_CANDIDATES, substring_pattern
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.params = None
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.params = params
+        self.description = [("source",)]
+
+    def fetchall(self):
+        return []
+
+
+def test_substring_pattern_escapes_like_wildcards():
+    assert substring_pattern("batch5") == "%batch5%"
+    assert substring_pattern("50%_off") == "%50\\%\\_off%"
+    assert substring_pattern("a\\b") == "%a\\\\b%"
+    assert substring_pattern("ab") is None
+
+
+def test_search_caps_ranked_run_details():
+    conn = RecordingConnection()
+    assert search_service.search("  timeout  ", limit=20, conn=conn) == []
+    assert conn.params['term'] == "timeout"
+    assert conn.params['pattern'] == "%timeout%"
+    assert conn.params['candidates'] == RUN_DETAIL_CANDIDATES
+    assert search_service.search("x", limit=RUN_DETAIL_CANDIDATES * 2, conn=conn) == []
+    assert conn.params['candidates'] == RUN_DETAIL_CANDIDATES * 2
@@ -0,0 +1,129 @@
+"""
+Shared cache versioning, invalidation, memory bounds and value encoding
+"""
+import pickle
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.shared_cache import MemoryCacheBackend, SharedCache
+
+TABLES = ('feed.feed',)
+
+
+def make_cache():
+    return SharedCache(MemoryCacheBackend(), prefix="test", ttl=300)
+
+
+def test_get_or_load_caches_until_invalidated():
+    cache = make_cache()
+    assert cache.get_or_load("feeds", TABLES, lambda: "v1") == "v1"
+    assert cache.get_or_load("feeds", TABLES, lambda: "unused") == "v1"
+
+    cache.invalidate_tables(["feed.feed"])
+    assert cache.get_or_load("feeds", TABLES, lambda: "v2") == "v2"
+
+
+def test_write_during_load_does_not_cache_stale_result():
+    cache = make_cache()
+
+    def slow_loader():
+        # A writer commits and invalidates while this load is in flight
+        cache.invalidate_tables(["feed.feed"])
+        return "old"
+
+    assert cache.get_or_load("feeds", TABLES, slow_loader) == "old"
+    assert cache.get_or_load("feeds", TABLES, lambda: "new") == "new"
+
+
+def test_query_key_write_during_load():
+    cache = make_cache()
+    query = "SELECT * FROM feed.feed WHERE is_active"
+    key = cache.query_key(query, None, ["feed.feed"])
+    cache.invalidate_tables(["feed.feed"])
+    cache.put(key, "old")
+
+    assert cache.get(cache.query_key(query, None, ["feed.feed"])) is None
+
+
+def test_unrelated_table_keeps_entry():
+    cache = make_cache()
+    cache.get_or_load("feeds", TABLES, lambda: "v1")
+    cache.invalidate_tables(["feed.feed_run"])
+    assert cache.get_or_load("feeds", TABLES, lambda: "unused") == "v1"
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=3)
+    backend.incr("ver:feed.feed")
+    for key in ("a", "b", "c"):
+        backend.set(key, b"1", 300)
+    backend.get("a")
+    backend.set("d", b"1", 300)
+
+    assert len(backend) == 3
+    assert backend.mget(["a", "b", "c", "d"]) == [b"1", None, b"1", b"1"]
+    # Table versions are not values and are never evicted
+    assert backend.get("ver:feed.feed") == b"1"
+
+
+def test_memory_backend_sweeps_expired_entries_first():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("old", b"1", 0.01)
+    backend.set("kept", b"1", 300)
+    time.sleep(0.02)
+    backend.set("new", b"1", 300)
+
+    assert len(backend) == 2
+    assert backend.mget(["kept", "new"]) == [b"1", b"1"]
+
+
+def test_version_bumps_do_not_grow_memory():
+    cache = SharedCache(MemoryCacheBackend(max_entries=50), prefix="test", ttl=300)
+    for version in range(500):
+        cache.get_or_load("feeds", TABLES, lambda: version)
+        cache.invalidate_tables(["feed.feed"])
+    assert len(cache.backend) == 50
+
+
+def test_values_round_trip_without_pickle():
+    cache = make_cache()
+    value = {
+        "feed_tag": "orders",
+        "created_at": datetime(2026, 10, 19, 12, 30, tzinfo=timezone.utc),
+        "run_date": date(2026, 10, 19),
+        "success_rate": Decimal("97.5"),
+        "environments": ["dev", "prod"],
+    }
+    key = cache.key("feed:orders", TABLES)
+    cache.put(key, value)
+    assert cache.get(key) == value
+
+
+def test_dataframes_round_trip():
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    cache = make_cache()
+    df = pd.DataFrame({"code_id": [1, 2], "updated_at": pd.to_datetime(["2026-10-01", "2026-10-02"])})
+    key = cache.key("codes", TABLES)
+    cache.put(key, df)
+    pd.testing.assert_frame_equal(cache.get(key), df)
+
+
+class Exploit:
+    ran = False
+
+    def __reduce__(self):
+        return (setattr, (Exploit, "ran", True))
+
+
+def test_pickled_payloads_are_not_loaded():
+    cache = make_cache()
+    key = cache.key("feed:orders", TABLES)
+    cache.backend.set(key, pickle.dumps(Exploit()), 300)
+
+    assert cache.get(key) is None
+    assert Exploit.ran is False
+    assert cache.stats()["errors"] == 1
@@ -0,0 +1,71 @@
+"""
+Single flight coalescing and freshness
+"""
+import threading
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "value"
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait(5)
+    # Arrive during the first call: these share the follow-up call
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", lambda: "fresh")))
+                 for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()['coalesced'] < 4:
+        pass
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert sorted(results) == ["fresh"] * 5 + ["value"]
+    assert flight.stats() == {'executed': 2, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_caller_arriving_mid_flight_sees_its_own_write():
+    flight = SingleFlight()
+    store = {'value': 'old'}
+    read_done, write_done = threading.Event(), threading.Event()
+
+    def read():
+        value = store['value']
+        read_done.set()
+        write_done.wait(5)  # the leader's result is already stale here
+        return value
+
+    leader_result = []
+    leader = threading.Thread(target=lambda: leader_result.append(flight.do("k", read)))
+    leader.start()
+    read_done.wait(5)
+
+    store['value'] = 'new'
+    write_done.set()
+    assert flight.do("k", lambda: store['value']) == 'new'
+    leader.join(5)
+    assert leader_result == ['old']
+
+
+def test_errors_are_shared_and_do_not_block_the_key():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        flight.do("k", fail)
+    except RuntimeError:
+        pass
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.stats()['in_flight'] == 0
@@ -0,0 +1,182 @@
+"""
+Embedded SQLite storage backend: run functions, scheduler/executor paths and timestamps
+"""
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.storage import SQLiteBackend, set_backend
+from app.services.executor import FeedExecutor, load_feed_commands
+from app.services.run_log import RunNotFound
+from app.services.scheduler import load_feed_graph
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def add_command(backend, feed_tag, environment, code):
+    with backend.transaction() as cur:
+        feed_id, environment_id = cur.execute("""
+            SELECT f.feed_id, fe.environment_id
+            FROM feed.feed f
+            JOIN feed.feed_environment fe ON fe.feed_id = f.feed_id
+            JOIN admin.system_codes sc ON fe.env_system_cd = sc.code_id
+            WHERE f.feed_tag = ? AND lower(sc.common_cd) = ?;
+        """, (feed_tag, environment)).fetchone()
+        cur.execute("""
+            INSERT INTO feed.feed_details (feed_id, environment_id, detail_type_cd, detail_type_cd_type,
+                                           detail_desc, detail_data)
+            VALUES (?, ?, 'PYTHON_CODE_SNIPPET', 'DETAIL_TYPE', 'snippet', ?);
+        """, (feed_id, environment_id, code))
+
+
+def test_start_and_complete_run(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    assert backend.get_run_statuses([feed_run_id]) == {feed_run_id: 'RUNNING'}
+
+    backend.complete_feed_run(feed_run_id, "success")
+    assert backend.get_run_statuses([feed_run_id]) == {feed_run_id: 'COMPLETED'}
+
+    # Starting again reuses the auto-created feed and environment
+    second = backend.start_feed_run("dev", "orders")
+    _, rows = backend.query("SELECT COUNT(*) FROM feed.feed WHERE feed_tag = 'orders';")
+    assert second != feed_run_id and rows == [(1,)]
+
+    with pytest.raises(ValueError):
+        backend.start_feed_run("staging", "orders")
+    with pytest.raises(ValueError):
+        backend.complete_feed_run(999, "success")
+
+
+def test_timestamps_are_parsed_without_a_global_converter(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    _, rows = backend.query("SELECT start_dt, description FROM feed.feed_run WHERE feed_run_id = ?;",
+                            (feed_run_id,))
+    start_dt, description = rows[0]
+    assert isinstance(start_dt, datetime)
+    assert isinstance(description, str)
+
+    # Datetime parameters bind as SQLite text timestamps
+    _, rows = backend.query("SELECT COUNT(*) FROM feed.feed_run WHERE start_dt >= ?;", (start_dt,))
+    assert rows == [(1,)]
+
+    # Other sqlite3 connections in the process keep the stdlib converters
+    assert sqlite3.converters["TIMESTAMP"].__module__ == "sqlite3.dbapi2"
+
+
+def test_feed_graph_and_commands(backend):
+    for tag in ("extract", "load", "other"):
+        backend.start_feed_run("dev", tag)
+    with backend.transaction() as cur:
+        cur.execute("""
+            INSERT INTO feed.feed_dependency (feed_id, depends_on_feed_id)
+            SELECT l.feed_id, e.feed_id FROM feed.feed l, feed.feed e
+            WHERE l.feed_tag = 'load' AND e.feed_tag = 'extract';
+        """)
+    feeds, upstreams = load_feed_graph()
+    ids = {tag: feed_id for feed_id, tag in feeds.items()}
+    assert {"extract", "load", "other"} <= set(ids)
+    assert upstreams == {ids["load"]: {ids["extract"]}}
+
+    feeds, upstreams = load_feed_graph(["load", "other"])
+    assert set(feeds.values()) == {"load", "other"} and upstreams == {}
+
+    add_command(backend, "load", "dev", "print('hi')")
+    rows = load_feed_commands("load", "dev")
+    assert [row[1:] for row in rows] == [('PYTHON_CODE_SNIPPET', 'snippet', "print('hi')")]
+    assert load_feed_commands("load", "prod") == []
+
+
+def test_run_log_appends_are_numbered(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    assert backend.append_run_log(feed_run_id, ["a", ("STDERR", "b")]) == (1, 2)
+    assert backend.append_run_log(feed_run_id, ["c"]) == (3, 3)
+    assert backend.append_run_log(feed_run_id, []) == (None, None)
+    with pytest.raises(RunNotFound):
+        backend.append_run_log(999, ["x"])
+
+
+def test_executor_runs_a_feed_on_sqlite(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    add_command(backend, "orders", "dev", "print('hello from the job')")
+
+    assert FeedExecutor(timeout=60).run_feed_run(feed_run_id, "orders", "dev") is True
+
+    _, details = backend.query(
+        "SELECT detail_desc, detail_data FROM feed.feed_run_details WHERE feed_run_id = ? ORDER BY detail_id;",
+        (feed_run_id,)
+    )
+    assert details == [("PYTHON_CODE_SNIPPET: snippet", "print('hello from the job')"), ("Exit code", "0")]
+    _, log = backend.query("SELECT stream, chunk FROM feed.feed_run_log WHERE feed_run_id = ? ORDER BY seq;",
+                           (feed_run_id,))
+    assert ("STDOUT", "hello from the job\n") in log
+
+
+def test_executor_fails_a_feed_without_commands(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+
+    assert FeedExecutor(timeout=60).run_feed_run(feed_run_id, "orders", "dev") is False
+    _, details = backend.query("SELECT detail_desc FROM feed.feed_run_details WHERE feed_run_id = ?;",
+                               (feed_run_id,))
+    assert details == [("No commands",)]
+
+
+def test_executor_kills_a_command_whose_output_cannot_be_logged(backend, monkeypatch):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    add_command(backend, "orders", "dev", "import time\nprint('first', flush=True)\ntime.sleep(60)")
+    append_run_log = backend.append_run_log
+
+    def failing_append(feed_run_id, chunks, conn=None):
+        if any(stream == "STDOUT" for stream, _ in chunks):
+            raise sqlite3.OperationalError("disk I/O error")
+        return append_run_log(feed_run_id, chunks, conn=conn)
+
+    monkeypatch.setattr(backend, "append_run_log", failing_append)
+    started = time.monotonic()
+    assert FeedExecutor(timeout=60, flush_interval=0).run_feed_run(feed_run_id, "orders", "dev") is False
+    assert time.monotonic() - started < 30
+
+    _, details = backend.query(
+        "SELECT detail_desc, detail_data FROM feed.feed_run_details WHERE feed_run_id = ? ORDER BY detail_id;",
+        (feed_run_id,)
+    )
+    assert details[-1] == ("Log write failed", "Killed after output could not be logged: disk I/O error")
+
+
+def test_finished_runs_keep_their_outcome(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    assert backend.complete_feed_run(feed_run_id, "failure") is True
+    assert backend.complete_feed_run(feed_run_id, "success") is False
+    assert backend.get_run_statuses([feed_run_id]) == {feed_run_id: 'FAILED'}
+
+
+GRANDCHILD = "import subprocess, sys\nsubprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+
+
+def test_executor_timeout_kills_processes_the_command_spawned(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    # The grandchild inherits stdout/stderr; killing only the child would leave the pipes open
+    add_command(backend, "orders", "dev", GRANDCHILD + "import time\ntime.sleep(60)")
+
+    started = time.monotonic()
+    assert FeedExecutor(timeout=1).run_feed_run(feed_run_id, "orders", "dev") is False
+    assert time.monotonic() - started < 30
+    _, details = backend.query("SELECT detail_desc FROM feed.feed_run_details WHERE feed_run_id = ? "
+                               "ORDER BY detail_id;", (feed_run_id,))
+    assert details[-1] == ("Timed out",)
+
+
+def test_executor_does_not_wait_for_background_processes(backend):
+    feed_run_id = backend.start_feed_run("dev", "orders")
+    add_command(backend, "orders", "dev", GRANDCHILD + "print('done')")
+
+    started = time.monotonic()
+    assert FeedExecutor(timeout=60).run_feed_run(feed_run_id, "orders", "dev") is True
+    assert time.monotonic() - started < 30